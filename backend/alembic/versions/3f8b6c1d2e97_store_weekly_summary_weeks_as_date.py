@@ -0,0 +1,39 @@
+"""Store weekly summary week_start and week_end as date
+
+Revision ID: 3f8b6c1d2e97
+Revises: c71e2d9a4f38
+Create Date: 2026-10-19 17:05:41.502318
+
+Converts week_start and week_end from varchar to date, so range filters compare dates
+rather than strings. Their B-tree indexes (ix_weekly_summaries_week_start/_week_end) are
+rebuilt by the type change. stats was already converted to jsonb by fb6ae9a437b6.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f8b6c1d2e97'
+down_revision: Union[str, None] = 'c71e2d9a4f38'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("""
+        ALTER TABLE weekly_summaries
+        ALTER COLUMN week_start TYPE date USING week_start::date,
+        ALTER COLUMN week_end TYPE date USING week_end::date
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("""
+        ALTER TABLE weekly_summaries
+        ALTER COLUMN week_start TYPE varchar USING to_char(week_start, 'YYYY-MM-DD'),
+        ALTER COLUMN week_end TYPE varchar USING to_char(week_end, 'YYYY-MM-DD')
+    """)
@@ -0,0 +1,49 @@
+"""Add binary-quantized embedding column for two-stage search
+
+Revision ID: 54d09f20abd4
+Revises: fb6ae9a437b6
+Create Date: 2026-10-19 14:52:09.734211
+
+Adds embedding_bit, a generated bit(EMBEDDING_DIMENSIONS) column holding the sign of each
+embedding dimension, with an HNSW index on Hamming distance. It is 32x smaller than the
+float32 embedding and is used as a prefilter before an exact cosine rerank.
+
+The bit length is the embedding column's dimensions. The migration fails if the embedding
+profile in the environment no longer matches that column. The column depends on embedding,
+so downgrade this revision before re-running the embedding profile migration (ac2422d1964b)
+with new dimensions.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from config.embeddings import HNSW_CONFIG, get_embedding_bit_expression, get_stored_embedding_profile
+
+
+# revision identifiers, used by Alembic.
+revision: str = '54d09f20abd4'
+down_revision: Union[str, None] = 'fb6ae9a437b6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    profile = get_stored_embedding_profile(op.get_bind())
+    op.execute(f"""
+        ALTER TABLE weekly_summaries
+        ADD COLUMN IF NOT EXISTS embedding_bit bit({profile['dimensions']})
+        GENERATED ALWAYS AS ({get_embedding_bit_expression(profile)}) STORED
+    """)
+    op.execute(f"""
+        CREATE INDEX IF NOT EXISTS weekly_summaries_embedding_bit_idx
+        ON weekly_summaries USING hnsw (embedding_bit bit_hamming_ops)
+        WITH (m = {HNSW_CONFIG['m']}, ef_construction = {HNSW_CONFIG['ef_construction']})
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP INDEX IF EXISTS weekly_summaries_embedding_bit_idx")
+    op.execute("ALTER TABLE weekly_summaries DROP COLUMN IF EXISTS embedding_bit")
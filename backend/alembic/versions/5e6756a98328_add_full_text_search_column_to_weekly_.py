@@ -0,0 +1,40 @@
+"""Add full-text search column to weekly_summaries
+
+Revision ID: 5e6756a98328
+Revises: 9acedabbcb0f
+Create Date: 2026-10-19 11:26:03.904127
+
+Adds a generated tsvector column over summary (weight A) and recommendations (weight B)
+with a GIN index, for keyword and hybrid search.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e6756a98328'
+down_revision: Union[str, None] = '9acedabbcb0f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Same expression as WEEKLY_SUMMARY_SEARCH_TSV_EXPRESSION in models/models.py
+    op.execute("""
+        ALTER TABLE weekly_summaries
+        ADD COLUMN IF NOT EXISTS search_tsv tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(summary, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(recommendations::text, '')), 'B')
+        ) STORED
+    """)
+    op.execute("CREATE INDEX IF NOT EXISTS weekly_summaries_search_tsv_idx ON weekly_summaries USING gin (search_tsv)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP INDEX IF EXISTS weekly_summaries_search_tsv_idx")
+    op.execute("ALTER TABLE weekly_summaries DROP COLUMN IF EXISTS search_tsv")
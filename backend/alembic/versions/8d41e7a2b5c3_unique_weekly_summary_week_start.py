@@ -0,0 +1,38 @@
+"""Make weekly summary week_start unique
+
+Revision ID: 8d41e7a2b5c3
+Revises: 3f8b6c1d2e97
+Create Date: 2026-10-19 17:48:13.927406
+
+Removes duplicate summaries for the same week, keeping the most recently inserted one,
+and replaces the week_start index with a unique index. Summary writes upsert on it
+(INSERT ... ON CONFLICT (week_start) DO UPDATE).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d41e7a2b5c3'
+down_revision: Union[str, None] = '3f8b6c1d2e97'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("""
+        DELETE FROM weekly_summaries older
+        USING weekly_summaries newer
+        WHERE older.week_start = newer.week_start AND older.id < newer.id
+    """)
+    op.drop_index('ix_weekly_summaries_week_start', table_name='weekly_summaries')
+    op.create_index('ix_weekly_summaries_week_start', 'weekly_summaries', ['week_start'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_weekly_summaries_week_start', table_name='weekly_summaries')
+    op.create_index('ix_weekly_summaries_week_start', 'weekly_summaries', ['week_start'], unique=False)
@@ -0,0 +1,43 @@
+"""Replace the ivfflat embedding index with HNSW
+
+Revision ID: 9acedabbcb0f
+Revises: ac2422d1964b
+Create Date: 2026-10-19 10:02:17.552190
+
+The ivfflat index was built with lists = 100 on an empty table, so its centroids are
+meaningless and recall is poor until it is rebuilt. HNSW has no training step and keeps
+good recall as rows are added. Build settings come from HNSW_M and HNSW_EF_CONSTRUCTION.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from config.embeddings import EMBEDDING_PROFILE, HNSW_CONFIG, get_vector_cosine_ops
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9acedabbcb0f'
+down_revision: Union[str, None] = 'ac2422d1964b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("DROP INDEX IF EXISTS weekly_summaries_embedding_idx")
+    op.execute(f"""
+        CREATE INDEX weekly_summaries_embedding_idx
+        ON weekly_summaries USING hnsw (embedding {get_vector_cosine_ops(EMBEDDING_PROFILE)})
+        WITH (m = {HNSW_CONFIG['m']}, ef_construction = {HNSW_CONFIG['ef_construction']})
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP INDEX IF EXISTS weekly_summaries_embedding_idx")
+    op.execute(f"""
+        CREATE INDEX weekly_summaries_embedding_idx
+        ON weekly_summaries USING ivfflat (embedding {get_vector_cosine_ops(EMBEDDING_PROFILE)})
+        WITH (lists = 100)
+    """)
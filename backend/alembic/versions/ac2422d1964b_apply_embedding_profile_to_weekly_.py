@@ -0,0 +1,83 @@
+"""Apply the embedding profile (dimensions and precision) to weekly_summaries.embedding
+
+Revision ID: ac2422d1964b
+Revises: 5ba00e5c8cce
+Create Date: 2026-10-19 09:12:44.318027
+
+Converts the embedding column to the type configured by EMBEDDING_DIMENSIONS and
+EMBEDDING_PRECISION (see config/embeddings.py):
+- same dimensions: existing vectors are cast (e.g. vector(1536) -> halfvec(1536))
+- fewer dimensions: existing vectors are truncated and re-normalized, which matches
+  what text-embedding-3 returns for the smaller `dimensions`
+- more dimensions: embeddings are cleared, run POST /api/admin/reembed-summaries?only_missing=true
+
+To switch profiles later, change the environment variables and re-run this migration
+(alembic downgrade 5ba00e5c8cce && alembic upgrade head).
+Requires pgvector >= 0.7 for halfvec, subvector and l2_normalize.
+"""
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from config.embeddings import EMBEDDING_PROFILE, FULL_EMBEDDING_DIMENSIONS, get_vector_sql_type, get_vector_cosine_ops
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ac2422d1964b'
+down_revision: Union[str, None] = '5ba00e5c8cce'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def get_current_embedding_dimensions() -> int:
+    """Read the current dimensions of weekly_summaries.embedding from the catalog."""
+    column_type = op.get_bind().execute(sa.text("""
+        SELECT format_type(atttypid, atttypmod)
+        FROM pg_attribute
+        WHERE attrelid = 'weekly_summaries'::regclass AND attname = 'embedding'
+    """)).scalar()
+    match = re.search(r'\((\d+)\)', column_type or "")
+    return int(match.group(1)) if match else FULL_EMBEDDING_DIMENSIONS
+
+
+def convert_embedding_column(target_type: str, target_dimensions: int, ops: str) -> None:
+    """Convert the embedding column to target_type, keeping existing vectors where possible."""
+    current_dimensions = get_current_embedding_dimensions()
+
+    if target_dimensions == current_dimensions:
+        using = f"embedding::{target_type}"
+    elif target_dimensions < current_dimensions:
+        using = f"l2_normalize(subvector(embedding::vector, 1, {target_dimensions}))::{target_type}"
+    else:
+        using = "NULL"
+
+    op.execute("DROP INDEX IF EXISTS weekly_summaries_embedding_idx")
+    op.execute(f"ALTER TABLE weekly_summaries ALTER COLUMN embedding TYPE {target_type} USING {using}")
+    op.execute(f"""
+        CREATE INDEX weekly_summaries_embedding_idx
+        ON weekly_summaries USING ivfflat (embedding {ops})
+        WITH (lists = 100)
+    """)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Older images ship pgvector < 0.7, which has no halfvec
+    op.execute("ALTER EXTENSION vector UPDATE")
+
+    convert_embedding_column(
+        target_type=get_vector_sql_type(EMBEDDING_PROFILE),
+        target_dimensions=EMBEDDING_PROFILE['dimensions'],
+        ops=get_vector_cosine_ops(EMBEDDING_PROFILE)
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    convert_embedding_column(
+        target_type=f"vector({FULL_EMBEDDING_DIMENSIONS})",
+        target_dimensions=FULL_EMBEDDING_DIMENSIONS,
+        ops="vector_cosine_ops"
+    )
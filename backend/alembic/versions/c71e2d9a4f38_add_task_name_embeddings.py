@@ -0,0 +1,53 @@
+"""Add task_name_embeddings for semantic task search
+
+Revision ID: c71e2d9a4f38
+Revises: 54d09f20abd4
+Create Date: 2026-10-19 16:05:41.902317
+
+Task names repeat, so embeddings are stored once per distinct normalized name
+(lowercased, whitespace collapsed) rather than per task, with an HNSW index for
+name search. Tasks join back on the same normalization expression, indexed on tasks.
+
+The embedding column has the same type as weekly_summaries.embedding, and the migration
+fails if the embedding profile in the environment no longer matches it. Downgrade this revision
+before re-running the embedding profile migration (ac2422d1964b) with new dimensions.
+Embeddings are filled in by POST /api/admin/regenerate-embeddings (also run on startup).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from config.embeddings import HNSW_CONFIG, get_stored_embedding_profile, get_vector_cosine_ops, get_vector_sql_type
+from models.models import TASK_NAME_NORMALIZED_EXPRESSION
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c71e2d9a4f38'
+down_revision: Union[str, None] = '54d09f20abd4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    profile = get_stored_embedding_profile(op.get_bind())
+    op.execute(f"""
+        CREATE TABLE IF NOT EXISTS task_name_embeddings (
+            normalized_name VARCHAR NOT NULL PRIMARY KEY,
+            embedding {get_vector_sql_type(profile)} NOT NULL,
+            created_at TIMESTAMP WITHOUT TIME ZONE
+        )
+    """)
+    op.execute(f"""
+        CREATE INDEX IF NOT EXISTS task_name_embeddings_embedding_idx
+        ON task_name_embeddings USING hnsw (embedding {get_vector_cosine_ops(profile)})
+        WITH (m = {HNSW_CONFIG['m']}, ef_construction = {HNSW_CONFIG['ef_construction']})
+    """)
+    op.execute(f"CREATE INDEX IF NOT EXISTS tasks_normalized_name_idx ON tasks (({TASK_NAME_NORMALIZED_EXPRESSION}))")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP INDEX IF EXISTS tasks_normalized_name_idx")
+    op.execute("DROP TABLE IF EXISTS task_name_embeddings")
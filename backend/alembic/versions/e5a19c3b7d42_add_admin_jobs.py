@@ -0,0 +1,41 @@
+"""Add admin_jobs for background job state shared by worker processes
+
+Revision ID: e5a19c3b7d42
+Revises: 8d41e7a2b5c3
+Create Date: 2026-10-19 21:12:37.514206
+
+One row per admin background job (e.g. sample data generation). A worker claims a job
+by upserting its row to running, unless it is already running with a recent heartbeat,
+so only one run happens at a time across all workers and any worker can report status.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a19c3b7d42'
+down_revision: Union[str, None] = '8d41e7a2b5c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS admin_jobs (
+            name VARCHAR NOT NULL PRIMARY KEY,
+            status VARCHAR NOT NULL,
+            details JSONB NOT NULL DEFAULT '{}'::jsonb,
+            progress JSONB NOT NULL DEFAULT '{}'::jsonb,
+            started_at TIMESTAMP WITHOUT TIME ZONE,
+            finished_at TIMESTAMP WITHOUT TIME ZONE,
+            updated_at TIMESTAMP WITHOUT TIME ZONE
+        )
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TABLE IF EXISTS admin_jobs")
@@ -0,0 +1,38 @@
+"""Store weekly summary stats as JSONB with filter indexes
+
+Revision ID: fb6ae9a437b6
+Revises: 5e6756a98328
+Create Date: 2026-10-19 13:41:52.218604
+
+Converts stats from json to jsonb and adds expression indexes on the fields used by
+search filters: lower(stats->>'avg_focus') and stats->>'total_hours' as numeric.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'fb6ae9a437b6'
+down_revision: Union[str, None] = '5e6756a98328'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("ALTER TABLE weekly_summaries ALTER COLUMN stats TYPE jsonb USING stats::jsonb")
+    # Same expressions as WEEKLY_SUMMARY_AVG_FOCUS_EXPRESSION and WEEKLY_SUMMARY_TOTAL_HOURS_EXPRESSION in models/models.py
+    op.execute("CREATE INDEX IF NOT EXISTS weekly_summaries_avg_focus_idx ON weekly_summaries ((lower(stats->>'avg_focus')))")
+    op.execute(r"""
+        CREATE INDEX IF NOT EXISTS weekly_summaries_total_hours_idx ON weekly_summaries
+        ((CASE WHEN stats->>'total_hours' ~ '^[0-9]+(\.[0-9]+)?$' THEN (stats->>'total_hours')::numeric END))
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP INDEX IF EXISTS weekly_summaries_total_hours_idx")
+    op.execute("DROP INDEX IF EXISTS weekly_summaries_avg_focus_idx")
+    op.execute("ALTER TABLE weekly_summaries ALTER COLUMN stats TYPE json USING stats::json")
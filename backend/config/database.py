@@ -1,4 +1,5 @@
 import os
+from typing import Optional
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -20,6 +21,46 @@ def get_database_config():
     
     return config
 
+def get_read_database_url(driver: str = "asyncpg") -> Optional[str]:
+    """
+    Get the read replica URL, or None when no replica is configured.
+    
+    READ_POSTGRES_HOST enables the replica. READ_POSTGRES_PORT, READ_POSTGRES_USER,
+    READ_POSTGRES_PASSWORD and READ_POSTGRES_DB default to the primary's settings.
+    """
+    host = os.getenv("READ_POSTGRES_HOST")
+    if not host:
+        return None
+
+    config = get_database_config()
+    # `or`, not a getenv default, so settings left empty in .env fall back to the primary's too
+    user = os.getenv("READ_POSTGRES_USER") or config['user']
+    password = os.getenv("READ_POSTGRES_PASSWORD") or config['password']
+    port = os.getenv("READ_POSTGRES_PORT") or config['port']
+    database = os.getenv("READ_POSTGRES_DB") or config['database']
+    return f"postgresql+{driver}://{user}:{password}@{host}:{port}/{database}"
+
+def get_pool_config() -> dict:
+    """
+    Get connection pool settings from environment variables.
+    
+    - DB_POOL_SIZE: connections kept open (default: 5)
+    - DB_MAX_OVERFLOW: extra connections opened under load, closed when returned (default: 10)
+    - DB_POOL_TIMEOUT: seconds to wait for a free connection before failing (default: 30)
+    - DB_POOL_RECYCLE: seconds after which a connection is replaced, -1 to disable (default: 1800)
+    - DB_POOL_PRE_PING: check each connection is alive before using it (default: true)
+    - DB_STATEMENT_CACHE_SIZE: prepared statements cached per connection, 0 behind
+      PgBouncer in transaction mode (default: 100)
+    """
+    return {
+        'pool_size': int(os.getenv("DB_POOL_SIZE", "5")),
+        'max_overflow': int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        'pool_timeout': float(os.getenv("DB_POOL_TIMEOUT", "30")),
+        'pool_recycle': int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        'pool_pre_ping': os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes"),
+        'statement_cache_size': int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100")),
+    }
+
 def get_database_url(driver: str = "asyncpg") -> str:
     """
     Get database URL with specified driver.
@@ -36,4 +77,8 @@ def get_database_url(driver: str = "asyncpg") -> str:
 
 # Common URLs for convenience
 ASYNC_DATABASE_URL = get_database_url("asyncpg")  # For FastAPI app
-SYNC_DATABASE_URL = get_database_url("psycopg2")  # For Alembic 
\ No newline at end of file
+SYNC_DATABASE_URL = get_database_url("psycopg2")  # For Alembic
+READ_ASYNC_DATABASE_URL = get_read_database_url("asyncpg")  # Read replica for GET routes, None to read from the primary
+POOL_CONFIG = get_pool_config()
+# Seconds a client keeps reading from the primary after its own write, so it sees it despite replica lag
+READ_AFTER_WRITE_SECONDS = float(os.getenv("READ_AFTER_WRITE_SECONDS", "5")) 
\ No newline at end of file
@@ -0,0 +1,170 @@
+import os
+import numpy as np
+from dotenv import load_dotenv
+from sqlalchemy import text
+from pgvector.sqlalchemy import Vector, HALFVEC
+
+# Load environment variables
+load_dotenv()
+
+# Native output size of OpenAI's text-embedding-3-small
+FULL_EMBEDDING_DIMENSIONS = 1536
+
+VALID_PRECISIONS = ("float32", "float16")
+
+VALID_PROVIDERS = ("openai", "local")
+
+def get_embedding_profile() -> dict:
+    """
+    Get the embedding profile (model, dimensions and storage precision) from environment variables.
+
+    Smaller dimensions use OpenAI's `dimensions` parameter (text-embedding-3 models are trained so
+    that truncated embeddings still work well), and float16 is stored with pgvector's halfvec type.
+    The local provider embeds on CPU with LOCAL_EMBEDDING_MODEL, either a sentence-transformers
+    model name or "hashing" for a dependency-free hashed bag-of-words projection.
+    """
+    profile = {
+        'provider': os.getenv("EMBEDDING_PROVIDER", "openai").lower(),
+        'model': os.getenv("EMBEDDING_MODEL", "text-embedding-3-small"),
+        'local_model': os.getenv("LOCAL_EMBEDDING_MODEL", "hashing"),
+        'dimensions': int(os.getenv("EMBEDDING_DIMENSIONS", str(FULL_EMBEDDING_DIMENSIONS))),
+        'precision': os.getenv("EMBEDDING_PRECISION", "float32").lower()
+    }
+
+    # Validate the profile
+    if profile['provider'] not in VALID_PROVIDERS:
+        raise ValueError(f"EMBEDDING_PROVIDER must be one of {', '.join(VALID_PROVIDERS)}")
+    if profile['precision'] not in VALID_PRECISIONS:
+        raise ValueError(f"EMBEDDING_PRECISION must be one of {', '.join(VALID_PRECISIONS)}")
+    if not 1 <= profile['dimensions'] <= FULL_EMBEDDING_DIMENSIONS:
+        raise ValueError(f"EMBEDDING_DIMENSIONS must be between 1 and {FULL_EMBEDDING_DIMENSIONS}")
+
+    return profile
+
+def get_vector_type_name(profile: dict = None) -> str:
+    """Get the pgvector type name for the profile ('vector' or 'halfvec')."""
+    profile = profile or EMBEDDING_PROFILE
+    return "halfvec" if profile['precision'] == "float16" else "vector"
+
+def get_vector_sql_type(profile: dict = None) -> str:
+    """Get the full pgvector column type for the profile, e.g. 'halfvec(512)'."""
+    profile = profile or EMBEDDING_PROFILE
+    return f"{get_vector_type_name(profile)}({profile['dimensions']})"
+
+def get_vector_cosine_ops(profile: dict = None) -> str:
+    """Get the operator class used by cosine distance indexes for the profile."""
+    return f"{get_vector_type_name(profile)}_cosine_ops"
+
+def get_embedding_bit_expression(profile: dict = None) -> str:
+    """Get the SQL expression for the sign-quantized (1 bit per dimension) copy of the embedding."""
+    profile = profile or EMBEDDING_PROFILE
+    return f"binary_quantize(embedding)::bit({profile['dimensions']})"
+
+EMBEDDING_COLUMN_TYPE = text("""
+    SELECT format_type(atttypid, atttypmod)
+    FROM pg_attribute
+    WHERE attrelid = 'weekly_summaries'::regclass AND attname = 'embedding'
+""")
+
+def get_stored_embedding_profile(connection, profile: dict = None) -> dict:
+    """
+    Get the profile weekly_summaries.embedding was migrated to (by ac2422d1964b), for later
+    migrations that size their columns to match it.
+
+    Raises ValueError when the profile no longer matches the column, instead of building columns
+    of another size than the embeddings they are derived from or compared with.
+    """
+    profile = profile or EMBEDDING_PROFILE
+    stored_type = connection.execute(EMBEDDING_COLUMN_TYPE).scalar()
+    if stored_type != get_vector_sql_type(profile):
+        raise ValueError(
+            f"weekly_summaries.embedding is {stored_type}, but EMBEDDING_DIMENSIONS/EMBEDDING_PRECISION give "
+            f"{get_vector_sql_type(profile)}. Set them to match the column, or re-run the embedding profile "
+            f"migration (ac2422d1964b) first"
+        )
+    return profile
+
+def to_embedding_array(embedding) -> np.ndarray:
+    """Convert an embedding (list, ndarray, pgvector text literal or HalfVector) to a float32 array."""
+    if isinstance(embedding, np.ndarray) and embedding.dtype == np.float32:
+        return embedding
+    if isinstance(embedding, str):
+        return np.array(embedding.strip("[]").split(","), dtype=np.float32)
+    if hasattr(embedding, "to_numpy"):
+        embedding = embedding.to_numpy()
+    return np.asarray(embedding, dtype=np.float32)
+
+class _BinaryTransferMixin:
+    """
+    Send embeddings to asyncpg as float32 arrays instead of text literals.
+
+    The pgvector codec registered on each asyncpg connection (services/database.py)
+    encodes them in binary. Other drivers (psycopg2 for Alembic and scripts) keep
+    pgvector's text format.
+    """
+
+    def bind_processor(self, dialect):
+        if dialect.driver != "asyncpg":
+            return super().bind_processor(dialect)
+
+        def process(value):
+            if value is None:
+                return value
+            value = to_embedding_array(value)
+            if self.dim is not None and value.shape[0] != self.dim:
+                raise ValueError(f"expected {self.dim} dimensions, not {value.shape[0]}")
+            return value
+        return process
+
+class BinaryVector(_BinaryTransferMixin, Vector):
+    """pgvector vector column type using binary transfer with asyncpg."""
+    # Looked up on each class itself, without it statements binding embeddings
+    # are never stored in SQLAlchemy's compiled cache
+    cache_ok = True
+
+class BinaryHalfVector(_BinaryTransferMixin, HALFVEC):
+    """pgvector halfvec column type using binary transfer with asyncpg."""
+    cache_ok = True
+
+def get_embedding_column_type(profile: dict = None):
+    """Get the SQLAlchemy column type for the profile."""
+    profile = profile or EMBEDDING_PROFILE
+    if profile['precision'] == "float16":
+        return BinaryHalfVector(profile['dimensions'])
+    return BinaryVector(profile['dimensions'])
+
+# Profile used by the app, models and migrations
+EMBEDDING_PROFILE = get_embedding_profile()
+EMBEDDING_MODEL = EMBEDDING_PROFILE['model']
+EMBEDDING_DIMENSIONS = EMBEDDING_PROFILE['dimensions']
+EMBEDDING_PRECISION = EMBEDDING_PROFILE['precision']
+EMBEDDING_PROVIDER = EMBEDDING_PROFILE['provider']
+
+def get_hnsw_config() -> dict:
+    """
+    Get HNSW index build and search settings from environment variables.
+
+    m and ef_construction are applied when the index is built (by migration), ef_search
+    is set per query from the requested limit and clamped to [ef_search_min, ef_search_max].
+    iterative_scan (pgvector >= 0.8) is used by filtered searches: relaxed_order, strict_order or off.
+    """
+    return {
+        'm': int(os.getenv("HNSW_M", "16")),
+        'ef_construction': int(os.getenv("HNSW_EF_CONSTRUCTION", "64")),
+        'ef_search_min': int(os.getenv("HNSW_EF_SEARCH_MIN", "40")),
+        'ef_search_max': int(os.getenv("HNSW_EF_SEARCH_MAX", "400")),
+        'ef_search_per_result': int(os.getenv("HNSW_EF_SEARCH_PER_RESULT", "4")),
+        'iterative_scan': os.getenv("HNSW_ITERATIVE_SCAN", "relaxed_order")
+    }
+
+HNSW_CONFIG = get_hnsw_config()
+
+def get_hnsw_ef_search(limit: int, hnsw_config: dict = None) -> int:
+    """Get the hnsw.ef_search to use for a query returning `limit` results."""
+    hnsw_config = hnsw_config or HNSW_CONFIG
+    ef_search = limit * hnsw_config['ef_search_per_result']
+    return max(hnsw_config['ef_search_min'], min(ef_search, hnsw_config['ef_search_max']))
+
+# Per-transaction HNSW search settings, built once and shared by every vector search
+SET_EF_SEARCH = text("SELECT set_config('hnsw.ef_search', :ef_search, true)")
+SET_ITERATIVE_SCAN = text("SELECT set_config('hnsw.iterative_scan', :iterative_scan, true)")
@@ -1,27 +1,82 @@
 import os
+import logging
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 import weave
 import asyncio
+from contextlib import asynccontextmanager
 
+from routers import tasks, summaries, admin
 from routers.tasks import router as tasks_router
 from routers.summaries import router as summaries_router
 from routers.admin import router as admin_router
-from services.database import get_session
+from services.database import get_session, READ_PRIMARY_UNTIL_HEADER
+from services.leader_election import LeaderElection
+from services.embedding_providers import close_embedding_provider
 from routers.admin import regenerate_embeddings_route
+from utils.loop_watchdog import loop_watchdog, LOOP_WATCHDOG_ENABLED
+from utils.logging_utils import configure_logging
 
 # Load environment variables
 load_dotenv()
 
+# Log through a queue and a listener thread, in every worker process
+configure_logging()
+logger = logging.getLogger(__name__)
+
 # Initialize Weave for experiment tracking (skip during tests)
 if not os.getenv("TESTING"):
     weave.init("Productivity Tracker API")
 
+def init_services() -> None:
+    """Create the routers' services for this worker process."""
+    tasks.init_services()
+    summaries.init_services()
+    admin.init_services()
+
+def close_services() -> None:
+    """Stop local embedding worker processes."""
+    close_embedding_provider()
+
+async def run_startup_jobs():
+    """Generate any missing summaries or embeddings. Runs in the leader worker only."""
+    try:
+        async for db in get_session():
+            result = await regenerate_embeddings_route(db)
+            logger.info("Startup jobs complete: %s", result['message'])
+            break  # Only need first session from the generator
+    except Exception as e:
+        logger.warning(
+            "Failed to regenerate embeddings on startup: %s. Server will continue running, but some summaries "
+            "may be missing. If so, try calling POST /api/admin/regenerate-embeddings", e
+        )
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Set up each worker process: create its services, start the event loop watchdog, and
+    compete for leadership. Only the leader runs the startup jobs, in the background, so
+    every worker serves requests straight away.
+    """
+    logger.info("Starting worker %d", os.getpid())
+    if int(os.getenv("WEB_CONCURRENCY", "1")) > 1 and summaries.RATE_LIMIT_STORAGE_URI.startswith("memory://"):
+        logger.warning("Rate limits are counted per worker process, set RATE_LIMIT_STORAGE_URI to share them between workers")
+    init_services()
+    if LOOP_WATCHDOG_ENABLED:
+        loop_watchdog.start()
+    app.state.leader_election = LeaderElection(on_elected=run_startup_jobs)
+    app.state.leader_election.start()
+    yield
+    await app.state.leader_election.stop()
+    await loop_watchdog.stop()
+    close_services()
+
 app = FastAPI(
     title="Productivity Tracker API",
     description="Clean API for productivity tracking with AI-powered insights and vector search",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -30,6 +85,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[READ_PRIMARY_UNTIL_HEADER],
 )
 
 # Include all routers
@@ -37,21 +93,6 @@ app.include_router(tasks_router, prefix="/api")
 app.include_router(summaries_router, prefix="/api")
 app.include_router(admin_router, prefix="/api")
 
-@app.on_event("startup")
-async def startup_event():
-    """Run regenerate embeddings on server startup."""
-    try:
-        print("🚀 Starting up...")
-        
-        # Generate any missing summaries or embeddings
-        async for db in get_session():
-            result = await regenerate_embeddings_route(db)
-            print(f"✅ Startup complete: {result['message']}")
-            break  # Only need first session from the generator
-    except Exception as e:
-        print(f"⚠️  Warning: Failed to regenerate embeddings on startup: {str(e)}")
-        print("   Server will continue running, but some summaries may be missing. If so, try calling POST /api/admin/regenerate-embeddings")
-
 @app.get("/")
 async def root():
     return {"message": "Productivity Tracker API is running"}
@@ -1,10 +1,14 @@
 from datetime import datetime, date
 from enum import Enum
 from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, Field, validator, field_validator
+from pydantic import BaseModel, Field, validator, field_validator, model_validator
 from sqlmodel import SQLModel, Field as SQLField
 import sqlalchemy
-from pgvector.sqlalchemy import Vector
+from sqlalchemy import event, DDL, Column
+from sqlalchemy.orm import deferred
+from sqlalchemy.dialects.postgresql import JSONB
+
+from config.embeddings import EMBEDDING_DIMENSIONS, HNSW_CONFIG, get_embedding_column_type, get_embedding_bit_expression
 
 class FocusLevel(str, Enum):
     low = "low"
@@ -53,6 +57,37 @@ class Task(SQLModel, table=True):
         else:
             raise ValueError('Date must be a date object, datetime object, or ISO format date string')
 
+# Task names are embedded once per distinct normalized name (lowercased, whitespace collapsed).
+# Tasks join to task_name_embeddings on this expression, which is indexed on tasks.
+TASK_NAME_NORMALIZED_EXPRESSION = "lower(regexp_replace(btrim(name), '\\s+', ' ', 'g'))"
+
+event.listen(Task.__table__, "after_create", DDL(
+    f"CREATE INDEX IF NOT EXISTS tasks_normalized_name_idx ON tasks (({TASK_NAME_NORMALIZED_EXPRESSION}))"
+))
+
+class TaskNameEmbedding(SQLModel, table=True):
+    """Embedding of a distinct normalized task name, shared by every task with that name."""
+    __tablename__ = "task_name_embeddings"
+
+    normalized_name: str = SQLField(primary_key=True, description="Task name, lowercased with whitespace collapsed")
+    embedding: List[float] = SQLField(sa_type=get_embedding_column_type(), description="Embedding of the normalized name, sized by the embedding profile")
+    created_at: Optional[datetime] = SQLField(default_factory=datetime.utcnow)
+
+    class Config:
+        arbitrary_types_allowed = True
+
+class AdminJob(SQLModel, table=True):
+    """State of an admin background job, in the database so every worker process sees it."""
+    __tablename__ = "admin_jobs"
+
+    name: str = SQLField(primary_key=True, description="Job name, one row per job")
+    status: str = SQLField(description="running, succeeded or failed")
+    details: Dict[str, Any] = SQLField(default_factory=dict, sa_type=JSONB, description="Job parameters, then its result or error")
+    progress: Dict[str, Any] = SQLField(default_factory=dict, sa_type=JSONB, description="Latest progress saved by the running job")
+    started_at: Optional[datetime] = SQLField(default=None)
+    finished_at: Optional[datetime] = SQLField(default=None)
+    updated_at: Optional[datetime] = SQLField(default_factory=datetime.utcnow, description="Last time the job saved its state, a heartbeat while running")
+
 class WeeklyStats(BaseModel):
     total_tasks: int = Field(..., ge=0, description="Total number of tasks")
     total_hours: str = Field(..., description="Total hours worked")
@@ -70,7 +105,8 @@ class SummaryRequest(BaseModel):
     week_start: str = Field(..., description="Week start date in YYYY-MM-DD format") 
     week_end: str = Field(..., description="Week end date in YYYY-MM-DD format")
     week_stats: WeeklyStats = Field(..., description="Weekly statistics")
-    context_summaries: Optional[Dict[str, Any]] = Field(None, description="Surrounding week summaries for context")
+    context_summaries: Optional[Dict[str, Any]] = Field(None, description="Deprecated: surrounding week summaries for context. Leave empty to have the server load them")
+    context_weeks: Optional[int] = Field(None, ge=0, le=8, description="Number of previous and next weeks the server loads as context (defaults to SUMMARY_CONTEXT_WEEKS)")
 
     @field_validator('week_start')
     @classmethod
@@ -86,34 +122,40 @@ class SummaryRequest(BaseModel):
             raise ValueError('Week end cannot be empty')
         return v
 
+# The embedding is the bulk of each row and only search and re-embedding use it. It is deferred,
+# so ORM queries never fetch it, and raises on access instead of lazy loading
+WEEKLY_SUMMARY_EMBEDDING_COLUMN = Column("embedding", get_embedding_column_type(), nullable=True)
+
 class WeeklySummary(SQLModel, table=True):
     """Weekly summary model - works for database, API input, and API output."""
     __tablename__ = "weekly_summaries"
+    __mapper_args__ = {"properties": {"embedding": deferred(WEEKLY_SUMMARY_EMBEDDING_COLUMN, raiseload=True)}}
     
     id: Optional[int] = SQLField(default=None, primary_key=True)
-    week_start: str = SQLField(index=True)
-    week_end: str = SQLField(index=True)
+    week_start: date = SQLField(index=True, unique=True, description="First day of the week, one summary per week")
+    week_end: date = SQLField(index=True, description="Last day of the week")
     summary: str = SQLField(description="Summary of the week's tasks and productivity metrics")
-    stats: Dict[str, Any] = SQLField(default_factory=dict, sa_type=sqlalchemy.JSON, description="Weekly statistics")
+    stats: Dict[str, Any] = SQLField(default_factory=dict, sa_type=JSONB, description="Weekly statistics")
     recommendations: List[str] = SQLField(default_factory=list, sa_type=sqlalchemy.JSON, description="Recommendations to improve efficiency or focus for the next week")
-    embedding: Optional[List[float]] = SQLField(None, sa_type=Vector(1536), exclude=True, description="Embedding of the summary for vector search")
+    embedding: Optional[List[float]] = SQLField(None, sa_column=WEEKLY_SUMMARY_EMBEDDING_COLUMN, exclude=True, description="Embedding of the summary for vector search, sized by the embedding profile (EMBEDDING_DIMENSIONS/EMBEDDING_PRECISION)")
     similarity: Optional[float] = SQLField(None, exclude=True, description="LLM should ignore, only used for vector search result's cosine similarity score e.g. confidence")
     created_at: Optional[datetime] = SQLField(default_factory=datetime.utcnow)
     updated_at: Optional[datetime] = SQLField(default_factory=datetime.utcnow)
 
-    @field_validator('week_start')
+    @field_validator('week_start', 'week_end', mode='before')
     @classmethod
-    def validate_week_start(cls, v):
-        if not v or not v.strip():
-            raise ValueError('Week start cannot be empty')
-        return v
-
-    @field_validator('week_end')
-    @classmethod
-    def validate_week_end(cls, v):
-        if not v or not v.strip():
-            raise ValueError('Week end cannot be empty')
-        return v
+    def validate_week_dates(cls, v):
+        if isinstance(v, str):
+            try:
+                return date.fromisoformat(v)
+            except ValueError:
+                raise ValueError('Week dates must be valid ISO format date strings (YYYY-MM-DD)')
+        elif isinstance(v, datetime):
+            return v.date()
+        elif isinstance(v, date):
+            return v
+        else:
+            raise ValueError('Week dates must be date objects, datetime objects, or ISO format date strings')
 
     @field_validator('summary')
     @classmethod
@@ -125,6 +167,64 @@ class WeeklySummary(SQLModel, table=True):
     class Config:
         arbitrary_types_allowed = True
 
+# Full-text search column over summary and recommendations. It is generated by Postgres and
+# not mapped on the model, so the ORM never reads or writes it. Keep in sync with its migration.
+WEEKLY_SUMMARY_SEARCH_TSV_EXPRESSION = (
+    "setweight(to_tsvector('english', coalesce(summary, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(recommendations::text, '')), 'B')"
+)
+
+# Also add it for tables created with SQLModel.metadata.create_all (e.g. the test database)
+event.listen(WeeklySummary.__table__, "after_create", DDL(
+    f"ALTER TABLE weekly_summaries ADD COLUMN IF NOT EXISTS search_tsv tsvector "
+    f"GENERATED ALWAYS AS ({WEEKLY_SUMMARY_SEARCH_TSV_EXPRESSION}) STORED"
+))
+event.listen(WeeklySummary.__table__, "after_create", DDL(
+    "CREATE INDEX IF NOT EXISTS weekly_summaries_search_tsv_idx ON weekly_summaries USING gin (search_tsv)"
+))
+
+# Sign-quantized embedding for the two-stage search prefilter, generated by Postgres and not mapped
+event.listen(WeeklySummary.__table__, "after_create", DDL(
+    f"ALTER TABLE weekly_summaries ADD COLUMN IF NOT EXISTS embedding_bit bit({EMBEDDING_DIMENSIONS}) "
+    f"GENERATED ALWAYS AS ({get_embedding_bit_expression()}) STORED"
+))
+event.listen(WeeklySummary.__table__, "after_create", DDL(
+    f"CREATE INDEX IF NOT EXISTS weekly_summaries_embedding_bit_idx ON weekly_summaries "
+    f"USING hnsw (embedding_bit bit_hamming_ops) "
+    f"WITH (m = {HNSW_CONFIG['m']}, ef_construction = {HNSW_CONFIG['ef_construction']})"
+))
+
+# Expressions over stats used by search filters, indexed by the same expressions.
+# total_hours is stored as a string, non-numeric values are treated as unknown rather than failing the cast.
+WEEKLY_SUMMARY_AVG_FOCUS_EXPRESSION = "lower(stats->>'avg_focus')"
+WEEKLY_SUMMARY_TOTAL_HOURS_EXPRESSION = (
+    "(CASE WHEN stats->>'total_hours' ~ '^[0-9]+(\\.[0-9]+)?$' THEN (stats->>'total_hours')::numeric END)"
+)
+
+event.listen(WeeklySummary.__table__, "after_create", DDL(
+    f"CREATE INDEX IF NOT EXISTS weekly_summaries_avg_focus_idx ON weekly_summaries (({WEEKLY_SUMMARY_AVG_FOCUS_EXPRESSION}))"
+))
+event.listen(WeeklySummary.__table__, "after_create", DDL(
+    f"CREATE INDEX IF NOT EXISTS weekly_summaries_total_hours_idx ON weekly_summaries ({WEEKLY_SUMMARY_TOTAL_HOURS_EXPRESSION})"
+))
+
+class SummarySearchFilters(BaseModel):
+    """Optional filters applied inside summary search queries."""
+    start_date: Optional[date] = Field(None, description="Earliest week start (YYYY-MM-DD)")
+    end_date: Optional[date] = Field(None, description="Latest week start (YYYY-MM-DD)")
+    avg_focus: Optional[FocusLevel] = Field(None, description="Average focus level of the week")
+    min_hours: Optional[float] = Field(None, ge=0, description="Minimum total hours worked in the week")
+    max_hours: Optional[float] = Field(None, ge=0, description="Maximum total hours worked in the week")
+
+    @model_validator(mode='after')
+    def validate_date_range(self):
+        if self.start_date and self.end_date and self.start_date > self.end_date:
+            raise ValueError('start_date must not be after end_date')
+        return self
+
+    def is_empty(self) -> bool:
+        return all(value is None for value in self.model_dump().values())
+
 class WeeklySummaryPublic(BaseModel):
     """Public API response model for weekly summaries - excludes sensitive fields."""
     id: Optional[int]
@@ -136,6 +236,24 @@ class WeeklySummaryPublic(BaseModel):
     created_at: Optional[datetime]
     updated_at: Optional[datetime]
 
+    @field_validator('week_start', 'week_end', mode='before')
+    @classmethod
+    def format_week_dates(cls, v):
+        # Stored as DATE, returned in the same YYYY-MM-DD format as before
+        return v.isoformat() if isinstance(v, date) else v
+
+class BatchSearchRequest(BaseModel):
+    """Request model for searching summaries with several queries at once."""
+    queries: List[str] = Field(..., min_length=1, max_length=10, description="Search queries (1-10)")
+    limit: int = Field(5, ge=1, le=20, description="Number of results per query")
+    filters: Optional[SummarySearchFilters] = Field(None, description="Filters applied to every query")
+
+class BatchSearchResult(BaseModel):
+    """Results for one query of a batch search."""
+    query: str
+    search_text: str = Field(..., description="The query as searched, after sanitizing and rewriting")
+    results: List[WeeklySummaryPublic]
+
 class SummaryResponse(BaseModel):
     """Response model for AI-generated summaries."""
     summary: str = Field(..., description="AI generated summary")
@@ -1,91 +1,197 @@
 """
 Admin router.
 """
-from fastapi import APIRouter, HTTPException, Depends
+import os
+import asyncio
+import logging
+from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, Query, Request
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
 from datetime import datetime, timedelta
-from typing import List, Dict
-from services.database import get_session
+from typing import List, Dict, Optional
+from services.database import get_session, get_pool_stats, get_query_cache_stats, engine, release_connection, mark_write
 from services.summary_service import SummaryService
-from services.task_service import TaskService
+from services.admin_job_service import AdminJobService
+from services.task_search_service import TaskSearchService
 from services.ai_service import AIService
-from models.models import Task, WeeklySummary, FocusLevel
-from scripts.seed_data import seed_database, generate_week_summary
+from models.models import Task, FocusLevel
+from scripts.seed_data import generate_week_summary
+from scripts import seed_engine
+from scripts.seed_engine import DEFAULT_SEED, SeedProgress
 from utils.date_utils import group_tasks_by_week
+from utils.loop_watchdog import loop_watchdog
 
 router = APIRouter(prefix="/admin", tags=["admin"])
-summary_service = SummaryService()
-task_service = TaskService()
-ai_service = AIService()
+logger = logging.getLogger(__name__)
+# Services of this worker process, created by init_services() in the app lifespan
+summary_service: Optional[SummaryService] = None
+task_search_service: Optional[TaskSearchService] = None
+ai_service: Optional[AIService] = None
+admin_job_service: Optional[AdminJobService] = None
 
-@router.post("/generate-sample-data", response_model=dict)
-async def generate_sample_data_route(db: AsyncSession = Depends(get_session)):
-    """Generate sample tasks and summaries for demo purposes. Always clears existing data."""
+def init_services() -> None:
+    """Create the router's services. Called once per worker process."""
+    global summary_service, task_search_service, ai_service, admin_job_service
+    summary_service = SummaryService()
+    task_search_service = TaskSearchService()
+    ai_service = AIService()
+    admin_job_service = AdminJobService()
+
+# admin_jobs row of the sample data generation job, shared by all worker processes
+SAMPLE_DATA_JOB = "generate-sample-data"
+
+async def generate_sample_data_job(started_at: datetime, offline: bool, scale: int, seed_value: int):
+    """Background job that replaces all data with generated sample data, saving its progress to admin_jobs as it goes."""
+    details = {"offline": offline, "scale": scale, "seed": seed_value}
+    progress = SeedProgress()
+    stopped = asyncio.Event()
+    heartbeat = asyncio.create_task(admin_job_service.keep_alive(SAMPLE_DATA_JOB, started_at, progress.snapshot, stopped))
     try:
-        result = await seed_database()
-        return {
-            "message": "Sample data generated successfully",
-            "tasks_created": result["tasks_created"],
-            "summaries_created": result["summaries_created"]
-        }
+        result = await seed_engine.seed(
+            engine=engine, seed=seed_value, scale=scale, offline=offline, progress=progress
+        )
+        summary_service.invalidate_similar_summaries()
+        summary_service.invalidate_adjacent_week_context()
+        if summary_service.vector_index is not None:
+            summary_service.vector_index.mark_stale()
+        status, details = "succeeded", {**details, "result": result}
+        logger.info("Generated %d sample tasks and %d summaries", result['tasks_created'], result['summaries_created'])
+    except Exception as e:
+        status, details = "failed", {**details, "error": str(e)}
+        logger.warning("Failed to generate sample data: %s", e)
+    finally:
+        stopped.set()
+        await heartbeat
+    try:
+        async for db in get_session():
+            if not await admin_job_service.finish(db, SAMPLE_DATA_JOB, started_at, status, details, progress.snapshot()):
+                logger.warning("Sample data generation was claimed by another run, not saving its status")
+            break  # Only need first session from the generator
+    except Exception as e:
+        logger.warning("Failed to save sample data generation status: %s", e)
+
+@router.post("/generate-sample-data", response_model=dict, dependencies=[Depends(mark_write)])
+async def generate_sample_data_route(
+    background_tasks: BackgroundTasks,
+    offline: bool = False,
+    scale: int = Query(1, ge=1, le=10000),
+    seed: int = DEFAULT_SEED,
+    db: AsyncSession = Depends(get_session)
+):
+    """
+    Generate sample tasks and summaries for demo purposes, in the background. Always clears existing data.
+
+    Use offline=true for template summaries and local embeddings, without AI calls. Poll
+    GET /admin/generate-sample-data/status for progress. Only one run at a time, across all workers.
+    """
+    try:
+        started_at = await admin_job_service.claim(db, SAMPLE_DATA_JOB, {"offline": offline, "scale": scale, "seed": seed})
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to start sample data generation: {str(e)}")
+    if started_at is None:
+        raise HTTPException(status_code=409, detail="Sample data generation is already running")
+
+    background_tasks.add_task(generate_sample_data_job, started_at, offline, scale, seed)
+    return {
+        "message": "Sample data generation started in the background",
+        "offline": offline,
+        "scale": scale,
+        "seed": seed
+    }
+
+@router.get("/generate-sample-data/status", response_model=dict)
+async def generate_sample_data_status_route(db: AsyncSession = Depends(get_session)):
+    """Status and progress of the latest sample data generation, whichever worker runs it."""
+    try:
+        job = await admin_job_service.get(db, SAMPLE_DATA_JOB)
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to generate sample data: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to get sample data generation status: {str(e)}")
+    return job or {"status": "idle", "progress": SeedProgress().snapshot()}
 
 @router.get("/health")
 async def health_check():
     return {"status": "healthy"}
 
-@router.post("/regenerate-embeddings", response_model=dict)
+@router.get("/pool-stats", response_model=dict)
+async def pool_stats_route():
+    """Live database connection pool usage and checkout wait time histogram, for this worker process."""
+    return get_pool_stats(engine)
+
+@router.get("/query-cache-stats", response_model=dict)
+async def query_cache_stats_route():
+    """SQLAlchemy compiled cache and asyncpg prepared statement cache hit counters, for this worker process."""
+    return get_query_cache_stats(engine)
+
+@router.get("/leader", response_model=dict)
+async def leader_route(request: Request):
+    """Whether the worker process serving this request is the leader that runs startup jobs."""
+    leader_election = getattr(request.app.state, "leader_election", None)
+    return {"worker_pid": os.getpid(), "is_leader": bool(leader_election and leader_election.is_leader)}
+
+@router.get("/loop-stats", response_model=dict)
+async def loop_stats_route():
+    """Event loop lag histogram and recent stalls (callbacks blocking longer than LOOP_LAG_THRESHOLD_MS), for this worker process."""
+    return loop_watchdog.snapshot()
+
+@router.post("/regenerate-embeddings", response_model=dict, dependencies=[Depends(mark_write)])
 async def regenerate_embeddings_route(db: AsyncSession = Depends(get_session)):
-    """Generate all summaries for available task data, and embeddings for existing summaries missing them. Particularly useful after changing the summary generation prompt."""
+    """
+    Generate all summaries for available task data, and embeddings for existing summaries missing them. Particularly useful after changing the summary generation prompt.
+    
+    AI calls run between short transactions, never while a database connection is checked out.
+    """
     try:
-        # Step 1: Get all existing weeks with summaries - use direct DB query to get full objects
-        existing_summaries_query = select(WeeklySummary)
-        result = await db.execute(existing_summaries_query)
-        existing_summaries = result.scalars().all()
-        existing_weeks = {summary.week_start for summary in existing_summaries}
+        # Step 1: Find tasks in weeks without a summary, with one anti-join query instead of loading every summary
+        missing_week_tasks = await summary_service.get_tasks_without_summary(session=db)
+        weeks_with_tasks = group_tasks_by_week(missing_week_tasks)
+        await release_connection(db)
         
-        # Step 2: Get all tasks and group by week
-        all_tasks = await task_service.get_tasks(session=db)
-        weeks_with_tasks = group_tasks_by_week(all_tasks)
-        
-        # Step 3: Generate summaries for weeks that have tasks but no summaries
+        # Step 2: Generate summaries for those weeks. Writes upsert on week_start, so a concurrent
+        # regeneration or POST /api/summaries for the same week cannot create a duplicate
         summaries_created = 0
         for week_start, week_tasks in weeks_with_tasks.items():
-            if week_start not in existing_weeks and len(week_tasks) > 0:
-                week_start_date = datetime.strptime(week_start, '%Y-%m-%d').date()
-                week_end_date = week_start_date + timedelta(days=6)
-                summary = await generate_week_summary(ai_service, week_tasks, week_start_date, week_end_date)
-                if summary:
-                    await summary_service.create_weekly_summary(session=db, summary_data=summary)
-                    summaries_created += 1
-        
-        # Step 4: Generate embeddings for existing summaries that don't have them
-        embeddings_updated = 0
-        
-        for summary in existing_summaries:
-            if summary.embedding is None:
-                # Generate embedding text using the same format as create_weekly_summary
-                summary_text_to_embed = f"""
-                Week {summary.week_start} to {summary.week_end}
-                Summary: {summary.summary}
-                Recommendations: {'; '.join(summary.recommendations or [])}
-                """.strip()
-                
-                # Generate and update embedding using existing service method
-                embedding = await summary_service.generate_embedding(summary_text_to_embed)
-                summary.embedding = summary_service.ensure_embedding_is_list(embedding)
-                db.add(summary)
-                embeddings_updated += 1
+            week_start_date = datetime.strptime(week_start, '%Y-%m-%d').date()
+            week_end_date = week_start_date + timedelta(days=6)
+            summary = await generate_week_summary(ai_service, week_tasks, week_start_date, week_end_date)
+            if summary:
+                await summary_service.create_weekly_summary(session=db, summary_data=summary)
+                summaries_created += 1
         
-        await db.commit()
+        # Step 3: Generate embeddings for existing summaries that don't have them
+        embeddings_updated = await summary_service.reembed_summaries(session=db, only_missing=True)
+
+        # Step 4: Embed distinct task names that don't have an embedding yet
+        task_names_embedded = await task_search_service.embed_missing_task_names(session=db)
         
         return {
             "message": f"Successfully created {summaries_created} new summaries and updated embeddings for {embeddings_updated} existing summaries",
             "summaries_created": summaries_created,
-            "embeddings_updated": embeddings_updated
+            "embeddings_updated": embeddings_updated,
+            "task_names_embedded": task_names_embedded
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to regenerate summaries and embeddings: {str(e)}")
 
+
+
+async def reembed_summaries_job(only_missing: bool):
+    """Background job that re-embeds summaries, and task names unless only_missing, using its own database session."""
+    try:
+        async for db in get_session():
+            reembedded = await summary_service.reembed_summaries(session=db, only_missing=only_missing)
+            logger.info("Re-embedded %d summaries", reembedded)
+            if not only_missing:
+                task_names_embedded = await task_search_service.reembed_task_names(session=db)
+                logger.info("Re-embedded %d task names", task_names_embedded)
+            break  # Only need first session from the generator
+    except Exception as e:
+        logger.warning("Failed to re-embed summaries: %s", e)
+
+@router.post("/reembed-summaries", response_model=dict, dependencies=[Depends(mark_write)])
+async def reembed_summaries_route(background_tasks: BackgroundTasks, only_missing: bool = False):
+    """Re-embed summaries and task names in the background with the current embedding provider and profile (EMBEDDING_DIMENSIONS/EMBEDDING_PRECISION). Use only_missing=true to fill in NULL summary embeddings only."""
+    background_tasks.add_task(reembed_summaries_job, only_missing)
+    return {
+        "message": "Re-embedding started in the background",
+        "only_missing": only_missing,
+        "embedding_profile": summary_service.embedding_profile
+    }
@@ -1,33 +1,54 @@
 """
 CRUD router for weekly summaries with AI generation and search capabilities.
 """
-from fastapi import APIRouter, HTTPException, Depends, Request
+import os
+from datetime import date
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
 from typing import List, Optional
 import weave
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from models.models import Task, WeeklySummary, WeeklySummaryPublic, SummaryRequest, PaginatedSummariesResponse
-from services.summary_service import SummaryService
+from models.models import Task, WeeklySummary, WeeklySummaryPublic, SummaryRequest, PaginatedSummariesResponse, SummarySearchFilters, FocusLevel, BatchSearchRequest, BatchSearchResult
+from services.summary_service import SummaryService, SEARCH_MODES
 from services.ai_service import AIService
 from services.search_service import SearchService
 from services.task_service import TaskService
-from services.database import get_session
+from services.database import get_session, get_read_session, release_connection, mark_write
+from utils.timing import StageTimer
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 
 router = APIRouter(prefix="/summaries", tags=["summaries"])
-limiter = Limiter(key_func=get_remote_address)
+# Rate limit counters. memory:// keeps them in each worker process, a redis:// URI shares them
+RATE_LIMIT_STORAGE_URI = os.getenv("RATE_LIMIT_STORAGE_URI", "memory://")
+limiter = Limiter(key_func=get_remote_address, storage_uri=RATE_LIMIT_STORAGE_URI)
 
-ai_service = AIService()
-summary_service = SummaryService()
-search_service = SearchService()
-task_service = TaskService()
+# Services of this worker process, created by init_services() in the app lifespan
+ai_service: Optional[AIService] = None
+summary_service: Optional[SummaryService] = None
+search_service: Optional[SearchService] = None
+task_service: Optional[TaskService] = None
 
-@router.post("/", response_model=WeeklySummaryPublic)
+def init_services() -> None:
+    """Create the router's services. Called once per worker process."""
+    global ai_service, summary_service, search_service, task_service
+    ai_service = AIService()
+    summary_service = SummaryService()
+    search_service = SearchService()
+    task_service = TaskService()
+
+@router.post("/", response_model=WeeklySummaryPublic, dependencies=[Depends(mark_write)])
 @weave.op()
 @limiter.limit("10/minute")
 async def generate_summary_route(summary_request: SummaryRequest, request: Request, db: AsyncSession = Depends(get_session)):
-    """Generate a weekly productivity summary using AI and store in vector database."""
+    """
+    Generate a weekly productivity summary using AI and store in vector database.
+    
+    No database connection is held during the AI calls: the context read is committed first,
+    and the summary is written with a single upsert once the summary and embedding are ready.
+    """
     try:
         if not summary_request.tasks:
             raise HTTPException(
@@ -35,12 +56,23 @@ async def generate_summary_route(summary_request: SummaryRequest, request: Reque
                 detail="No tasks provided for summary generation"
             )
 
-        # 1. Generate summary using AI service
+        # 1. Load surrounding weeks as context, unless the client sent them (deprecated)
+        adjacent_week_context = None
+        if not summary_request.context_summaries:
+            adjacent_week_context = await summary_service.get_adjacent_week_context(
+                session=db,
+                week_start=summary_request.week_start,
+                weeks=summary_request.context_weeks
+            )
+            await release_connection(db)
+
+        # 2. Generate summary using AI service
         ai_response = await ai_service.generate_weekly_summary(
             tasks=summary_request.tasks,
             week_start=summary_request.week_start,
             week_end=summary_request.week_end,
-            context_summaries=summary_request.context_summaries
+            context_summaries=summary_request.context_summaries,
+            adjacent_week_context=adjacent_week_context
         )
         
         if ai_response.summary == "" or ai_response.recommendations == []:
@@ -49,7 +81,7 @@ async def generate_summary_route(summary_request: SummaryRequest, request: Reque
                 detail="Failed to generate summary, AI response is empty"
             )
         
-        # 2. Prepare data for storage
+        # 3. Prepare data for storage
         summary_data_to_store = WeeklySummary(
             week_start=summary_request.week_start,
             week_end=summary_request.week_end,
@@ -59,7 +91,7 @@ async def generate_summary_route(summary_request: SummaryRequest, request: Reque
             # Embedding will be generated by the service method
         )
         
-        # 3. Store with vector embedding using SummaryService
+        # 4. Embed, then store with a single upsert using SummaryService
         stored_summary = await summary_service.create_weekly_summary(
             session=db,
             summary_data=summary_data_to_store
@@ -80,9 +112,9 @@ async def generate_summary_route(summary_request: SummaryRequest, request: Reque
 async def get_summaries_route(
     offset: int = 0,
     limit: int = 100,
-    start_date: Optional[str] = None,
-    end_date: Optional[str] = None,
-    db: AsyncSession = Depends(get_session)
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    db: AsyncSession = Depends(get_read_session)
 ):
     """
     Get weekly summaries with pagination and optional filtering:
@@ -129,32 +161,112 @@ async def get_summaries_route(
             detail=f"Failed to get summaries: {str(e)}"
         )
 
+def get_search_filters(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    avg_focus: Optional[FocusLevel] = None,
+    min_hours: Optional[float] = Query(None, ge=0),
+    max_hours: Optional[float] = Query(None, ge=0)
+) -> SummarySearchFilters:
+    """Search filters from the query string. An invalid combination, like start_date after end_date, is a 422."""
+    try:
+        return SummarySearchFilters(
+            start_date=start_date, end_date=end_date, avg_focus=avg_focus, min_hours=min_hours, max_hours=max_hours
+        )
+    except ValidationError as e:
+        raise RequestValidationError(e.errors(include_url=False, include_context=False))
+
 @router.get("/search", response_model=List[WeeklySummaryPublic])
 @weave.op()
 @limiter.limit("10/minute")
 async def search_summaries_route(
     query: str,
     request: Request,
-    db: AsyncSession = Depends(get_session)
+    response: Response,
+    mode: str = "hybrid",
+    filters: SummarySearchFilters = Depends(get_search_filters),
+    two_stage: Optional[bool] = None,
+    db: AsyncSession = Depends(get_read_session)
 ):
-    """Search for summaries using vector similarity with prompt injection protection and query improvement."""
+    """
+    Search for summaries with prompt injection protection and query improvement.
+    
+    Modes:
+    - hybrid (default): full-text search first; confident keyword matches are returned without
+      any AI calls, otherwise they are fused with vector search results
+    - keyword: full-text search only, no AI calls
+    - vector: vector similarity search only
+    
+    Results can be filtered by week start date range, average focus and total hours; the
+    filters are applied inside the search query, so a full page of matches is returned.
+    two_stage selects the binary-quantized prefilter with exact rerank (default: VECTOR_SEARCH_TWO_STAGE).
+    
+    Keyword-like queries skip the AI rewrite. The time spent in each stage (keyword, rewrite,
+    embed, search) is returned in the Server-Timing header.
+    """
+    timer = StageTimer()
     try:
-        # Check for prompt injection and improve query
-        improved_query = await search_service.improve_search_query(query)
+        if mode not in SEARCH_MODES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Search mode must be one of: {', '.join(SEARCH_MODES)}"
+            )
+
+        # Full-text search on the sanitized query needs no network call
+        keyword_results = []
+        if mode in ("hybrid", "keyword"):
+            keyword_query = "" if search_service.detect_prompt_injection(query) else search_service.sanitize_query(query)
+            if keyword_query:
+                with timer.stage("keyword"):
+                    keyword_results, confident = await summary_service.keyword_search_week_summaries(
+                        session=db,
+                        query_text=keyword_query,
+                        filters=filters
+                    )
+                if mode == "keyword" or confident:
+                    response.headers["Server-Timing"] = timer.server_timing_header()
+                    return keyword_results
+                await release_connection(db)
+            elif mode == "keyword":
+                raise HTTPException(
+                    status_code=400,
+                    detail="Search query is invalid or too short"
+                )
+
+        # Check for prompt injection, improve the query if worthwhile, and embed it
+        search_text, query_embedding = await search_service.prepare_search_query(
+            query, embed=summary_service.generate_embedding, timer=timer
+        )
         
         # If query was sanitized to empty or too short, return empty results
-        if not improved_query or len(improved_query.strip()) < 2:
+        if query_embedding is None or len(search_text.strip()) < 2:
             raise HTTPException(
                 status_code=400,
                 detail="Search query is invalid or too short"
             )
         
-        # Perform vector search with improved query
-        summaries = await summary_service.vector_search_week_summaries(
-            session=db, 
-            query_text=improved_query, 
-            similarity_threshold=0.3
-        )
+        # Perform vector search with the query embedding, fused with any keyword matches
+        with timer.stage("search"):
+            if mode == "hybrid":
+                summaries = await summary_service.hybrid_search_week_summaries(
+                    session=db,
+                    query_text=search_text,
+                    keyword_results=keyword_results,
+                    similarity_threshold=0.3,
+                    query_embedding=query_embedding,
+                    filters=filters,
+                    two_stage=two_stage
+                )
+            else:
+                summaries = await summary_service.vector_search_week_summaries(
+                    session=db, 
+                    query_text=search_text, 
+                    similarity_threshold=0.3,
+                    query_embedding=query_embedding,
+                    filters=filters,
+                    two_stage=two_stage
+                )
+        response.headers["Server-Timing"] = timer.server_timing_header()
         return summaries
         
     except HTTPException:
@@ -165,8 +277,62 @@ async def search_summaries_route(
             detail=f"Failed to search summaries: {str(e)}"
         )
 
+@router.post("/search/batch", response_model=List[BatchSearchResult])
+@weave.op()
+@limiter.limit("10/minute")
+async def batch_search_summaries_route(
+    batch_request: BatchSearchRequest,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_session)
+):
+    """
+    Vector search for several queries at once.
+    
+    Queries are rewritten concurrently, embedded with a single embeddings call, and searched
+    with one SQL statement. Invalid or too short queries get empty results. The time spent
+    in each stage (rewrite, embed, search) is returned in the Server-Timing header.
+    """
+    timer = StageTimer()
+    try:
+        search_texts = await search_service.prepare_batch_search_queries(batch_request.queries, timer=timer)
+
+        # Embed each distinct search text once
+        unique_texts = list(dict.fromkeys(text for text in search_texts if text))
+        embeddings_by_text = {}
+        if unique_texts:
+            with timer.stage("embed"):
+                embeddings = await summary_service.generate_embeddings(unique_texts)
+            embeddings_by_text = dict(zip(unique_texts, embeddings))
+
+        results_by_text = {}
+        if unique_texts:
+            with timer.stage("search"):
+                results = await summary_service.batch_vector_search_week_summaries(
+                    session=db,
+                    query_embeddings=[embeddings_by_text[text] for text in unique_texts],
+                    limit=batch_request.limit,
+                    similarity_threshold=0.3,
+                    filters=batch_request.filters
+                )
+            results_by_text = dict(zip(unique_texts, results))
+
+        response.headers["Server-Timing"] = timer.server_timing_header()
+        return [
+            BatchSearchResult(query=query, search_text=search_text, results=results_by_text.get(search_text, []))
+            for query, search_text in zip(batch_request.queries, search_texts)
+        ]
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to search summaries: {str(e)}"
+        )
+
 @router.get("/stats/count", response_model=dict)
-async def get_summary_count_route(db: AsyncSession = Depends(get_session)):
+async def get_summary_count_route(db: AsyncSession = Depends(get_read_session)):
     """Get total count of weekly summaries."""
     try:
         count = await summary_service.get_count_of_summaries(session=db)
@@ -175,7 +341,7 @@ async def get_summary_count_route(db: AsyncSession = Depends(get_session)):
         raise HTTPException(status_code=500, detail=f"Failed to get summary count: {str(e)}")
 
 @router.get("/{summary_id}", response_model=WeeklySummaryPublic)
-async def get_summary_by_id_route(summary_id: int, db: AsyncSession = Depends(get_session)):
+async def get_summary_by_id_route(summary_id: int, db: AsyncSession = Depends(get_read_session)):
     """Get a specific weekly summary by ID."""
     try:
         summary = await summary_service.get_weekly_summary_by_id(session=db, summary_id=summary_id)
@@ -187,7 +353,24 @@ async def get_summary_by_id_route(summary_id: int, db: AsyncSession = Depends(ge
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get summary: {str(e)}")
 
-@router.put("/{summary_id}", response_model=WeeklySummaryPublic)
+@router.get("/{summary_id}/similar", response_model=List[WeeklySummaryPublic])
+async def get_similar_summaries_route(
+    summary_id: int,
+    limit: int = Query(5, ge=1, le=20),
+    db: AsyncSession = Depends(get_read_session)
+):
+    """Get the weeks most similar to a summary, by its stored embedding. Makes no AI calls."""
+    try:
+        summaries = await summary_service.get_similar_summaries(session=db, summary_id=summary_id, limit=limit)
+        if summaries is None:
+            raise HTTPException(status_code=404, detail="Weekly summary not found")
+        return summaries
+    except HTTPException: # Re-raise HTTPException directly
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get similar summaries: {str(e)}")
+
+@router.put("/{summary_id}", response_model=WeeklySummaryPublic, dependencies=[Depends(mark_write)])
 async def update_summary_route(summary_id: int, summary_data: dict, db: AsyncSession = Depends(get_session)):
     """Update a weekly summary (regenerates embedding if content changed)."""
     try:
@@ -200,7 +383,7 @@ async def update_summary_route(summary_id: int, summary_data: dict, db: AsyncSes
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to update summary: {str(e)}")
 
-@router.delete("/{summary_id}")
+@router.delete("/{summary_id}", dependencies=[Depends(mark_write)])
 async def delete_summary_route(summary_id: int, db: AsyncSession = Depends(get_session)):
     """Delete a weekly summary."""
     try:
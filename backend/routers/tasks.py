@@ -2,25 +2,37 @@
 CRUD router for tasks (requirement: task persistence on refresh).
 """
 from datetime import datetime
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query, BackgroundTasks
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 import logging
 
 from models.models import Task, PaginatedTasksResponse
 from services.task_service import TaskService
-from services.database import get_session # For session dependency
+from services.task_search_service import TaskSearchService
+from services.database import get_session, get_read_session, mark_write # For session dependency
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
-task_service = TaskService()
+# Services of this worker process, created by init_services() in the app lifespan
+task_service: Optional[TaskService] = None
+task_search_service: Optional[TaskSearchService] = None
 logger = logging.getLogger(__name__)
 
-@router.post("/", response_model=Task)
-async def create_new_task_route(task_payload: Task, db: AsyncSession = Depends(get_session)):
+def init_services() -> None:
+    """Create the router's services. Called once per worker process."""
+    global task_service, task_search_service
+    task_service = TaskService()
+    task_search_service = TaskSearchService()
+
+@router.post("/", response_model=Task, dependencies=[Depends(mark_write)])
+async def create_new_task_route(task_payload: Task, background_tasks: BackgroundTasks, db: AsyncSession = Depends(get_session)):
     """Create a new task that persists on page refresh."""
     try:
-        return await task_service.create_task(session=db, task_data=task_payload)
+        task = await task_service.create_task(session=db, task_data=task_payload)
+        if task_search_service.embed_on_create:
+            background_tasks.add_task(task_search_service.embed_task_names_job, [task.name])
+        return task
     except Exception as e:
         logger.error("Failed to create task. Payload=%s", task_payload.model_dump(), exc_info=True)
         raise HTTPException(status_code=500, detail=f"Failed to create task: {str(e)}")
@@ -31,7 +43,7 @@ async def list_tasks_route(
     end_date: Optional[str] = None,
     limit: int = 100,
     offset: int = 0,
-    db: AsyncSession = Depends(get_session)
+    db: AsyncSession = Depends(get_read_session)
 ):
     """Get tasks with pagination, optionally filtered by date range."""
     try:
@@ -69,8 +81,30 @@ async def list_tasks_route(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get tasks: {str(e)}")
 
+@router.get("/search", response_model=List[Task])
+async def search_tasks_route(
+    q: str = Query(..., min_length=2),
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_session)
+):
+    """Semantic search over task names, optionally within a date range. Each distinct name is embedded once."""
+    try:
+        return await task_search_service.search_tasks(
+            session=db,
+            query=q,
+            start_date=start_date,
+            end_date=end_date,
+            limit=limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to search tasks: {str(e)}")
+
 @router.get("/{task_id}", response_model=Task)
-async def get_task_route(task_id: int, db: AsyncSession = Depends(get_session)):
+async def get_task_route(task_id: int, db: AsyncSession = Depends(get_read_session)):
     """Get a specific task by ID."""
     try:
         task = await task_service.get_task_by_id(session=db, task_id=task_id)
@@ -82,20 +116,22 @@ async def get_task_route(task_id: int, db: AsyncSession = Depends(get_session)):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get task: {str(e)}")
 
-@router.put("/{task_id}", response_model=Task)
-async def update_existing_task_route(task_id: int, task_data: dict, db: AsyncSession = Depends(get_session)):
+@router.put("/{task_id}", response_model=Task, dependencies=[Depends(mark_write)])
+async def update_existing_task_route(task_id: int, task_data: dict, background_tasks: BackgroundTasks, db: AsyncSession = Depends(get_session)):
     """Update a task."""
     try:
         task = await task_service.update_task(session=db, task_id=task_id, task_data=task_data)
         if not task:
             raise HTTPException(status_code=404, detail="Task not found")
+        if 'name' in task_data and task_search_service.embed_on_create:
+            background_tasks.add_task(task_search_service.embed_task_names_job, [task.name])
         return task
     except HTTPException: # Re-raise HTTPException directly
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to update task: {str(e)}")
 
-@router.delete("/{task_id}")
+@router.delete("/{task_id}", dependencies=[Depends(mark_write)])
 async def delete_existing_task_route(task_id: int, db: AsyncSession = Depends(get_session)):
     """Delete a task."""
     try:
@@ -109,7 +145,7 @@ async def delete_existing_task_route(task_id: int, db: AsyncSession = Depends(ge
         raise HTTPException(status_code=500, detail=f"Failed to delete task: {str(e)}")
 
 @router.get("/stats/count", response_model=dict)
-async def get_task_count_route(db: AsyncSession = Depends(get_session)):
+async def get_task_count_route(db: AsyncSession = Depends(get_read_session)):
     """Get the count of tasks."""
     try:
         count = await task_service.get_count_of_tasks(session=db)
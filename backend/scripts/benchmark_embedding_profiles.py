@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Benchmark reduced-dimension and half-precision embedding profiles against the
+1536-d float32 baseline.
+
+For each profile, reports recall@k of brute-force cosine search compared to the
+baseline's top-k, the bytes stored per vector by pgvector, and search latency.
+
+Sources:
+- synthetic (default): clustered vectors whose variance is concentrated in the
+  leading dimensions, like Matryoshka-trained text-embedding-3 models. Offline.
+- db: the 1536-d embeddings stored in weekly_summaries. Run this before migrating
+  the column to a smaller profile.
+
+Usage:
+    python scripts/benchmark_embedding_profiles.py
+    python scripts/benchmark_embedding_profiles.py --source db --k 5
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.embeddings import FULL_EMBEDDING_DIMENSIONS
+
+PROFILES = [
+    (1536, "float32"),
+    (1536, "float16"),
+    (1024, "float16"),
+    (768, "float32"),
+    (768, "float16"),
+    (512, "float16"),
+    (256, "float16"),
+]
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    """L2-normalize each row."""
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def generate_synthetic_corpus(size: int, clusters: int, rng: np.random.Generator) -> np.ndarray:
+    """Generate clustered unit vectors with variance decaying across dimensions."""
+    scale = 1.0 / np.sqrt(np.arange(1, FULL_EMBEDDING_DIMENSIONS + 1))
+    centers = rng.standard_normal((clusters, FULL_EMBEDDING_DIMENSIONS)) * scale
+    assignments = rng.integers(0, clusters, size)
+    noise = rng.standard_normal((size, FULL_EMBEDDING_DIMENSIONS)) * scale * 0.6
+    return normalize((centers[assignments] + noise).astype(np.float32))
+
+
+def load_db_corpus() -> np.ndarray:
+    """Load stored 1536-d embeddings from weekly_summaries."""
+    from sqlalchemy import create_engine, text
+    from config.database import SYNC_DATABASE_URL
+
+    engine = create_engine(SYNC_DATABASE_URL)
+    with engine.connect() as connection:
+        rows = connection.execute(text("SELECT embedding::text FROM weekly_summaries WHERE embedding IS NOT NULL")).scalars().all()
+    engine.dispose()
+
+    vectors = np.array([row.strip("[]").split(",") for row in rows], dtype=np.float32)
+    if len(vectors) == 0 or vectors.shape[1] != FULL_EMBEDDING_DIMENSIONS:
+        raise ValueError(f"Need stored {FULL_EMBEDDING_DIMENSIONS}-d embeddings, run this before migrating the embedding column")
+    return normalize(vectors)
+
+
+def apply_profile(vectors: np.ndarray, dimensions: int, precision: str) -> np.ndarray:
+    """Truncate, re-normalize and round vectors the way the profile stores them."""
+    reduced = normalize(vectors[:, :dimensions])
+    return reduced.astype(np.float16 if precision == "float16" else np.float32)
+
+
+def top_k(corpus: np.ndarray, queries: np.ndarray, k: int) -> np.ndarray:
+    """Exact top-k by cosine similarity (rows are unit length)."""
+    scores = queries.astype(np.float32) @ corpus.astype(np.float32).T
+    candidates = np.argpartition(-scores, k, axis=1)[:, :k]
+    order = np.take_along_axis(scores, candidates, axis=1).argsort(axis=1)[:, ::-1]
+    return np.take_along_axis(candidates, order, axis=1)
+
+
+def stored_bytes(dimensions: int, precision: str) -> int:
+    """Bytes pgvector stores per value (4-byte header + 4 bytes of dims/flags + data)."""
+    return 8 + dimensions * (2 if precision == "float16" else 4)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--source", choices=["synthetic", "db"], default="synthetic")
+    parser.add_argument("--size", type=int, default=20000, help="Synthetic corpus size")
+    parser.add_argument("--clusters", type=int, default=200, help="Synthetic topic clusters")
+    parser.add_argument("--queries", type=int, default=200, help="Number of queries")
+    parser.add_argument("--k", type=int, default=10, help="k for recall@k")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    corpus = load_db_corpus() if args.source == "db" else generate_synthetic_corpus(args.size, args.clusters, rng)
+    k = min(args.k, len(corpus) - 1)
+
+    # Queries are perturbed corpus vectors, so each has a meaningful neighbourhood
+    query_ids = rng.choice(len(corpus), size=min(args.queries, len(corpus)), replace=False)
+    queries = normalize(corpus[query_ids] + rng.standard_normal((len(query_ids), corpus.shape[1])).astype(np.float32) * 0.01)
+
+    baseline = top_k(corpus, queries, k)
+    baseline_bytes = stored_bytes(FULL_EMBEDDING_DIMENSIONS, "float32")
+
+    print(f"Corpus: {len(corpus)} vectors ({args.source}), {len(queries)} queries, k={k}\n")
+    print(f"{'profile':<16}{'recall@k':>10}{'bytes/vec':>12}{'storage':>10}{'search ms/q':>14}")
+    for dimensions, precision in PROFILES:
+        profile_corpus = apply_profile(corpus, dimensions, precision)
+        profile_queries = apply_profile(queries, dimensions, precision)
+
+        start = time.perf_counter()
+        results = top_k(profile_corpus, profile_queries, k)
+        elapsed_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+        recall = np.mean([len(set(found) & set(expected)) / k for found, expected in zip(results, baseline)])
+        size = stored_bytes(dimensions, precision)
+        print(f"{f'{dimensions}-d {precision}':<16}{recall:>10.3f}{size:>12}{baseline_bytes / size:>9.1f}x{elapsed_ms:>14.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark embedding throughput of the embedding providers.
+
+Embeds a synthetic corpus of summary-like texts and reports texts per second for the
+local provider with several worker counts and batch sizes, and optionally for OpenAI.
+Also reports the worst event loop stall seen while embedding, which should stay near
+zero for the local provider because encoding runs in worker processes.
+
+Usage:
+    python scripts/benchmark_embedding_throughput.py
+    python scripts/benchmark_embedding_throughput.py --model all-MiniLM-L6-v2 --dimensions 384
+    python scripts/benchmark_embedding_throughput.py --openai --texts 500
+"""
+
+import os
+import sys
+import time
+import random
+import asyncio
+import argparse
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.embeddings import EMBEDDING_DIMENSIONS, EMBEDDING_MODEL
+from services.embedding_providers import HASHING_MODEL, LocalEmbeddingProvider, OpenAIEmbeddingProvider
+
+VOCABULARY = (
+    "coding debugging review meeting planning design testing deployment documentation research "
+    "focus deep work interruptions context switching high medium low productivity hours tasks "
+    "week momentum blockers refactoring api database frontend backend performance learning"
+).split()
+
+
+def generate_texts(count: int, rng: random.Random) -> list:
+    """Generate summary-like texts of 60-120 words."""
+    return [" ".join(rng.choices(VOCABULARY, k=rng.randint(60, 120))) for _ in range(count)]
+
+
+async def measure(provider, texts: list) -> tuple:
+    """Embed texts once, returning (seconds, worst event loop stall in ms)."""
+    worst_stall = 0.0
+    running = True
+
+    async def ticker():
+        nonlocal worst_stall
+        while running:
+            start = time.perf_counter()
+            await asyncio.sleep(0.001)
+            worst_stall = max(worst_stall, (time.perf_counter() - start - 0.001) * 1000)
+
+    ticker_task = asyncio.create_task(ticker())
+    start = time.perf_counter()
+    await provider.embed(texts)
+    elapsed = time.perf_counter() - start
+    running = False
+    await ticker_task
+    return elapsed, worst_stall
+
+
+async def run(args):
+    texts = generate_texts(args.texts, random.Random(args.seed))
+    print(f"{len(texts)} texts, {args.dimensions}-d\n")
+    print(f"{'provider':<40}{'texts/s':>10}{'total s':>10}{'max stall ms':>14}")
+
+    for workers in args.workers:
+        for batch_size in args.batch_sizes:
+            provider = LocalEmbeddingProvider(args.model, args.dimensions, batch_size, workers)
+            # Warm up: start the workers and load the model
+            await provider.embed(texts[:workers * batch_size])
+            elapsed, stall = await measure(provider, texts)
+            provider.close()
+            label = f"local {args.model} workers={workers} batch={batch_size}"
+            print(f"{label:<40}{len(texts) / elapsed:>10.1f}{elapsed:>10.2f}{stall:>14.1f}")
+
+    if args.openai:
+        from openai import AsyncOpenAI
+        provider = OpenAIEmbeddingProvider(AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY")), EMBEDDING_MODEL, args.dimensions, 512)
+        elapsed, stall = await measure(provider, texts)
+        label = f"openai {EMBEDDING_MODEL}"
+        print(f"{label:<40}{len(texts) / elapsed:>10.1f}{elapsed:>10.2f}{stall:>14.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--texts", type=int, default=5000)
+    parser.add_argument("--model", default=HASHING_MODEL, help="Local model: 'hashing' or a sentence-transformers model name")
+    parser.add_argument("--dimensions", type=int, default=EMBEDDING_DIMENSIONS)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[16, 64])
+    parser.add_argument("--openai", action="store_true", help="Also benchmark the OpenAI provider (needs OPENAI_API_KEY)")
+    parser.add_argument("--seed", type=int, default=42)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-request CPU for hot queries: statements rebuilt per request versus defined once.
+
+For list, count, get-by-id and vector search, reports microseconds of CPU per request for:
+- before: the statement is rebuilt on every request (the previous service code)
+- after: the module-level statement, or the cached search statement, is reused
+
+Offline (default), each request builds or reuses the statement and looks it up in SQLAlchemy's
+compiled cache the way a Connection does; a "no cache" column shows the cost of a compile.
+With --db, each request runs against the configured database through a session and the
+CPU time of the whole call is measured; query cache hit counters are printed at the end.
+
+Usage:
+    python scripts/benchmark_query_caching.py
+    python scripts/benchmark_query_caching.py --db --iterations 500
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+from datetime import date
+
+import numpy as np
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text, func, bindparam
+from sqlalchemy.dialects.postgresql.asyncpg import dialect as asyncpg_dialect
+from sqlmodel import select
+
+from models.models import Task
+from services import task_service as task_queries
+from services.summary_service import SummaryService
+
+START_DATE, END_DATE = date(2024, 1, 1), date(2024, 3, 31)
+
+
+def build_list_before():
+    return (
+        select(Task)
+        .where(Task.date_worked >= START_DATE, Task.date_worked <= END_DATE)
+        .order_by(Task.created_at.desc()).limit(100).offset(0)
+    )
+
+
+def build_count_before():
+    return select(func.count(Task.id)).where(Task.date_worked >= START_DATE, Task.date_worked <= END_DATE)
+
+
+def build_get_before():
+    return select(Task).where(Task.id == 42)
+
+
+def build_vector_before(summary_service: SummaryService):
+    return text("""
+        SELECT id, week_start, week_end, summary, stats, recommendations, created_at, updated_at,
+               1 - (embedding <=> :embedding) as similarity
+        FROM weekly_summaries
+        WHERE embedding IS NOT NULL AND (1 - (embedding <=> :embedding)) >= :similarity_threshold
+        ORDER BY embedding <=> :embedding
+        LIMIT :limit
+    """).bindparams(bindparam("embedding", type_=summary_service.embedding_column_type))
+
+
+def cpu_us_per_call(function, iterations: int) -> float:
+    start = time.process_time()
+    for _ in range(iterations):
+        function()
+    return (time.process_time() - start) * 1e6 / iterations
+
+
+def run_offline(summary_service: SummaryService, iterations: int) -> None:
+    dialect = asyncpg_dialect()
+    compiled_cache = {}
+
+    def through_cache(statement):
+        # What Connection.execute does before sending the SQL
+        return statement._compile_w_cache(dialect, compiled_cache=compiled_cache, column_keys=[])
+
+    cases = {
+        "list": (build_list_before, lambda: task_queries.LIST_TASKS_IN_RANGE),
+        "count": (build_count_before, lambda: task_queries.COUNT_TASKS_IN_RANGE),
+        "get-by-id": (build_get_before, lambda: task_queries.GET_TASK_BY_ID),
+        "vector search": (lambda: build_vector_before(summary_service), lambda: summary_service.get_search_statement("vector")),
+    }
+
+    print(f"{'query':<15}{'before us':>11}{'after us':>10}{'no cache us':>13}")
+    for name, (build_before, get_after) in cases.items():
+        before_us = cpu_us_per_call(lambda: through_cache(build_before()), iterations)
+        after_us = cpu_us_per_call(lambda: through_cache(get_after()), iterations)
+        uncached_us = cpu_us_per_call(lambda: get_after().compile(dialect=dialect), max(iterations // 10, 1))
+        print(f"{name:<15}{before_us:>11.1f}{after_us:>10.1f}{uncached_us:>13.1f}")
+
+
+async def run_db(summary_service: SummaryService, iterations: int) -> None:
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from services.database import engine, get_query_cache_stats, query_cache_stats
+    from services.task_service import TaskService
+
+    task_service = TaskService()
+    embedding = np.random.default_rng(0).standard_normal(summary_service.embedding_profile['dimensions']).astype(np.float32)
+    vector_params = {"embedding": embedding, "similarity_threshold": 0.3, "limit": 5}
+    before = {
+        "list": build_list_before,
+        "count": build_count_before,
+        "get-by-id": build_get_before,
+        "vector search": lambda: build_vector_before(summary_service),
+    }
+    after = {
+        "list": lambda session: task_service.get_tasks(session, START_DATE.isoformat(), END_DATE.isoformat()),
+        "count": lambda session: task_service.get_tasks_count(session, START_DATE.isoformat(), END_DATE.isoformat()),
+        "get-by-id": lambda session: task_service.get_task_by_id(session, 42),
+        "vector search": lambda session: summary_service.vector_search_week_summaries(
+            session, query_text="", query_embedding=embedding, similarity_threshold=0.3, two_stage=False
+        ),
+    }
+
+    async def cpu_us(run) -> float:
+        async with AsyncSession(engine) as session:
+            await run(session)  # warm up the connection and caches
+            start = time.process_time()
+            for _ in range(iterations):
+                await run(session)
+            return (time.process_time() - start) * 1e6 / iterations
+
+    query_cache_stats.reset()
+    print(f"{'query':<15}{'before us':>11}{'after us':>10}")
+    for name, build_before in before.items():
+        async def run_before(session, name=name, build_before=build_before):
+            return await session.execute(build_before(), vector_params if name == "vector search" else {})
+
+        before_us = await cpu_us(run_before)
+        after_us = await cpu_us(after[name])
+        print(f"{name:<15}{before_us:>11.1f}{after_us:>10.1f}")
+
+    print(get_query_cache_stats(engine))
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=5000)
+    parser.add_argument("--db", action="store_true", help="Run the queries against the database")
+    args = parser.parse_args()
+
+    summary_service = SummaryService()
+    if args.db:
+        asyncio.run(run_db(summary_service, min(args.iterations, 1000)))
+    else:
+        run_offline(summary_service, args.iterations)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Benchmark vector index latency and recall on a synthetic corpus of summary embeddings.
+
+Loads a synthetic corpus (100k vectors by default) into a scratch UNLOGGED table,
+computes exact top-k neighbours with NumPy as ground truth, then builds each index
+and measures query latency (p50/p95) and recall@k:
+- ivfflat with lists = 100 (the original index)
+- hnsw with HNSW_M / HNSW_EF_CONSTRUCTION, for several hnsw.ef_search values
+- two-stage: hnsw on binary-quantized bit vectors (Hamming distance) for N candidates,
+  reranked by exact cosine distance, for several candidate counts
+
+The scratch table is dropped afterwards. Needs a database with pgvector >= 0.7.
+
+Usage:
+    python scripts/benchmark_vector_index.py
+    python scripts/benchmark_vector_index.py --size 200000 --dimensions 512 --k 5
+    python scripts/benchmark_vector_index.py --candidates 100 200 400
+"""
+
+import os
+import sys
+import io
+import time
+import argparse
+
+import numpy as np
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, text
+from config.database import SYNC_DATABASE_URL
+from config.embeddings import EMBEDDING_DIMENSIONS, HNSW_CONFIG
+
+TABLE_NAME = "benchmark_summary_vectors"
+
+
+def generate_vectors(size: int, dimensions: int, clusters: int, rng: np.random.Generator) -> np.ndarray:
+    """Generate clustered unit vectors, a rough stand-in for topic-grouped summaries."""
+    centers = rng.standard_normal((clusters, dimensions)).astype(np.float32)
+    vectors = centers[rng.integers(0, clusters, size)] + rng.standard_normal((size, dimensions)).astype(np.float32) * 0.8
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def to_vector_literal(vector: np.ndarray) -> str:
+    """Format a vector as a pgvector text literal."""
+    return "[" + ",".join(f"{value:.6f}" for value in vector) + "]"
+
+
+def load_corpus(connection, vectors: np.ndarray, chunk_size: int = 5000) -> None:
+    """Create the scratch table and COPY the corpus into it."""
+    connection.execute(text(f"DROP TABLE IF EXISTS {TABLE_NAME}"))
+    connection.execute(text(f"CREATE UNLOGGED TABLE {TABLE_NAME} (id integer PRIMARY KEY, embedding vector({vectors.shape[1]}))"))
+
+    cursor = connection.connection.cursor()
+    for start in range(0, len(vectors), chunk_size):
+        buffer = io.StringIO()
+        for offset, vector in enumerate(vectors[start:start + chunk_size]):
+            buffer.write(f"{start + offset}\t{to_vector_literal(vector)}\n")
+        buffer.seek(0)
+        cursor.copy_expert(f"COPY {TABLE_NAME} (id, embedding) FROM STDIN", buffer)
+    cursor.close()
+    connection.execute(text(f"ANALYZE {TABLE_NAME}"))
+
+
+def index_size(connection, index_name: str) -> str:
+    """Human-readable on-disk size of an index."""
+    return connection.execute(text("SELECT pg_size_pretty(pg_relation_size(CAST(:name AS regclass)))"), {"name": index_name}).scalar()
+
+
+def exact_top_k(corpus: np.ndarray, queries: np.ndarray, k: int) -> list:
+    """Exact top-k ids by cosine similarity."""
+    scores = queries @ corpus.T
+    top = np.argpartition(-scores, k, axis=1)[:, :k]
+    return [set(row.tolist()) for row in top]
+
+
+def run_queries(connection, queries: np.ndarray, k: int, settings: dict) -> tuple:
+    """Run each query with the given session settings, returning (latencies in ms, result ids)."""
+    for name, value in settings.items():
+        connection.execute(text("SELECT set_config(:name, :value, false)"), {"name": name, "value": str(value)})
+
+    statement = text(f"SELECT id FROM {TABLE_NAME} ORDER BY embedding <=> CAST(:embedding AS vector) LIMIT :limit")
+    latencies, results = [], []
+    for query in queries:
+        literal = to_vector_literal(query)
+        start = time.perf_counter()
+        ids = connection.execute(statement, {"embedding": literal, "limit": k}).scalars().all()
+        latencies.append((time.perf_counter() - start) * 1000)
+        results.append(set(ids))
+    return latencies, results
+
+
+def run_two_stage_queries(connection, queries: np.ndarray, k: int, candidates: int) -> tuple:
+    """Run each query as a Hamming-distance prefilter plus exact cosine rerank."""
+    connection.execute(text("SELECT set_config('hnsw.ef_search', :value, false)"), {"value": str(min(max(candidates, 40), 1000))})
+    dimensions = queries.shape[1]
+    statement = text(f"""
+        WITH candidates AS MATERIALIZED (
+            SELECT id FROM {TABLE_NAME}
+            ORDER BY embedding_bit <~> binary_quantize(CAST(:embedding AS vector))::bit({dimensions})
+            LIMIT :candidates
+        )
+        SELECT t.id FROM {TABLE_NAME} t JOIN candidates USING (id)
+        ORDER BY t.embedding <=> CAST(:embedding AS vector)
+        LIMIT :limit
+    """)
+    latencies, results = [], []
+    for query in queries:
+        literal = to_vector_literal(query)
+        start = time.perf_counter()
+        ids = connection.execute(statement, {"embedding": literal, "candidates": candidates, "limit": k}).scalars().all()
+        latencies.append((time.perf_counter() - start) * 1000)
+        results.append(set(ids))
+    return latencies, results
+
+
+def report(label: str, latencies: list, results: list, truth: list, k: int) -> None:
+    """Print latency percentiles and recall@k for one configuration."""
+    recall = np.mean([len(found & expected) / k for found, expected in zip(results, truth)])
+    print(f"{label:<34}{np.percentile(latencies, 50):>10.2f}{np.percentile(latencies, 95):>10.2f}{recall:>11.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=100000, help="Number of synthetic summaries")
+    parser.add_argument("--dimensions", type=int, default=EMBEDDING_DIMENSIONS)
+    parser.add_argument("--clusters", type=int, default=500)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--ef-search", type=int, nargs="+", default=[20, 40, 80, 200])
+    parser.add_argument("--candidates", type=int, nargs="+", default=[50, 100, 200, 400], help="Two-stage prefilter candidate counts")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--keep-table", action="store_true", help="Keep the scratch table afterwards")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    corpus = generate_vectors(args.size, args.dimensions, args.clusters, rng)
+    queries = generate_vectors(args.queries, args.dimensions, args.clusters, np.random.default_rng(args.seed + 1))
+    truth = exact_top_k(corpus, queries, args.k)
+
+    engine = create_engine(SYNC_DATABASE_URL, isolation_level="AUTOCOMMIT")
+    with engine.connect() as connection:
+        print(f"Loading {args.size} x {args.dimensions}-d vectors into {TABLE_NAME}...")
+        start = time.perf_counter()
+        load_corpus(connection, corpus)
+        print(f"Loaded in {time.perf_counter() - start:.1f}s\n")
+
+        print(f"{'configuration':<34}{'p50 ms':>10}{'p95 ms':>10}{'recall@' + str(args.k):>11}")
+
+        connection.execute(text("SELECT set_config('enable_indexscan', 'off', false)"))
+        latencies, results = run_queries(connection, queries[:20], args.k, {})
+        report("exact scan (20 queries)", latencies, results, truth[:20], args.k)
+        connection.execute(text("SELECT set_config('enable_indexscan', 'on', false)"))
+
+        start = time.perf_counter()
+        connection.execute(text(f"CREATE INDEX {TABLE_NAME}_ivfflat ON {TABLE_NAME} USING ivfflat (embedding vector_cosine_ops) WITH (lists = 100)"))
+        print(f"  ivfflat built in {time.perf_counter() - start:.1f}s")
+        latencies, results = run_queries(connection, queries, args.k, {"ivfflat.probes": 1})
+        report("ivfflat lists=100 probes=1", latencies, results, truth, args.k)
+        connection.execute(text(f"DROP INDEX {TABLE_NAME}_ivfflat"))
+
+        start = time.perf_counter()
+        connection.execute(text(
+            f"CREATE INDEX {TABLE_NAME}_hnsw ON {TABLE_NAME} USING hnsw (embedding vector_cosine_ops) "
+            f"WITH (m = {HNSW_CONFIG['m']}, ef_construction = {HNSW_CONFIG['ef_construction']})"
+        ))
+        print(f"  hnsw built in {time.perf_counter() - start:.1f}s ({index_size(connection, f'{TABLE_NAME}_hnsw')})")
+        for ef_search in args.ef_search:
+            latencies, results = run_queries(connection, queries, args.k, {"hnsw.ef_search": ef_search})
+            report(f"hnsw m={HNSW_CONFIG['m']} ef_search={ef_search}", latencies, results, truth, args.k)
+        connection.execute(text(f"DROP INDEX {TABLE_NAME}_hnsw"))
+
+        start = time.perf_counter()
+        connection.execute(text(
+            f"ALTER TABLE {TABLE_NAME} ADD COLUMN embedding_bit bit({args.dimensions}) "
+            f"GENERATED ALWAYS AS (binary_quantize(embedding)::bit({args.dimensions})) STORED"
+        ))
+        connection.execute(text(
+            f"CREATE INDEX {TABLE_NAME}_bit_hnsw ON {TABLE_NAME} USING hnsw (embedding_bit bit_hamming_ops) "
+            f"WITH (m = {HNSW_CONFIG['m']}, ef_construction = {HNSW_CONFIG['ef_construction']})"
+        ))
+        print(f"  bit column and hnsw built in {time.perf_counter() - start:.1f}s ({index_size(connection, f'{TABLE_NAME}_bit_hnsw')})")
+        for candidates in args.candidates:
+            latencies, results = run_two_stage_queries(connection, queries, args.k, candidates)
+            report(f"two-stage bit candidates={candidates}", latencies, results, truth, args.k)
+
+        if not args.keep_table:
+            connection.execute(text(f"DROP TABLE {TABLE_NAME}"))
+
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark sending query embeddings as pgvector text literals versus binary.
+
+For each embedding size, reports the per-query client-side encode time and the bytes
+sent for the embedding parameter:
+- text: the old path, Python float list -> "[0.0123,...]" literal
+- binary: a float32 array encoded by pgvector's asyncpg codec
+
+With --db, also times a full round trip of `SELECT $1 <=> $1` through asyncpg with
+each format, against the configured database.
+
+Usage:
+    python scripts/benchmark_vector_transfer.py
+    python scripts/benchmark_vector_transfer.py --db --iterations 500
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+
+import numpy as np
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pgvector.utils import Vector
+
+DIMENSIONS = [256, 512, 1024, 1536]
+
+
+def encode_text(embedding: list) -> str:
+    """The previous encoding: a Python list formatted as a pgvector text literal."""
+    return f"[{','.join(map(str, embedding))}]"
+
+
+def encode_binary(embedding: np.ndarray) -> bytes:
+    """What the asyncpg codec sends for a float32 array."""
+    return Vector._to_db_binary(embedding)
+
+
+def time_per_call_us(function, argument, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        function(argument)
+    return (time.perf_counter() - start) * 1e6 / iterations
+
+
+async def time_round_trips(dimensions: int, iterations: int) -> tuple:
+    """Median round trip in ms for text and binary parameters."""
+    import asyncpg
+    from pgvector.asyncpg import register_vector
+    from config.database import get_database_config
+
+    config = get_database_config()
+    connection_args = dict(
+        user=config['user'], password=config['password'], host=config['host'],
+        port=config['port'], database=config['database']
+    )
+    embedding = np.random.default_rng(0).standard_normal(dimensions).astype(np.float32)
+
+    text_connection = await asyncpg.connect(**connection_args)
+    binary_connection = await asyncpg.connect(**connection_args)
+    await register_vector(binary_connection)
+
+    results = []
+    for connection, parameter, query in (
+        (text_connection, encode_text(embedding.tolist()), "SELECT $1::vector <=> $1::vector"),
+        (binary_connection, embedding, "SELECT $1::vector <=> $1::vector"),
+    ):
+        statement = await connection.prepare(query)
+        latencies = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            await statement.fetchval(parameter)
+            latencies.append((time.perf_counter() - start) * 1000)
+        results.append(float(np.median(latencies)))
+
+    await text_connection.close()
+    await binary_connection.close()
+    return tuple(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--db", action="store_true", help="Also time round trips against the database")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    print(f"{'dims':>6}{'text us':>10}{'text bytes':>12}{'binary us':>11}{'binary bytes':>14}{'db text ms':>12}{'db binary ms':>14}")
+    for dimensions in DIMENSIONS:
+        embedding = rng.standard_normal(dimensions).astype(np.float32)
+        embedding_list = embedding.tolist()
+
+        text_us = time_per_call_us(encode_text, embedding_list, args.iterations)
+        binary_us = time_per_call_us(encode_binary, embedding, args.iterations)
+        text_bytes = len(encode_text(embedding_list).encode())
+        binary_bytes = len(encode_binary(embedding))
+
+        db_columns = ""
+        if args.db:
+            db_text_ms, db_binary_ms = asyncio.run(time_round_trips(dimensions, min(args.iterations, 500)))
+            db_columns = f"{db_text_ms:>12.3f}{db_binary_ms:>14.3f}"
+
+        print(f"{dimensions:>6}{text_us:>10.1f}{text_bytes:>12}{binary_us:>11.1f}{binary_bytes:>14}{db_columns}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Load test the database connection pool to find where it runs out of connections.
+
+Runs bursts of concurrent sessions, each holding a connection for --hold seconds
+(SELECT pg_sleep), at increasing concurrency. For each level, reports throughput,
+request latency, how long checkouts waited for a connection, checkout timeouts, and
+the peak number of connections checked out. Waits start growing once concurrency
+exceeds pool_size + max_overflow.
+
+Pool settings default to the DB_POOL_* environment variables (see config/database.py).
+
+Usage:
+    python scripts/load_test_pool.py
+    python scripts/load_test_pool.py --pool-size 5 --max-overflow 5 --pool-timeout 2 --levels 5,10,20,40
+"""
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+
+import numpy as np
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config.database import ASYNC_DATABASE_URL, POOL_CONFIG
+from services.database import create_engine_from_pool_config, get_pool_stats
+
+
+async def run_level(engine, concurrency: int, requests: int, hold: float) -> dict:
+    """Run `requests` sessions with at most `concurrency` at once."""
+    pool = engine.pool
+    pool.wait_histogram.reset()
+    timeouts_before = pool.timeouts
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    peak_checked_out = 0
+    errors = 0
+
+    async def one_request():
+        nonlocal peak_checked_out, errors
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                async with AsyncSession(engine) as session:
+                    await session.execute(text("SELECT pg_sleep(:hold)"), {"hold": hold})
+                    peak_checked_out = max(peak_checked_out, pool.checkedout())
+            except Exception:
+                errors += 1
+                return
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one_request() for _ in range(requests)))
+    elapsed = time.perf_counter() - start
+
+    wait = pool.wait_histogram.snapshot()
+    return {
+        "concurrency": concurrency,
+        "throughput": len(latencies) / elapsed,
+        "p50_ms": float(np.percentile(latencies, 50)) if latencies else 0.0,
+        "p95_ms": float(np.percentile(latencies, 95)) if latencies else 0.0,
+        "wait_mean_ms": wait["mean_ms"],
+        "wait_max_ms": wait["max_ms"],
+        "timeouts": pool.timeouts - timeouts_before,
+        "errors": errors,
+        "peak_checked_out": peak_checked_out,
+    }
+
+
+async def main_async(args):
+    pool_config = dict(POOL_CONFIG)
+    for name in ("pool_size", "max_overflow", "pool_timeout"):
+        if getattr(args, name) is not None:
+            pool_config[name] = getattr(args, name)
+    engine = create_engine_from_pool_config(ASYNC_DATABASE_URL, pool_config)
+    capacity = pool_config['pool_size'] + pool_config['max_overflow']
+
+    print(f"pool_size={pool_config['pool_size']} max_overflow={pool_config['max_overflow']} "
+          f"pool_timeout={pool_config['pool_timeout']}s capacity={capacity} hold={args.hold}s")
+    print(f"{'conc':>6}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'wait avg':>10}{'wait max':>10}{'timeouts':>10}{'errors':>8}{'peak out':>10}")
+
+    levels = [int(level) for level in args.levels.split(",")]
+    for concurrency in levels:
+        result = await run_level(engine, concurrency, max(args.requests, concurrency * 4), args.hold)
+        marker = "  <- exhausted" if result["wait_mean_ms"] > args.hold * 1000 / 2 or result["timeouts"] else ""
+        print(
+            f"{result['concurrency']:>6}{result['throughput']:>9.1f}{result['p50_ms']:>9.1f}{result['p95_ms']:>9.1f}"
+            f"{result['wait_mean_ms']:>10.1f}{result['wait_max_ms']:>10.1f}{result['timeouts']:>10}{result['errors']:>8}"
+            f"{result['peak_checked_out']:>10}{marker}"
+        )
+
+    print(get_pool_stats(engine))
+    await engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--levels", default="1,5,10,15,20,30,50", help="Comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per level (at least 4x the concurrency)")
+    parser.add_argument("--hold", type=float, default=0.05, help="Seconds each request holds its connection")
+    parser.add_argument("--pool-size", type=int, default=None)
+    parser.add_argument("--max-overflow", type=int, default=None)
+    parser.add_argument("--pool-timeout", type=float, default=None)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
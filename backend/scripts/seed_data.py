@@ -9,7 +9,7 @@ or the functions can be imported and used by API endpoints.
 import os
 import sys
 import random
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from typing import List
 
 # Add the backend directory to the Python path
@@ -20,6 +20,99 @@ from models.models import Task, WeeklySummary, FocusLevel
 from config.database import SYNC_DATABASE_URL
 from utils.date_utils import get_week_boundaries
 
+# Task templates with time ranges and focus levels
+TASK_TEMPLATES = [
+    # Today's tasks (first 3 will be used for the reference date)
+    {"name": "Get a beverage", "timeMinMax": [0.25, 0.25], "focus_level": FocusLevel.low},
+    {"name": "Test Greg's app", "timeMinMax": [0.5, 0.5], "focus_level": FocusLevel.medium},
+    {"name": "Request to hire Greg ;)", "timeMinMax": [1, 1], "focus_level": FocusLevel.high},
+
+    # Development tasks
+    {"name": "Frontend component development", "timeMinMax": [2, 6], "focus_level": FocusLevel.high},
+    {"name": "Backend API implementation", "timeMinMax": [3, 5], "focus_level": FocusLevel.high},
+    {"name": "Database optimization work", "timeMinMax": [2, 4], "focus_level": FocusLevel.high},
+    {"name": "Code review for authentication module", "timeMinMax": [1, 3], "focus_level": FocusLevel.high},
+    {"name": "Bug fixes in payment processing", "timeMinMax": [2, 4], "focus_level": FocusLevel.high},
+    {"name": "Performance optimization analysis", "timeMinMax": [2, 5], "focus_level": FocusLevel.high},
+    {"name": "Code refactoring - authentication", "timeMinMax": [3, 6], "focus_level": FocusLevel.high},
+    {"name": "API endpoint design", "timeMinMax": [2, 4], "focus_level": FocusLevel.high},
+    {"name": "Unit testing implementation", "timeMinMax": [1, 3], "focus_level": FocusLevel.medium},
+    {"name": "Integration testing setup", "timeMinMax": [2, 4], "focus_level": FocusLevel.medium},
+    {"name": "Microservices architecture implementation", "timeMinMax": [4, 8], "focus_level": FocusLevel.high},
+    {"name": "GraphQL schema development", "timeMinMax": [2, 4], "focus_level": FocusLevel.high},
+    {"name": "CI/CD pipeline optimization", "timeMinMax": [3, 5], "focus_level": FocusLevel.high},
+    {"name": "Cloud infrastructure setup", "timeMinMax": [4, 6], "focus_level": FocusLevel.high},
+    {"name": "Security vulnerability fixes", "timeMinMax": [2, 4], "focus_level": FocusLevel.high},
+    {"name": "Mobile app feature development", "timeMinMax": [3, 6], "focus_level": FocusLevel.high},
+    {"name": "Database migration script", "timeMinMax": [2, 4], "focus_level": FocusLevel.high},
+
+    # Meetings and collaboration
+    {"name": "Team standup meeting", "timeMinMax": [0.25, 0.5], "focus_level": FocusLevel.medium},
+    {"name": "Sprint planning session", "timeMinMax": [1, 2], "focus_level": FocusLevel.medium},
+    {"name": "Client meeting - project requirements", "timeMinMax": [0.5, 1.5], "focus_level": FocusLevel.medium},
+    {"name": "Weekly retrospective", "timeMinMax": [0.5, 1], "focus_level": FocusLevel.medium},
+    {"name": "Architecture discussion", "timeMinMax": [1, 2], "focus_level": FocusLevel.medium},
+    {"name": "Code review session", "timeMinMax": [1, 2], "focus_level": FocusLevel.medium},
+    {"name": "Mentoring junior developer", "timeMinMax": [0.5, 1.5], "focus_level": FocusLevel.medium},
+    {"name": "Cross-team collaboration", "timeMinMax": [1, 2], "focus_level": FocusLevel.high},
+    {"name": "Product roadmap planning", "timeMinMax": [2, 3], "focus_level": FocusLevel.high},
+    {"name": "Tech debt discussion", "timeMinMax": [1, 2], "focus_level": FocusLevel.medium},
+    {"name": "Team performance review", "timeMinMax": [1, 2], "focus_level": FocusLevel.medium},
+    {"name": "Project kickoff meeting", "timeMinMax": [1.5, 2.5], "focus_level": FocusLevel.medium},
+    {"name": "Stakeholder presentation", "timeMinMax": [1, 2], "focus_level": FocusLevel.high},
+    {"name": "Team building workshop", "timeMinMax": [2, 3], "focus_level": FocusLevel.low},
+    {"name": "Technical interview", "timeMinMax": [1, 1.5], "focus_level": FocusLevel.high},
+    {"name": "Release planning meeting", "timeMinMax": [1, 2], "focus_level": FocusLevel.medium},
+
+    # Documentation and admin
+    {"name": "Design system documentation", "timeMinMax": [1, 3], "focus_level": FocusLevel.medium},
+    {"name": "Technical specification writing", "timeMinMax": [2, 4], "focus_level": FocusLevel.medium},
+    {"name": "Documentation updates", "timeMinMax": [1, 3], "focus_level": FocusLevel.low},
+    {"name": "Email and administrative tasks", "timeMinMax": [0.5, 1.5], "focus_level": FocusLevel.low},
+    {"name": "Weekly planning session", "timeMinMax": [1, 2], "focus_level": FocusLevel.low},
+    {"name": "Project status reporting", "timeMinMax": [0.5, 1], "focus_level": FocusLevel.low},
+    {"name": "Time tracking and reporting", "timeMinMax": [0.25, 0.5], "focus_level": FocusLevel.low},
+    {"name": "API documentation writing", "timeMinMax": [2, 4], "focus_level": FocusLevel.medium},
+    {"name": "Architecture decision records", "timeMinMax": [1, 2], "focus_level": FocusLevel.high},
+    {"name": "Release notes preparation", "timeMinMax": [1, 2], "focus_level": FocusLevel.medium},
+    {"name": "Team process documentation", "timeMinMax": [1, 3], "focus_level": FocusLevel.medium},
+    {"name": "Onboarding guide updates", "timeMinMax": [2, 3], "focus_level": FocusLevel.medium},
+    {"name": "Security compliance report", "timeMinMax": [2, 4], "focus_level": FocusLevel.high},
+    {"name": "Performance metrics report", "timeMinMax": [1, 2], "focus_level": FocusLevel.medium},
+
+    # Research and learning
+    {"name": "Research new React patterns", "timeMinMax": [1, 3], "focus_level": FocusLevel.high},
+    {"name": "Technology evaluation", "timeMinMax": [2, 4], "focus_level": FocusLevel.high},
+    {"name": "Learning new framework", "timeMinMax": [2, 5], "focus_level": FocusLevel.low},
+    {"name": "Security research and analysis", "timeMinMax": [2, 4], "focus_level": FocusLevel.high},
+    {"name": "Industry best practices review", "timeMinMax": [1, 3], "focus_level": FocusLevel.medium},
+    {"name": "ChatGPT prompt engineering", "timeMinMax": [1, 2], "focus_level": FocusLevel.high},
+    {"name": "Claude API integration research", "timeMinMax": [2, 3], "focus_level": FocusLevel.high},
+    {"name": "Gemini Pro capabilities exploration", "timeMinMax": [1.5, 3], "focus_level": FocusLevel.medium},
+    {"name": "AI model fine-tuning research", "timeMinMax": [2, 4], "focus_level": FocusLevel.high},
+    {"name": "LLM performance benchmarking", "timeMinMax": [2, 4], "focus_level": FocusLevel.high},
+    {"name": "AI ethics and safety review", "timeMinMax": [1, 2], "focus_level": FocusLevel.medium},
+    {"name": "ML model deployment patterns", "timeMinMax": [2, 4], "focus_level": FocusLevel.high},
+    {"name": "AI cost optimization research", "timeMinMax": [1, 2], "focus_level": FocusLevel.medium},
+    {"name": "Vector database evaluation", "timeMinMax": [2, 3], "focus_level": FocusLevel.high},
+
+    # QA and testing
+    {"name": "Testing and QA session", "timeMinMax": [1, 3], "focus_level": FocusLevel.medium},
+    {"name": "Manual testing workflow", "timeMinMax": [1, 2], "focus_level": FocusLevel.medium},
+    {"name": "Automated test maintenance", "timeMinMax": [1, 3], "focus_level": FocusLevel.medium},
+    {"name": "Bug investigation and analysis", "timeMinMax": [1, 4], "focus_level": FocusLevel.low},
+    {"name": "Performance optimization", "timeMinMax": [1, 3], "focus_level": FocusLevel.high},
+    {"name": "Load testing implementation", "timeMinMax": [2, 4], "focus_level": FocusLevel.high},
+    {"name": "Security penetration testing", "timeMinMax": [3, 5], "focus_level": FocusLevel.high},
+    {"name": "Cross-browser compatibility testing", "timeMinMax": [2, 3], "focus_level": FocusLevel.medium},
+    {"name": "API integration testing", "timeMinMax": [2, 4], "focus_level": FocusLevel.medium},
+    {"name": "User acceptance testing", "timeMinMax": [1, 3], "focus_level": FocusLevel.medium},
+    {"name": "Test automation framework setup", "timeMinMax": [3, 5], "focus_level": FocusLevel.high},
+    {"name": "Performance benchmark testing", "timeMinMax": [2, 4], "focus_level": FocusLevel.high},
+    {"name": "Mobile app testing", "timeMinMax": [2, 3], "focus_level": FocusLevel.medium},
+    {"name": "Accessibility testing", "timeMinMax": [1, 2], "focus_level": FocusLevel.medium}
+]
+
 async def generate_sample_data(reference_date: datetime = None) -> tuple[List[Task], List[WeeklySummary]]:
     """
     Generate sample tasks and summaries for the last 60 days.
@@ -39,99 +132,6 @@ async def generate_sample_data(reference_date: datetime = None) -> tuple[List[Ta
     from models.models import WeeklyStats
     
     ai_service = AIService()
-    
-    # Task templates with time ranges and focus levels
-    task_templates = [
-        # Today's tasks (first 3 will be used for the reference date)
-        {"name": "Get a beverage", "timeMinMax": [0.25, 0.25], "focus_level": FocusLevel.low},
-        {"name": "Test Greg's app", "timeMinMax": [0.5, 0.5], "focus_level": FocusLevel.medium},
-        {"name": "Request to hire Greg ;)", "timeMinMax": [1, 1], "focus_level": FocusLevel.high},
-        
-        # Development tasks
-        {"name": "Frontend component development", "timeMinMax": [2, 6], "focus_level": FocusLevel.high},
-        {"name": "Backend API implementation", "timeMinMax": [3, 5], "focus_level": FocusLevel.high},
-        {"name": "Database optimization work", "timeMinMax": [2, 4], "focus_level": FocusLevel.high},
-        {"name": "Code review for authentication module", "timeMinMax": [1, 3], "focus_level": FocusLevel.high},
-        {"name": "Bug fixes in payment processing", "timeMinMax": [2, 4], "focus_level": FocusLevel.high},
-        {"name": "Performance optimization analysis", "timeMinMax": [2, 5], "focus_level": FocusLevel.high},
-        {"name": "Code refactoring - authentication", "timeMinMax": [3, 6], "focus_level": FocusLevel.high},
-        {"name": "API endpoint design", "timeMinMax": [2, 4], "focus_level": FocusLevel.high},
-        {"name": "Unit testing implementation", "timeMinMax": [1, 3], "focus_level": FocusLevel.medium},
-        {"name": "Integration testing setup", "timeMinMax": [2, 4], "focus_level": FocusLevel.medium},
-        {"name": "Microservices architecture implementation", "timeMinMax": [4, 8], "focus_level": FocusLevel.high},
-        {"name": "GraphQL schema development", "timeMinMax": [2, 4], "focus_level": FocusLevel.high},
-        {"name": "CI/CD pipeline optimization", "timeMinMax": [3, 5], "focus_level": FocusLevel.high},
-        {"name": "Cloud infrastructure setup", "timeMinMax": [4, 6], "focus_level": FocusLevel.high},
-        {"name": "Security vulnerability fixes", "timeMinMax": [2, 4], "focus_level": FocusLevel.high},
-        {"name": "Mobile app feature development", "timeMinMax": [3, 6], "focus_level": FocusLevel.high},
-        {"name": "Database migration script", "timeMinMax": [2, 4], "focus_level": FocusLevel.high},
-        
-        # Meetings and collaboration
-        {"name": "Team standup meeting", "timeMinMax": [0.25, 0.5], "focus_level": FocusLevel.medium},
-        {"name": "Sprint planning session", "timeMinMax": [1, 2], "focus_level": FocusLevel.medium},
-        {"name": "Client meeting - project requirements", "timeMinMax": [0.5, 1.5], "focus_level": FocusLevel.medium},
-        {"name": "Weekly retrospective", "timeMinMax": [0.5, 1], "focus_level": FocusLevel.medium},
-        {"name": "Architecture discussion", "timeMinMax": [1, 2], "focus_level": FocusLevel.medium},
-        {"name": "Code review session", "timeMinMax": [1, 2], "focus_level": FocusLevel.medium},
-        {"name": "Mentoring junior developer", "timeMinMax": [0.5, 1.5], "focus_level": FocusLevel.medium},
-        {"name": "Cross-team collaboration", "timeMinMax": [1, 2], "focus_level": FocusLevel.high},
-        {"name": "Product roadmap planning", "timeMinMax": [2, 3], "focus_level": FocusLevel.high},
-        {"name": "Tech debt discussion", "timeMinMax": [1, 2], "focus_level": FocusLevel.medium},
-        {"name": "Team performance review", "timeMinMax": [1, 2], "focus_level": FocusLevel.medium},
-        {"name": "Project kickoff meeting", "timeMinMax": [1.5, 2.5], "focus_level": FocusLevel.medium},
-        {"name": "Stakeholder presentation", "timeMinMax": [1, 2], "focus_level": FocusLevel.high},
-        {"name": "Team building workshop", "timeMinMax": [2, 3], "focus_level": FocusLevel.low},
-        {"name": "Technical interview", "timeMinMax": [1, 1.5], "focus_level": FocusLevel.high},
-        {"name": "Release planning meeting", "timeMinMax": [1, 2], "focus_level": FocusLevel.medium},
-        
-        # Documentation and admin
-        {"name": "Design system documentation", "timeMinMax": [1, 3], "focus_level": FocusLevel.medium},
-        {"name": "Technical specification writing", "timeMinMax": [2, 4], "focus_level": FocusLevel.medium},
-        {"name": "Documentation updates", "timeMinMax": [1, 3], "focus_level": FocusLevel.low},
-        {"name": "Email and administrative tasks", "timeMinMax": [0.5, 1.5], "focus_level": FocusLevel.low},
-        {"name": "Weekly planning session", "timeMinMax": [1, 2], "focus_level": FocusLevel.low},
-        {"name": "Project status reporting", "timeMinMax": [0.5, 1], "focus_level": FocusLevel.low},
-        {"name": "Time tracking and reporting", "timeMinMax": [0.25, 0.5], "focus_level": FocusLevel.low},
-        {"name": "API documentation writing", "timeMinMax": [2, 4], "focus_level": FocusLevel.medium},
-        {"name": "Architecture decision records", "timeMinMax": [1, 2], "focus_level": FocusLevel.high},
-        {"name": "Release notes preparation", "timeMinMax": [1, 2], "focus_level": FocusLevel.medium},
-        {"name": "Team process documentation", "timeMinMax": [1, 3], "focus_level": FocusLevel.medium},
-        {"name": "Onboarding guide updates", "timeMinMax": [2, 3], "focus_level": FocusLevel.medium},
-        {"name": "Security compliance report", "timeMinMax": [2, 4], "focus_level": FocusLevel.high},
-        {"name": "Performance metrics report", "timeMinMax": [1, 2], "focus_level": FocusLevel.medium},
-        
-        # Research and learning
-        {"name": "Research new React patterns", "timeMinMax": [1, 3], "focus_level": FocusLevel.high},
-        {"name": "Technology evaluation", "timeMinMax": [2, 4], "focus_level": FocusLevel.high},
-        {"name": "Learning new framework", "timeMinMax": [2, 5], "focus_level": FocusLevel.low},
-        {"name": "Security research and analysis", "timeMinMax": [2, 4], "focus_level": FocusLevel.high},
-        {"name": "Industry best practices review", "timeMinMax": [1, 3], "focus_level": FocusLevel.medium},
-        {"name": "ChatGPT prompt engineering", "timeMinMax": [1, 2], "focus_level": FocusLevel.high},
-        {"name": "Claude API integration research", "timeMinMax": [2, 3], "focus_level": FocusLevel.high},
-        {"name": "Gemini Pro capabilities exploration", "timeMinMax": [1.5, 3], "focus_level": FocusLevel.medium},
-        {"name": "AI model fine-tuning research", "timeMinMax": [2, 4], "focus_level": FocusLevel.high},
-        {"name": "LLM performance benchmarking", "timeMinMax": [2, 4], "focus_level": FocusLevel.high},
-        {"name": "AI ethics and safety review", "timeMinMax": [1, 2], "focus_level": FocusLevel.medium},
-        {"name": "ML model deployment patterns", "timeMinMax": [2, 4], "focus_level": FocusLevel.high},
-        {"name": "AI cost optimization research", "timeMinMax": [1, 2], "focus_level": FocusLevel.medium},
-        {"name": "Vector database evaluation", "timeMinMax": [2, 3], "focus_level": FocusLevel.high},
-        
-        # QA and testing
-        {"name": "Testing and QA session", "timeMinMax": [1, 3], "focus_level": FocusLevel.medium},
-        {"name": "Manual testing workflow", "timeMinMax": [1, 2], "focus_level": FocusLevel.medium},
-        {"name": "Automated test maintenance", "timeMinMax": [1, 3], "focus_level": FocusLevel.medium},
-        {"name": "Bug investigation and analysis", "timeMinMax": [1, 4], "focus_level": FocusLevel.low},
-        {"name": "Performance optimization", "timeMinMax": [1, 3], "focus_level": FocusLevel.high},
-        {"name": "Load testing implementation", "timeMinMax": [2, 4], "focus_level": FocusLevel.high},
-        {"name": "Security penetration testing", "timeMinMax": [3, 5], "focus_level": FocusLevel.high},
-        {"name": "Cross-browser compatibility testing", "timeMinMax": [2, 3], "focus_level": FocusLevel.medium},
-        {"name": "API integration testing", "timeMinMax": [2, 4], "focus_level": FocusLevel.medium},
-        {"name": "User acceptance testing", "timeMinMax": [1, 3], "focus_level": FocusLevel.medium},
-        {"name": "Test automation framework setup", "timeMinMax": [3, 5], "focus_level": FocusLevel.high},
-        {"name": "Performance benchmark testing", "timeMinMax": [2, 4], "focus_level": FocusLevel.high},
-        {"name": "Mobile app testing", "timeMinMax": [2, 3], "focus_level": FocusLevel.medium},
-        {"name": "Accessibility testing", "timeMinMax": [1, 2], "focus_level": FocusLevel.medium}
-    ]
 
     sample_tasks = []
     sample_summaries = []
@@ -165,9 +165,9 @@ async def generate_sample_data(reference_date: datetime = None) -> tuple[List[Ta
             if day_offset == 0 and i < 3:
                 template_index = i  # Use first three templates for variety
             else:
-                template_index = random.randint(0, len(task_templates) - 1)
+                template_index = random.randint(0, len(TASK_TEMPLATES) - 1)
             
-            template = task_templates[template_index]
+            template = TASK_TEMPLATES[template_index]
             
             time_min, time_max = template["timeMinMax"]
             time_spent = time_min + random.random() * (time_max - time_min)
@@ -234,8 +234,8 @@ async def generate_week_summary(ai_service, week_tasks: List[Task], week_start:
             avg_focus = "high"
         
         return WeeklySummary(
-            week_start=week_start_str,
-            week_end=week_end_str,
+            week_start=date.fromisoformat(week_start_str),
+            week_end=date.fromisoformat(week_end_str),
             summary=ai_response.summary,
             stats={
                 "total_tasks": total_tasks,
@@ -265,8 +265,8 @@ async def generate_week_summary(ai_service, week_tasks: List[Task], week_start:
             avg_focus = "high"
         
         return WeeklySummary(
-            week_start=week_start_str,
-            week_end=week_end_str,
+            week_start=date.fromisoformat(week_start_str),
+            week_end=date.fromisoformat(week_end_str),
             summary="Week completed with various tasks across different focus levels.",
             stats={
                 "total_tasks": total_tasks,
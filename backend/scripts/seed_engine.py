@@ -0,0 +1,444 @@
+#!/usr/bin/env python3
+"""
+Fast seed data generator: bulk-loads tasks and weekly summaries with COPY.
+
+Tasks are generated from the same templates as scripts/seed_data.py, with a seeded NumPy
+RNG, so the same --seed and --reference-date always produce the same data. Tasks and
+summaries replace any existing data and are written with asyncpg's binary COPY.
+
+--offline writes template-based summaries and embeds them with the local hashing model,
+without OpenAI calls or network access. Otherwise summaries are generated by the AI model,
+several weeks at a time, and embedded with the configured embedding provider.
+
+Generation, summary writing, embedding and record building run in worker threads, so seeding
+from the API (POST /api/admin/generate-sample-data) never blocks the event loop.
+
+--scale multiplies the default volume (60 days, about 2 tasks a day). The date range grows
+first, up to --max-years, then the number of tasks per day. --scale 10000 is about 1.2M
+tasks over 10 years.
+
+Usage:
+    python scripts/seed_engine.py --offline
+    python scripts/seed_engine.py --offline --scale 10000 --seed 7
+    python scripts/seed_engine.py --offline --scale 10000 --dry-run
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.embeddings import EMBEDDING_PROFILE
+from models.models import Task, WeeklySummary
+from scripts.seed_data import TASK_TEMPLATES, generate_week_summary
+from services.embedding_providers import HASHING_MODEL, create_embedding_provider, encode_batch
+from services.summary_service import SummaryService
+from utils.date_utils import get_week_start
+
+DEFAULT_SEED = 42
+# Volume of --scale 1, the same as scripts/seed_data.py
+BASE_DAYS = 60
+COPY_CHUNK_SIZE = 100_000
+
+TASK_COLUMNS = ("name", "time_spent", "focus_level", "date_worked", "created_at", "updated_at")
+SUMMARY_COLUMNS = (
+    "week_start", "week_end", "summary", "stats", "recommendations", "embedding", "created_at", "updated_at"
+)
+
+FOCUS_VALUES = {"low": 1, "medium": 2, "high": 3}
+
+OFFLINE_OPENINGS = ("This week logged", "The week covered", "Work this week added up to")
+OFFLINE_RECOMMENDATIONS = {
+    "low": [
+        "Block out two uninterrupted hours each morning for deep work",
+        "Batch email and admin tasks into a single daily slot",
+        "Pick one high-impact task to finish before starting anything else",
+        "Cut or delegate a recurring low-value meeting",
+    ],
+    "medium": [
+        "Protect your most focused hours from meetings",
+        "Group similar tasks together to reduce context switching",
+        "Review the plan for next week before Monday starts",
+        "Keep documentation updates small and frequent",
+    ],
+    "high": [
+        "Keep the current deep work routine going",
+        "Schedule short breaks to sustain focus through long sessions",
+        "Share what worked this week with the team",
+        "Leave some slack for unplanned reviews and support",
+    ],
+}
+
+
+class SeedProgress:
+    """Stage and counters of a seed run, updated as it goes."""
+
+    def __init__(self):
+        self.stage = "pending"
+        self.tasks_total = 0
+        self.tasks_written = 0
+        self.summaries_total = 0
+        self.summaries_written = 0
+
+    def snapshot(self) -> dict:
+        """Get the current stage and counters."""
+        return dict(vars(self))
+
+
+def get_volume(scale: int, max_years: int) -> Tuple[int, int]:
+    """Get the number of days and the tasks-per-day multiplier for a scale."""
+    days = min(BASE_DAYS * scale, max(BASE_DAYS, max_years * 365))
+    density = max(1, round(BASE_DAYS * scale / days))
+    return days, density
+
+
+def generate_tasks(rng: np.random.Generator, reference_date: date, days: int, density: int) -> Dict[str, np.ndarray]:
+    """
+    Generate tasks for the `days` days up to the reference date, as column arrays.
+
+    Like scripts/seed_data.py, weekdays get 1-4 tasks and weekend days 0-2 (times density),
+    and the reference date starts with the first three templates, one per focus level.
+
+    Returns:
+        Dictionary of date ordinals, template indexes and hours, one entry per task
+    """
+    ordinals = reference_date.toordinal() - np.arange(days)
+    # date.fromordinal(1) is a Monday
+    weekend = (ordinals - 1) % 7 >= 5
+    counts = rng.integers(np.where(weekend, 0, 1) * density, np.where(weekend, 2, 4) * density + 1)
+    counts[0] = max(counts[0], 3)
+
+    task_ordinals = np.repeat(ordinals, counts)
+    templates = rng.integers(0, len(TASK_TEMPLATES), size=len(task_ordinals))
+    templates[:3] = [0, 1, 2]
+
+    time_ranges = np.array([template["timeMinMax"] for template in TASK_TEMPLATES], dtype=np.float64)
+    time_min, time_max = time_ranges[templates, 0], time_ranges[templates, 1]
+    hours = np.round((time_min + rng.random(len(templates)) * (time_max - time_min)) * 4) / 4
+
+    return {"ordinals": task_ordinals, "templates": templates, "hours": hours}
+
+
+def summarize_weeks(tasks: Dict[str, np.ndarray], reference_date: date) -> List[dict]:
+    """
+    Compute the stats of every week with tasks, except the reference date's week.
+
+    Also stores each task's week index in tasks["weeks"].
+
+    Returns:
+        One dictionary per week, oldest first, with week_start, week_end, stats,
+        top_tasks (name and hours of the templates with the most hours) and index
+    """
+    first_week = get_week_start(date.fromordinal(int(tasks["ordinals"].min())))
+    week_index = (tasks["ordinals"] - first_week.toordinal()) // 7
+    tasks["weeks"] = week_index
+    week_count = int(week_index.max()) + 1
+    template_count = len(TASK_TEMPLATES)
+
+    focus_by_template = np.array([FOCUS_VALUES[template["focus_level"].value] for template in TASK_TEMPLATES])
+    task_counts = np.bincount(week_index, minlength=week_count)
+    hours = np.bincount(week_index, weights=tasks["hours"], minlength=week_count)
+    focus = np.bincount(week_index, weights=focus_by_template[tasks["templates"]], minlength=week_count)
+    template_hours = np.bincount(
+        week_index * template_count + tasks["templates"], weights=tasks["hours"], minlength=week_count * template_count
+    ).reshape(week_count, template_count)
+
+    current_week = (get_week_start(reference_date).toordinal() - first_week.toordinal()) // 7
+    weeks = []
+    for index in np.flatnonzero(task_counts):
+        if index == current_week:
+            continue
+        avg_focus_numeric = focus[index] / task_counts[index]
+        if avg_focus_numeric < 1.5:
+            avg_focus = "low"
+        elif avg_focus_numeric < 2.5:
+            avg_focus = "medium"
+        else:
+            avg_focus = "high"
+
+        week_start = first_week + timedelta(weeks=int(index))
+        top_templates = np.argsort(-template_hours[index], kind="stable")[:3]
+        weeks.append({
+            "index": int(index),
+            "week_start": week_start,
+            "week_end": week_start + timedelta(days=6),
+            "stats": {
+                "total_tasks": int(task_counts[index]),
+                "total_hours": str(round(float(hours[index]), 1)),
+                "avg_focus": avg_focus
+            },
+            "top_tasks": [
+                (TASK_TEMPLATES[template]["name"], round(float(template_hours[index, template]), 1))
+                for template in top_templates if template_hours[index, template] > 0
+            ],
+        })
+    return weeks
+
+
+def write_offline_summary(rng: np.random.Generator, week: dict) -> Tuple[str, List[str]]:
+    """Write a template-based summary and recommendations from a week's stats."""
+    stats = week["stats"]
+    opening = OFFLINE_OPENINGS[rng.integers(len(OFFLINE_OPENINGS))]
+    top_tasks = ", ".join(f"{name} ({hours}h)" for name, hours in week["top_tasks"])
+    summary = (
+        f"{opening} {stats['total_tasks']} tasks and {stats['total_hours']} hours, "
+        f"with {stats['avg_focus']} average focus. Most time went to {top_tasks}."
+    )
+    options = OFFLINE_RECOMMENDATIONS[stats["avg_focus"]]
+    recommendations = [options[choice] for choice in sorted(rng.choice(len(options), size=2, replace=False))]
+    return summary, recommendations
+
+
+def write_offline_summaries(rng: np.random.Generator, weeks: List[dict], progress: SeedProgress) -> None:
+    """Write every week's template-based summary."""
+    for week in weeks:
+        week["summary"], week["recommendations"] = write_offline_summary(rng, week)
+        progress.summaries_written += 1
+
+
+async def write_ai_summaries(
+    tasks: Dict[str, np.ndarray], weeks: List[dict], concurrency: int, progress: SeedProgress
+) -> None:
+    """Generate each week's summary with the AI model, `concurrency` weeks at a time."""
+    # Import AI service here to avoid circular imports
+    from services.ai_service import AIService
+
+    ai_service = AIService()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def write_week(week: dict) -> None:
+        mask = tasks["weeks"] == week["index"]
+        week_tasks = [
+            Task(
+                name=TASK_TEMPLATES[template]["name"],
+                time_spent=float(hours),
+                focus_level=TASK_TEMPLATES[template]["focus_level"],
+                date_worked=date.fromordinal(int(ordinal))
+            )
+            for ordinal, template, hours in zip(tasks["ordinals"][mask], tasks["templates"][mask], tasks["hours"][mask])
+        ]
+        async with semaphore:
+            summary = await generate_week_summary(ai_service, week_tasks, week["week_start"], week["week_end"])
+        week["summary"], week["recommendations"] = summary.summary, summary.recommendations
+        progress.summaries_written += 1
+
+    await asyncio.gather(*(write_week(week) for week in weeks))
+
+
+def get_text_to_embed(week: dict) -> str:
+    """Get the normalized text SummaryService embeds for the week's summary."""
+    summary = WeeklySummary(
+        week_start=week["week_start"], week_end=week["week_end"],
+        summary=week["summary"], recommendations=week["recommendations"]
+    )
+    return SummaryService.normalize_text_for_embedding(SummaryService.get_text_to_embed(summary))
+
+
+async def embed_summaries(weeks: List[dict], offline: bool) -> None:
+    """Embed every summary, with the local hashing model when offline, else the configured provider."""
+    texts = [get_text_to_embed(week) for week in weeks]
+    if offline:
+        embeddings = await asyncio.to_thread(encode_batch, texts, HASHING_MODEL, EMBEDDING_PROFILE['dimensions'])
+    else:
+        from openai import AsyncOpenAI
+        provider = create_embedding_provider(client=AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY")))
+        try:
+            embeddings = await provider.embed(texts)
+        finally:
+            provider.close()
+    for week, embedding in zip(weeks, embeddings):
+        week["embedding"] = np.asarray(embedding, dtype=np.float32)
+
+
+def iter_task_records(tasks: Dict[str, np.ndarray], chunk_size: int, now: datetime) -> Iterator[List[tuple]]:
+    """Yield COPY records for the tasks, chunk_size at a time."""
+    names = [template["name"] for template in TASK_TEMPLATES]
+    focus_levels = [template["focus_level"].value for template in TASK_TEMPLATES]
+    dates = {int(ordinal): date.fromordinal(int(ordinal)) for ordinal in np.unique(tasks["ordinals"])}
+
+    for start in range(0, len(tasks["ordinals"]), chunk_size):
+        end = start + chunk_size
+        yield [
+            (names[template], hours, focus_levels[template], dates[ordinal], now, now)
+            for ordinal, template, hours in zip(
+                tasks["ordinals"][start:end].tolist(),
+                tasks["templates"][start:end].tolist(),
+                tasks["hours"][start:end].tolist()
+            )
+        ]
+
+
+def get_summary_records(weeks: List[dict], now: datetime) -> List[tuple]:
+    """Get COPY records for the summaries."""
+    return [
+        (
+            week["week_start"], week["week_end"], week["summary"], json.dumps(week["stats"]),
+            json.dumps(week["recommendations"]), week["embedding"], now, now
+        )
+        for week in weeks
+    ]
+
+
+async def copy_seed_data(
+    engine,
+    tasks: Dict[str, np.ndarray],
+    weeks: List[dict],
+    chunk_size: int = COPY_CHUNK_SIZE,
+    progress: Optional[SeedProgress] = None
+) -> None:
+    """
+    Replace all tasks and summaries with the generated ones, using COPY in a single transaction.
+
+    Each chunk of records is built in a worker thread while the event loop keeps serving other work.
+    """
+    progress = progress or SeedProgress()
+    now = datetime.utcnow()
+    summary_records = await asyncio.to_thread(get_summary_records, weeks, now)
+    task_records = iter_task_records(tasks, chunk_size, now)
+
+    async with engine.connect() as connection:
+        # asyncpg connection, with the pgvector codecs registered by register_vector_codec
+        driver_connection = (await connection.get_raw_connection()).driver_connection
+        async with driver_connection.transaction():
+            await driver_connection.execute("TRUNCATE weekly_summaries, tasks RESTART IDENTITY")
+            while (records := await asyncio.to_thread(next, task_records, None)) is not None:
+                await driver_connection.copy_records_to_table("tasks", records=records, columns=TASK_COLUMNS)
+                progress.tasks_written += len(records)
+            await driver_connection.copy_records_to_table("weekly_summaries", records=summary_records, columns=SUMMARY_COLUMNS)
+        # Fresh statistics, so the planner sees the new volume straight away
+        progress.stage = "analyzing"
+        await driver_connection.execute("ANALYZE tasks")
+        await driver_connection.execute("ANALYZE weekly_summaries")
+
+
+async def seed(
+    engine=None,
+    seed: int = DEFAULT_SEED,
+    scale: int = 1,
+    offline: bool = False,
+    reference_date: Optional[date] = None,
+    max_years: int = 10,
+    concurrency: int = 8,
+    chunk_size: int = COPY_CHUNK_SIZE,
+    progress: Optional[SeedProgress] = None
+) -> dict:
+    """
+    Generate and load seed data.
+
+    Parameters:
+        engine: Async engine to write to, or None to only generate the data (dry run)
+        seed: RNG seed; the same seed and reference date give the same data
+        scale: Multiple of the default volume (60 days, about 2 tasks a day)
+        offline: Template-based summaries and local embeddings, no network calls
+        reference_date: Last day with tasks (default: today)
+        max_years: Longest date range, before scale adds tasks per day instead
+        concurrency: Weeks summarized by the AI model at once (online only)
+        chunk_size: Tasks per COPY call
+        progress: Updated with the current stage and counts as the run goes
+
+    Returns:
+        Dictionary with counts of created records and seconds spent per stage
+    """
+    reference_date = reference_date or date.today()
+    rng = np.random.default_rng(seed)
+    days, density = get_volume(scale, max_years)
+    progress = progress or SeedProgress()
+    timings = {}
+
+    start = time.perf_counter()
+    progress.stage = "generating"
+    tasks = await asyncio.to_thread(generate_tasks, rng, reference_date, days, density)
+    weeks = await asyncio.to_thread(summarize_weeks, tasks, reference_date)
+    progress.tasks_total, progress.summaries_total = len(tasks["ordinals"]), len(weeks)
+    timings["generate_s"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    progress.stage = "summarizing"
+    if offline:
+        await asyncio.to_thread(write_offline_summaries, rng, weeks, progress)
+    else:
+        await write_ai_summaries(tasks, weeks, concurrency, progress)
+    timings["summaries_s"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    progress.stage = "embedding"
+    await embed_summaries(weeks, offline)
+    timings["embed_s"] = time.perf_counter() - start
+
+    if engine is not None:
+        start = time.perf_counter()
+        progress.stage = "copying"
+        await copy_seed_data(engine, tasks, weeks, chunk_size, progress)
+        timings["copy_s"] = time.perf_counter() - start
+    progress.stage = "done"
+
+    return {
+        "tasks_created": len(tasks["ordinals"]),
+        "summaries_created": len(weeks),
+        "days": days,
+        "first_date": date.fromordinal(int(tasks["ordinals"].min())).isoformat(),
+        "last_date": reference_date.isoformat(),
+        "timings": {stage: round(seconds, 3) for stage, seconds in timings.items()},
+    }
+
+
+async def main_async(args):
+    engine = None
+    if not args.dry_run:
+        from config.database import ASYNC_DATABASE_URL
+        from services.database import create_engine_from_pool_config, register_vector_codec
+        engine = create_engine_from_pool_config(ASYNC_DATABASE_URL)
+        register_vector_codec(engine)
+
+    if args.offline and EMBEDDING_PROFILE['provider'] != "local":
+        print("Offline embeddings use the local hashing model. For search queries to match them, set "
+              "EMBEDDING_PROVIDER=local and LOCAL_EMBEDDING_MODEL=hashing, or re-embed with "
+              "POST /admin/reembed-summaries?only_missing=false")
+
+    try:
+        result = await seed(
+            engine=engine,
+            seed=args.seed,
+            scale=args.scale,
+            offline=args.offline,
+            reference_date=date.fromisoformat(args.reference_date) if args.reference_date else None,
+            max_years=args.max_years,
+            concurrency=args.concurrency,
+            chunk_size=args.chunk_size
+        )
+    finally:
+        if engine is not None:
+            await engine.dispose()
+
+    print(f"{'Generated' if args.dry_run else 'Created'} {result['tasks_created']} tasks and "
+          f"{result['summaries_created']} summaries from {result['first_date']} to {result['last_date']}")
+    print(result["timings"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="RNG seed")
+    parser.add_argument("--scale", type=int, default=1, help="Multiple of the default volume (60 days, about 2 tasks a day)")
+    parser.add_argument("--offline", action="store_true", help="Template summaries and local embeddings, no network calls")
+    parser.add_argument("--reference-date", default=None, help="Last day with tasks, YYYY-MM-DD (default: today)")
+    parser.add_argument("--max-years", type=int, default=10, help="Longest date range before scale adds tasks per day")
+    parser.add_argument("--concurrency", type=int, default=8, help="Weeks summarized by the AI model at once")
+    parser.add_argument("--chunk-size", type=int, default=COPY_CHUNK_SIZE, help="Tasks per COPY call")
+    parser.add_argument("--dry-run", action="store_true", help="Generate the data without writing it")
+    args = parser.parse_args()
+    if args.scale < 1:
+        parser.error("--scale must be at least 1")
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+State of admin background jobs, kept in Postgres so every worker process sees the same job.
+
+A job is claimed with a single upsert that only succeeds when no run of it is in progress,
+so at most one run happens at a time across all workers. While it runs, the job saves its
+progress every ADMIN_JOB_HEARTBEAT_SECONDS. A running job with no heartbeat for
+ADMIN_JOB_STALE_SECONDS (its worker died) is reported as interrupted and can be claimed again.
+
+A run is identified by its started_at, returned by claim: progress and the final status are only
+saved while the row still belongs to that run, so a run that was taken over after going stale
+can't overwrite the newer run's state.
+"""
+import asyncio
+import logging
+import os
+from contextlib import suppress
+from datetime import datetime, timedelta
+from typing import Callable, Optional
+
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from models.models import AdminJob
+from services.database import get_session
+
+ADMIN_JOB_HEARTBEAT_SECONDS = float(os.getenv("ADMIN_JOB_HEARTBEAT_SECONDS", "2"))
+ADMIN_JOB_STALE_SECONDS = float(os.getenv("ADMIN_JOB_STALE_SECONDS", "60"))
+
+logger = logging.getLogger(__name__)
+_jobs_table = AdminJob.__table__
+
+
+class AdminJobService:
+    """Claims admin background jobs and saves their status, progress and result."""
+
+    def __init__(
+        self,
+        heartbeat_seconds: float = ADMIN_JOB_HEARTBEAT_SECONDS,
+        stale_seconds: float = ADMIN_JOB_STALE_SECONDS
+    ):
+        self.heartbeat_seconds = heartbeat_seconds
+        self.stale_seconds = stale_seconds
+
+    def _stale_before(self) -> datetime:
+        return datetime.utcnow() - timedelta(seconds=self.stale_seconds)
+
+    async def claim(self, session: AsyncSession, name: str, details: dict) -> Optional[datetime]:
+        """
+        Mark the job as running, unless it already runs with a recent heartbeat.
+
+        Returns:
+            started_at of the new run, identifying it in save_progress, finish and keep_alive,
+            or None if the job is already running
+        """
+        now = datetime.utcnow()
+        statement = insert(_jobs_table).values(
+            name=name, status="running", details=details, progress={},
+            started_at=now, finished_at=None, updated_at=now
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=["name"],
+            set_={column: statement.excluded[column] for column in ("status", "details", "progress", "started_at", "finished_at", "updated_at")},
+            where=(_jobs_table.c.status != "running") | (_jobs_table.c.updated_at < self._stale_before())
+        ).returning(_jobs_table.c.started_at)
+        started_at = (await session.execute(statement)).scalar()
+        await session.commit()
+        return started_at
+
+    async def save_progress(self, session: AsyncSession, name: str, started_at: datetime, progress: dict) -> bool:
+        """
+        Save the run's progress, which also serves as its heartbeat.
+
+        Returns:
+            Whether the run still owns the job, False once it finished or another run claimed it
+        """
+        result = await session.execute(
+            update(_jobs_table)
+            .where(_jobs_table.c.name == name, _jobs_table.c.started_at == started_at, _jobs_table.c.status == "running")
+            .values(progress=progress, updated_at=datetime.utcnow())
+        )
+        await session.commit()
+        return result.rowcount > 0
+
+    async def finish(self, session: AsyncSession, name: str, started_at: datetime, status: str, details: dict, progress: dict) -> bool:
+        """
+        Record the run's final status ("succeeded" or "failed"), with its result or error in details.
+
+        Returns:
+            Whether it was recorded, False if another run claimed the job meanwhile
+        """
+        now = datetime.utcnow()
+        result = await session.execute(
+            update(_jobs_table)
+            .where(_jobs_table.c.name == name, _jobs_table.c.started_at == started_at)
+            .values(status=status, details=details, progress=progress, finished_at=now, updated_at=now)
+        )
+        await session.commit()
+        return result.rowcount > 0
+
+    async def get(self, session: AsyncSession, name: str) -> Optional[dict]:
+        """Get the job's latest run, or None if it never ran. A running job without a recent heartbeat is "interrupted"."""
+        job = (await session.execute(select(AdminJob).where(AdminJob.name == name))).scalars().first()
+        if job is None:
+            return None
+        status = job.status
+        if status == "running" and job.updated_at < self._stale_before():
+            status = "interrupted"
+        return {
+            "status": status,
+            **job.details,
+            "progress": job.progress,
+            "started_at": job.started_at.isoformat() if job.started_at else None,
+            "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+        }
+
+    async def keep_alive(self, name: str, started_at: datetime, progress: Callable[[], dict], stopped: asyncio.Event) -> None:
+        """
+        Save the run's progress every heartbeat_seconds, each time with its own session, until stopped
+        is set or another run claimed the job.
+        """
+        while True:
+            with suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(stopped.wait(), timeout=self.heartbeat_seconds)
+                return
+            try:
+                async for db in get_session():
+                    owned = await self.save_progress(session=db, name=name, started_at=started_at, progress=progress())
+                    break  # Only need first session from the generator
+            except Exception as e:
+                logger.warning("Failed to save progress of job %s: %s", name, e)
+                continue
+            if not owned:
+                logger.warning("Job %s was claimed by another run, no longer saving progress", name)
+                return
@@ -1,8 +1,11 @@
 import os
+import logging
 from typing import List, Optional
 from openai import AsyncOpenAI
 import weave
 from models.models import Task, WeeklyStats
+from utils.prompt_utils import compact_task_summary, estimate_tokens, render_adjacent_week_context, render_task_lines
+from utils.logging_utils import PayloadSampler
 from pydantic import BaseModel
 from pydantic_ai import Agent
 
@@ -38,9 +41,15 @@ Provide a JSON response with:
 }}
 """
 
+logger = logging.getLogger(__name__)
+
 class AIService:
     def __init__(self):
         self.client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        # Max estimated tokens for the task list in the summary prompt, keeps heavy weeks bounded
+        self.task_token_budget = int(os.getenv("SUMMARY_TASK_TOKEN_BUDGET", "1200"))
+        # Full prompts and responses are logged for a sample of calls (LOG_PROMPT_SAMPLE_EVERY), and on error
+        self.prompt_sampler = PayloadSampler()
         
     def calculate_weekly_stats(self, tasks: List[Task]) -> WeeklyStats:
         """Calculate weekly stats from tasks."""
@@ -58,9 +67,8 @@ class AIService:
                 avg_focus = "medium"
             else:
                 avg_focus = "high"
-        except Exception as e:
-            print(f"ERROR in calculate_weekly_stats: {e}")
-            print(f"ERROR details: {type(e).__name__}: {str(e)}")
+        except Exception:
+            logger.exception("Failed to calculate weekly stats for %d tasks", total_tasks)
             raise
         
         return WeeklyStats(total_tasks=total_tasks, total_hours=total_hours, avg_focus=avg_focus)
@@ -71,49 +79,30 @@ class AIService:
         tasks: List[Task],
         week_start: str,
         week_end: str,
-        context_summaries: Optional[dict] = None
+        context_summaries: Optional[dict] = None,
+        adjacent_week_context: Optional[str] = None
     ) -> SummaryResponse:
-        """Generate a weekly productivity summary using OpenAI."""
+        """Generate a weekly productivity summary using OpenAI.
+        
+        Surrounding weeks are given either as raw context_summaries or as an
+        adjacent_week_context block already rendered by SummaryService.get_adjacent_week_context.
+        """
         if not tasks:
             return SummaryResponse(
                 summary="No tasks completed this week.",
                 recommendations=[]
             )
         
-        # Create task summary
+        # Create task summary, grouping repeated tasks and compacting to the token budget
         try:
-            task_summary = "\n".join([
-                f"- {task.name} ({task.time_spent}h, {task.focus_level.value if hasattr(task.focus_level, 'value') else task.focus_level} focus)"
-                for task in tasks
-            ])
-        except Exception as e:
-            print(f"ERROR creating task_summary: {e}")
-            print(f"ERROR details: {type(e).__name__}: {str(e)}")
+            task_summary = compact_task_summary(tasks, token_budget=self.task_token_budget)
+        except Exception:
+            logger.exception("Failed to create the task summary for week %s", week_start)
             raise
         
-        # Build context section from surrounding summaries
-        adjacent_week_summaries = ""
-        if context_summaries:
-            context_parts = []
-            
-            if context_summaries.get("before"):
-                before_summaries = context_summaries["before"]
-                context_parts.append("PREVIOUS WEEKS:")
-                for summary in before_summaries:
-                    context_parts.append(f"* {summary.get('weekRange', 'Unknown week')}: {summary.get('summary', '')}")
-                    if summary.get('recommendations'):
-                        context_parts.append(f"  Recommendations: {', '.join(summary['recommendations'])}")
-            
-            if context_summaries.get("after"):
-                after_summaries = context_summaries["after"]
-                context_parts.append("\nWEEKS AFTER:")
-                for summary in after_summaries:
-                    context_parts.append(f"* {summary.get('weekRange', 'Unknown week')}: {summary.get('summary', '')}")
-                    if summary.get('recommendations'):
-                        context_parts.append(f"  Recommendations: {', '.join(summary['recommendations'])}")
-            
-            if context_parts:
-                adjacent_week_summaries = "IMPORTANT: Use this context from previous and future weeks to provide DIFFERENT advice than what was already given. Avoid repeating recommendations and focus on new insights or next steps in the user's productivity journey. Praise them for ways they have implemented past recommendations or improved their productivity.\n\n" + "\n".join(context_parts)
+        # Build context section from surrounding summaries, unless the caller already rendered it
+        if adjacent_week_context is None:
+            adjacent_week_context = render_adjacent_week_context(context_summaries)
         
         stats = self.calculate_weekly_stats(tasks)
         
@@ -125,9 +114,18 @@ class AIService:
             total_hours=stats.total_hours,
             avg_focus=stats.avg_focus,
             task_summary=task_summary,
-            adjacent_week_summaries=adjacent_week_summaries
+            adjacent_week_summaries=adjacent_week_context
+        )
+
+        prompt_tokens = estimate_tokens(prompt)
+        uncompacted_prompt_tokens = prompt_tokens - estimate_tokens(task_summary) + estimate_tokens(render_task_lines(tasks))
+        logger.info(
+            "Summary prompt for week %s: %d tasks, ~%d tokens before compaction, ~%d after (task budget %d)",
+            week_start, len(tasks), uncompacted_prompt_tokens, prompt_tokens, self.task_token_budget
         )
-        print("Prompt to generate weekly summary: ", prompt)
+        log_payload = self.prompt_sampler.should_log()
+        if log_payload:
+            logger.info("Summary prompt for week %s", week_start, extra={"prompt": prompt})
         
         try:
             agent = Agent(
@@ -140,11 +138,15 @@ class AIService:
             
             # Extract the SummaryResponse from the AgentRunResult
             ai_response = result.output
-            print("Summary: ", ai_response.summary, "Recommendations: ", ai_response.recommendations)
+            if log_payload:
+                logger.info(
+                    "Summary response for week %s", week_start,
+                    extra={"summary": ai_response.summary, "recommendations": ai_response.recommendations}
+                )
             return ai_response
-        except Exception as e:
-            # Fallback response
-            print({"summary_generation_error": str(e)})
+        except Exception:
+            # Fallback response; the prompt is always logged with the error
+            logger.exception("Summary generation failed for week %s", week_start, extra={"prompt": prompt})
             return SummaryResponse(
                 summary="Unable to generate AI summary. Please try again later.",
                 recommendations=[]
@@ -161,6 +163,6 @@ class AIService:
                 max_tokens=150
             )
             return response.choices[0].message.content.strip()
-        except Exception as e:
-            print(f"Text generation error: {str(e)}")
+        except Exception:
+            logger.exception("Text generation failed", extra={"prompt": prompt})
             return ""
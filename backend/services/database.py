@@ -1,15 +1,191 @@
 """
 Database session management and engine configuration.
 """
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from typing import AsyncGenerator
+import time
+import logging
+import threading
+from collections import Counter
+from fastapi import Request, Response
+from sqlalchemy import event, exc
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, AsyncEngine
+from sqlalchemy.engine.interfaces import CacheStats
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from typing import AsyncGenerator, Optional
+from pgvector.asyncpg import register_vector
 # SQLModel might be needed if any base metadata operations were here, but typically not for just session/engine.
 # from sqlmodel import SQLModel
 
-from config.database import ASYNC_DATABASE_URL as DATABASE_URL
+from config.database import ASYNC_DATABASE_URL as DATABASE_URL, READ_ASYNC_DATABASE_URL, POOL_CONFIG, READ_AFTER_WRITE_SECONDS
+from utils.timing import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+
+class InstrumentedAsyncQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited for a connection, and checkout timeouts."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_histogram = LatencyHistogram()
+        self.timeouts = 0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            self.wait_histogram.observe((time.perf_counter() - start) * 1000)
+
+
+def create_engine_from_pool_config(database_url: str, pool_config: dict = None) -> AsyncEngine:
+    """Create an async engine with an instrumented pool sized by the pool settings (see config/database.py)."""
+    pool_config = pool_config or POOL_CONFIG
+    return create_async_engine(
+        database_url,
+        echo=False,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=pool_config['pool_size'],
+        max_overflow=pool_config['max_overflow'],
+        pool_timeout=pool_config['pool_timeout'],
+        pool_recycle=pool_config['pool_recycle'],
+        pool_pre_ping=pool_config['pool_pre_ping'],
+        connect_args={
+            # asyncpg's statement cache, and SQLAlchemy's cache of prepared statements per connection
+            "statement_cache_size": pool_config['statement_cache_size'],
+            "prepared_statement_cache_size": pool_config['statement_cache_size'],
+        }
+    )
+
+
+def get_pool_stats(async_engine: AsyncEngine) -> dict:
+    """Get live pool usage and the checkout wait time histogram of an engine."""
+    pool = async_engine.pool
+    stats = {
+        "pool_size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": pool._max_overflow,
+        "timeout_seconds": pool.timeout(),
+    }
+    if isinstance(pool, InstrumentedAsyncQueuePool):
+        stats["timeouts"] = pool.timeouts
+        stats["wait_ms"] = pool.wait_histogram.snapshot()
+    return stats
+
+
+class QueryCacheStats:
+    """Counts SQLAlchemy compiled cache and asyncpg prepared statement cache hits per execution."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.compiled = Counter()
+        self.prepared = Counter()
+
+    def record(self, compiled_cache_hit: Optional[CacheStats], prepared_cache_hit: Optional[bool]) -> None:
+        with self._lock:
+            if compiled_cache_hit is not None:
+                self.compiled[compiled_cache_hit.name.lower()] += 1
+            if prepared_cache_hit is not None:
+                self.prepared["hit" if prepared_cache_hit else "miss"] += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self.compiled.clear()
+            self.prepared.clear()
+
+    def snapshot(self) -> dict:
+        """Get counts by outcome (cache_hit, cache_miss, no_cache_key, ...) and hit ratios."""
+        with self._lock:
+            compiled = dict(self.compiled)
+            prepared = dict(self.prepared)
+        compiled_total = sum(compiled.values())
+        prepared_total = sum(prepared.values())
+        return {
+            "compiled_cache": compiled,
+            "compiled_cache_hit_ratio": round(compiled.get("cache_hit", 0) / compiled_total, 4) if compiled_total else None,
+            "prepared_statements": prepared,
+            "prepared_statement_hit_ratio": round(prepared.get("hit", 0) / prepared_total, 4) if prepared_total else None,
+        }
+
+
+# Shared by every engine of the process
+query_cache_stats = QueryCacheStats()
+
+def register_query_cache_stats(async_engine: AsyncEngine, stats: QueryCacheStats = query_cache_stats) -> None:
+    """Count compiled cache and prepared statement cache hits for every statement an engine runs."""
+    @event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+    def on_before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        # The asyncpg adapter keeps prepared statements per connection, keyed by SQL string
+        prepared_cache = getattr(conn.connection.dbapi_connection, "_prepared_statement_cache", None)
+        stats.record(
+            getattr(context, "cache_hit", None),
+            statement in prepared_cache if prepared_cache is not None else None
+        )
+
+def get_query_cache_stats(async_engine: AsyncEngine) -> dict:
+    """Get the query cache hit counters, with the size of an engine's compiled cache."""
+    compiled_cache = async_engine.sync_engine._compiled_cache
+    return {
+        **query_cache_stats.snapshot(),
+        "compiled_cache_size": len(compiled_cache) if compiled_cache is not None else 0,
+    }
+
 
 # Database engine, echo=False for cleaner logs in production/testing unless debugging SQL
-engine = create_async_engine(DATABASE_URL, echo=False)
+engine = create_engine_from_pool_config(DATABASE_URL)
+
+def register_vector_codec(async_engine: AsyncEngine) -> None:
+    """
+    Register pgvector's binary asyncpg codecs on every new connection of an engine.
+    
+    Embeddings are then sent and received as float32 arrays in binary (4 bytes per
+    dimension) instead of being formatted and parsed as text literals.
+    """
+    @event.listens_for(async_engine.sync_engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        try:
+            dbapi_connection.run_async(register_vector)
+        except ValueError as e:
+            # The vector extension is created by the first migration
+            logger.warning("pgvector codec not registered: %s", e)
+
+register_vector_codec(engine)
+register_query_cache_stats(engine)
+
+# Read-only engine for GET routes, on the read replica when READ_POSTGRES_HOST is set
+if READ_ASYNC_DATABASE_URL:
+    read_engine = create_engine_from_pool_config(READ_ASYNC_DATABASE_URL)
+    register_vector_codec(read_engine)
+    register_query_cache_stats(read_engine)
+else:
+    read_engine = engine
+
+# Response header telling a client to read from the primary until this Unix time, set after
+# its writes. Clients send it back on later requests.
+READ_PRIMARY_UNTIL_HEADER = "X-Read-Primary-Until"
+
+def read_primary_until() -> float:
+    """Get the time until which a client that just wrote should read from the primary."""
+    return time.time() + READ_AFTER_WRITE_SECONDS
+
+def mark_write(response: Response) -> None:
+    """
+    Dependency for routes that write: tells the client to read from the primary for a short while.
+    
+    The header is only sent when the route succeeds, an HTTPException discards it.
+    """
+    response.headers[READ_PRIMARY_UNTIL_HEADER] = f"{read_primary_until():.3f}"
+
+def wants_primary_read(request: Request) -> bool:
+    """Check whether the request carries an unexpired read-from-primary header."""
+    try:
+        return float(request.headers.get(READ_PRIMARY_UNTIL_HEADER, "0")) > time.time()
+    except ValueError:
+        return False
 
 # ==========================================
 # DATABASE SESSION
@@ -33,6 +209,31 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
         finally:
             await session.close()
 
+async def get_read_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Provides a session for read-only routes, on the read replica when one is configured.
+    
+    Requests sent with an unexpired X-Read-Primary-Until header (returned after writes)
+    read from the primary instead, so clients see their own writes despite replica lag.
+    """
+    session_engine = engine if wants_primary_read(request) else read_engine
+    async with AsyncSession(session_engine, expire_on_commit=False) as session:
+        try:
+            yield session
+        finally:
+            await session.close()
+
+async def release_connection(session: AsyncSession) -> None:
+    """
+    Commit the session's transaction so its connection goes back to the pool.
+    
+    Call it after a request's database reads and before slow network work such as AI calls,
+    so the connection isn't held idle meanwhile. The session checks out a connection again
+    on its next query.
+    """
+    if session.in_transaction():
+        await session.commit()
+
 # For backwards compatibility with existing code that might use the old pattern
 async def create_session() -> AsyncSession:
     """
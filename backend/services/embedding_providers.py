@@ -0,0 +1,207 @@
+import os
+import re
+import asyncio
+import hashlib
+import importlib.util
+import multiprocessing
+from abc import ABC, abstractmethod
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from config.embeddings import EMBEDDING_PROFILE, FULL_EMBEDDING_DIMENSIONS
+
+# Name of the dependency-free local model
+HASHING_MODEL = "hashing"
+
+# Models loaded in each worker process, keyed by model name
+_worker_models: Dict[str, object] = {}
+
+def _split_batches(texts: List[str], batch_size: int) -> List[List[str]]:
+    """Split texts into batches of at most batch_size."""
+    return [texts[start:start + batch_size] for start in range(0, len(texts), batch_size)]
+
+def _hashing_embed(texts: List[str], dimensions: int) -> np.ndarray:
+    """
+    Embed texts as a signed, hashed bag of words and word bigrams.
+
+    Each feature is hashed (blake2b, so the result is the same in every process) to a
+    dimension and a sign, weighted by 1 + log(tf), and the vector is L2-normalized.
+    """
+    embeddings = np.zeros((len(texts), dimensions), dtype=np.float32)
+    for row, text in enumerate(texts):
+        tokens = re.findall(r"[a-z0-9']+", text.lower())
+        features = Counter(tokens)
+        features.update(f"{first} {second}" for first, second in zip(tokens, tokens[1:]))
+        for feature, count in features.items():
+            digest = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+            sign = 1.0 if digest >> 63 else -1.0
+            # Bigrams count half as much as single words
+            weight = (1.0 + np.log(count)) * (0.5 if " " in feature else 1.0)
+            embeddings[row, digest % dimensions] += sign * weight
+
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    return embeddings / np.maximum(norms, 1e-12)
+
+def _sentence_transformer_embed(texts: List[str], model_name: str, dimensions: int) -> np.ndarray:
+    """Embed texts with a sentence-transformers model, truncated and re-normalized to dimensions."""
+    model = _worker_models.get(model_name)
+    if model is None:
+        from sentence_transformers import SentenceTransformer
+        model = SentenceTransformer(model_name, device="cpu")
+        _worker_models[model_name] = model
+
+    embeddings = model.encode(texts, batch_size=len(texts), convert_to_numpy=True).astype(np.float32)
+    if embeddings.shape[1] < dimensions:
+        raise ValueError(
+            f"{model_name} produces {embeddings.shape[1]}-d embeddings, set EMBEDDING_DIMENSIONS to at most {embeddings.shape[1]}"
+        )
+    embeddings = embeddings[:, :dimensions]
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    return embeddings / np.maximum(norms, 1e-12)
+
+def encode_batch(texts: List[str], model_name: str, dimensions: int) -> np.ndarray:
+    """Embed one batch of texts. Runs inside a worker process."""
+    if model_name == HASHING_MODEL:
+        return _hashing_embed(texts, dimensions)
+    return _sentence_transformer_embed(texts, model_name, dimensions)
+
+class EmbeddingProvider(ABC):
+    """Interface for embedding backends."""
+
+    name = "base"
+
+    def __init__(self, dimensions: int, batch_size: int):
+        self.dimensions = dimensions
+        self.batch_size = batch_size
+
+    @abstractmethod
+    async def embed(self, texts: List[str]) -> List[np.ndarray]:
+        """Embed texts, returning one float32 vector of `dimensions` per text, in order."""
+
+    def close(self) -> None:
+        """Release any resources held by the provider."""
+
+class OpenAIEmbeddingProvider(EmbeddingProvider):
+    """Embeds with the OpenAI embeddings API, one request per batch."""
+
+    name = "openai"
+
+    def __init__(self, client, model: str, dimensions: int, batch_size: int):
+        super().__init__(dimensions, batch_size)
+        self.client = client
+        self.model = model
+
+    async def embed(self, texts: List[str]) -> List[np.ndarray]:
+        embeddings = []
+        for batch in _split_batches(texts, self.batch_size):
+            request_args = {"input": batch, "model": self.model}
+            # text-embedding-3 models can return shortened embeddings directly
+            if self.dimensions != FULL_EMBEDDING_DIMENSIONS:
+                request_args["dimensions"] = self.dimensions
+
+            response = await self.client.embeddings.create(**request_args)
+            embeddings.extend(
+                np.asarray(item.embedding, dtype=np.float32)
+                for item in sorted(response.data, key=lambda item: item.index)
+            )
+        return embeddings
+
+class LocalEmbeddingProvider(EmbeddingProvider):
+    """
+    Embeds on CPU in a process pool, so encoding never blocks the event loop.
+
+    Batches are spread across the worker processes. Each worker loads the model once,
+    on its first batch. The pool is created on first use.
+    """
+
+    name = "local"
+
+    def __init__(self, model_name: str, dimensions: int, batch_size: int, max_workers: int):
+        super().__init__(dimensions, batch_size)
+        if model_name != HASHING_MODEL and importlib.util.find_spec("sentence_transformers") is None:
+            raise ValueError(
+                f"LOCAL_EMBEDDING_MODEL={model_name} needs the sentence-transformers package, "
+                f"install it or use LOCAL_EMBEDDING_MODEL={HASHING_MODEL}"
+            )
+        self.model_name = model_name
+        self.max_workers = max_workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # spawn rather than fork, the server process has an event loop and open connections
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    async def embed(self, texts: List[str]) -> List[np.ndarray]:
+        if not texts:
+            return []
+
+        loop = asyncio.get_running_loop()
+        batches = await asyncio.gather(*[
+            loop.run_in_executor(self.executor, encode_batch, batch, self.model_name, self.dimensions)
+            for batch in _split_batches(texts, self.batch_size)
+        ])
+        return [embedding for batch in batches for embedding in batch]
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+def create_embedding_provider(client=None, profile: dict = None) -> EmbeddingProvider:
+    """
+    Create the embedding provider selected by EMBEDDING_PROVIDER.
+
+    Embeddings from different providers or models are not comparable. After switching,
+    re-embed stored summaries with POST /admin/reembed-summaries?only_missing=false.
+
+    Args:
+        client: AsyncOpenAI client, used by the openai provider
+        profile: Embedding profile (default: EMBEDDING_PROFILE)
+    """
+    profile = profile or EMBEDDING_PROFILE
+
+    if profile['provider'] == "local":
+        # Small batches so one request's texts are spread across the workers
+        return LocalEmbeddingProvider(
+            model_name=profile['local_model'],
+            dimensions=profile['dimensions'],
+            batch_size=int(os.getenv("EMBEDDING_BATCH_SIZE", "32")),
+            max_workers=int(os.getenv("LOCAL_EMBEDDING_WORKERS", "2"))
+        )
+    return OpenAIEmbeddingProvider(
+        client=client,
+        model=profile['model'],
+        dimensions=profile['dimensions'],
+        batch_size=int(os.getenv("EMBEDDING_BATCH_SIZE", "512"))
+    )
+
+# Provider shared by every service in this process, see get_embedding_provider
+_embedding_provider: Optional[EmbeddingProvider] = None
+
+def get_embedding_provider() -> EmbeddingProvider:
+    """
+    Get this process's embedding provider for EMBEDDING_PROFILE, created on first use.
+
+    Every service shares it, so a worker process runs one local embedding pool at most.
+    """
+    global _embedding_provider
+    if _embedding_provider is None:
+        from openai import AsyncOpenAI
+        _embedding_provider = create_embedding_provider(client=AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY")))
+    return _embedding_provider
+
+def close_embedding_provider() -> None:
+    """Release the shared provider, stopping its local worker processes if any."""
+    global _embedding_provider
+    if _embedding_provider is not None:
+        _embedding_provider.close()
+        _embedding_provider = None
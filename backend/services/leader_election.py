@@ -0,0 +1,132 @@
+"""
+Leader election between worker processes, with a Postgres advisory lock.
+
+Every worker tries to take the same session-level advisory lock. The one that gets it is the
+leader and runs the startup and maintenance jobs; the others serve requests straight away and
+retry every LEADER_RETRY_SECONDS, so another worker takes over if the leader exits. Postgres
+releases the lock when the leader's connection closes, including when its process dies.
+
+The lock is held on a dedicated connection, outside the request connection pool. It must be a
+direct connection: session-level locks do not work through PgBouncer in transaction mode.
+"""
+import asyncio
+import logging
+import os
+from contextlib import suppress
+from typing import Awaitable, Callable, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from config.database import ASYNC_DATABASE_URL
+
+# Advisory lock key shared by all workers of the application
+LEADER_LOCK_KEY = int(os.getenv("LEADER_LOCK_KEY", "7421001"))
+# How often followers try to become leader, and the leader checks it still holds the lock
+LEADER_RETRY_SECONDS = float(os.getenv("LEADER_RETRY_SECONDS", "30"))
+
+TRY_LOCK = text("SELECT pg_try_advisory_lock(:key)")
+UNLOCK = text("SELECT pg_advisory_unlock(:key)")
+CHECK_CONNECTION = text("SELECT 1")
+
+logger = logging.getLogger(__name__)
+
+
+class LeaderElection:
+    """Elects one leader among the worker processes sharing a database, and runs its jobs."""
+
+    def __init__(
+        self,
+        on_elected: Callable[[], Awaitable[None]],
+        database_url: str = ASYNC_DATABASE_URL,
+        lock_key: int = LEADER_LOCK_KEY,
+        retry_seconds: float = LEADER_RETRY_SECONDS
+    ):
+        self.on_elected = on_elected
+        self.lock_key = lock_key
+        self.retry_seconds = retry_seconds
+        self.is_leader = False
+        # No pool: the lock connection is opened and closed on its own, never reused with the lock held
+        self.engine = create_async_engine(database_url, poolclass=NullPool)
+        self._connection: Optional[AsyncConnection] = None
+        self._task: Optional[asyncio.Task] = None
+        self._jobs_task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """Start competing for leadership in the background."""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop competing, cancel running leader jobs and release the lock."""
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        await self._cancel_jobs()
+        await self.release()
+        await self.engine.dispose()
+
+    async def try_acquire(self) -> bool:
+        """Try once to take the lock. The connection holding it stays open while this worker is leader."""
+        connection = await self.engine.connect()
+        try:
+            acquired = (await connection.execute(TRY_LOCK, {"key": self.lock_key})).scalar()
+            await connection.commit()
+        except Exception:
+            await connection.close()
+            raise
+        if not acquired:
+            await connection.close()
+            return False
+        self._connection = connection
+        self.is_leader = True
+        return True
+
+    async def release(self) -> None:
+        """Give up leadership. Closing the connection releases the lock even if the unlock fails."""
+        connection, self._connection = self._connection, None
+        self.is_leader = False
+        if connection is None:
+            return
+        with suppress(Exception):
+            await connection.execute(UNLOCK, {"key": self.lock_key})
+            await connection.commit()
+        with suppress(Exception):
+            await connection.close()
+
+    async def _run(self) -> None:
+        while True:
+            if self.is_leader:
+                try:
+                    await self._connection.execute(CHECK_CONNECTION)
+                    await self._connection.commit()
+                except Exception as e:
+                    # The lock went with the connection, so another worker may lead now
+                    logger.warning("Lost leadership, lock connection failed: %s", e)
+                    # Stop the jobs before another worker can start its own copy of them
+                    await self._cancel_jobs()
+                    await self.release()
+            else:
+                try:
+                    if await self.try_acquire():
+                        logger.info("Worker %d is the leader and runs startup jobs", os.getpid())
+                        self._jobs_task = asyncio.get_running_loop().create_task(self._run_jobs())
+                except Exception as e:
+                    logger.warning("Leader election failed: %s", e)
+            await asyncio.sleep(self.retry_seconds)
+
+    async def _cancel_jobs(self) -> None:
+        jobs_task, self._jobs_task = self._jobs_task, None
+        if jobs_task is not None:
+            jobs_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await jobs_task
+
+    async def _run_jobs(self) -> None:
+        try:
+            await self.on_elected()
+        except Exception:
+            logger.exception("Leader jobs failed")
@@ -1,16 +1,32 @@
 """
 Search query processing service with prompt injection protection and query improvement.
 """
+import os
 import re
+import time
+import asyncio
 import weave
-from typing import Optional
+from contextlib import suppress
+from typing import Awaitable, Callable, List, Optional, Tuple
 from services.ai_service import AIService
+from utils.timing import StageTimer
+
+# Words that mark a natural-language query ("show me weeks when I...") worth rewriting
+QUERY_FILLER_WORDS = {
+    "show", "find", "list", "give", "me", "i", "my", "was", "were", "did", "do", "had",
+    "when", "what", "which", "where", "how", "why", "who", "weeks", "week", "times", "summaries",
+    "about", "the", "a", "an", "of", "with", "that", "there", "lot", "any"
+}
 
 class SearchService:
     """Service for processing and improving search queries."""
     
     def __init__(self):
         self.ai_service = AIService()
+        # Queries of at most this many words and no filler words are searched as-is
+        self.rewrite_max_keyword_words = int(os.getenv("SEARCH_REWRITE_MAX_KEYWORD_WORDS", "3"))
+        # How long a search waits for the rewrite before using the raw query's results
+        self.rewrite_deadline = float(os.getenv("SEARCH_REWRITE_DEADLINE_MS", "800")) / 1000
         
         # Common prompt injection patterns
         self.injection_patterns = [
@@ -143,6 +159,133 @@ Improved search terms:"""
             # Fallback to sanitized original query if AI improvement fails
             return sanitized_query.lower()
     
+    def should_rewrite(self, sanitized_query: str) -> bool:
+        """
+        Decide whether a query is worth an AI rewrite.
+        
+        Short keyword-like queries ("coding", "high focus") are already good search terms,
+        so rewriting them only adds a network round trip.
+        
+        Args:
+            sanitized_query: The sanitized search query
+            
+        Returns:
+            True if the query reads like natural language, False if it is keyword-like
+        """
+        words = re.findall(r"[\w']+", sanitized_query.lower())
+        if "?" in sanitized_query or len(words) > self.rewrite_max_keyword_words:
+            return True
+        return any(word in QUERY_FILLER_WORDS for word in words)
+
+    @weave.op()
+    async def prepare_search_query(
+        self,
+        query: str,
+        embed: Callable[[str], Awaitable[List[float]]],
+        timer: Optional[StageTimer] = None
+    ) -> Tuple[str, Optional[List[float]]]:
+        """
+        Get the search text and its embedding, rewriting the query only when it helps.
+        
+        Keyword-like queries are embedded directly. For natural-language queries, the
+        sanitized query is embedded while the rewrite is in flight; if the rewrite misses
+        the deadline or doesn't change the query, the raw embedding is used, otherwise
+        the rewrite is embedded.
+        
+        Args:
+            query: The raw search query
+            embed: Coroutine function returning the embedding of a text
+            timer: Optional StageTimer, records "rewrite", "embed" (the sanitized query) and
+                "embed_rewrite" (the rewritten query) stages
+            
+        Returns:
+            Tuple of (search text, its embedding). The embedding is None when the
+            search text is too short to search.
+        """
+        timer = timer or StageTimer()
+
+        async def timed_embed(search_text: str, stage: str = "embed") -> List[float]:
+            with timer.stage(stage):
+                return await embed(search_text)
+
+        # Injection attempts get the same safe, generic search term as improve_search_query
+        if self.detect_prompt_injection(query):
+            return "highfocus", await timed_embed("highfocus")
+
+        sanitized_query = self.sanitize_query(query).lower()
+        if len(sanitized_query) < 2:
+            return sanitized_query, None
+
+        if not self.should_rewrite(sanitized_query):
+            timer.record("rewrite", 0.0, "skipped")
+            return sanitized_query, await timed_embed(sanitized_query)
+
+        # Speculatively embed the raw query while the rewrite is in flight
+        rewrite_started = time.perf_counter()
+        rewrite_task = asyncio.create_task(self.improve_search_query(query))
+        raw_embedding_task = asyncio.create_task(timed_embed(sanitized_query))
+
+        done, _ = await asyncio.wait({rewrite_task}, timeout=self.rewrite_deadline)
+        rewrite_ms = (time.perf_counter() - rewrite_started) * 1000
+        if not done:
+            rewrite_task.cancel()
+            timer.record("rewrite", rewrite_ms, "deadline")
+            return sanitized_query, await raw_embedding_task
+
+        improved_query = rewrite_task.result()
+        if not improved_query or len(improved_query.strip()) < 2 or improved_query == sanitized_query:
+            timer.record("rewrite", rewrite_ms, "unchanged")
+            return sanitized_query, await raw_embedding_task
+
+        timer.record("rewrite", rewrite_ms, "used")
+        raw_embedding_task.cancel()
+        # The raw embedding is discarded, so neither its cancellation nor its failure matters
+        with suppress(asyncio.CancelledError, Exception):
+            await raw_embedding_task
+        return improved_query, await timed_embed(improved_query, "embed_rewrite")
+
+    @weave.op()
+    async def prepare_batch_search_queries(self, queries: List[str], timer: Optional[StageTimer] = None) -> List[str]:
+        """
+        Get the search text for several queries, rewriting those that need it concurrently.
+        
+        Rewrites still running at the deadline are cancelled and their sanitized query is used.
+        
+        Args:
+            queries: The raw search queries
+            timer: Optional StageTimer, records a "rewrite" stage
+            
+        Returns:
+            Search text per query, in order. Too short queries get an empty string.
+        """
+        timer = timer or StageTimer()
+        search_texts = []
+        rewrite_tasks = {}
+        for position, query in enumerate(queries):
+            if self.detect_prompt_injection(query):
+                search_texts.append("highfocus")
+                continue
+            sanitized_query = self.sanitize_query(query).lower()
+            search_texts.append(sanitized_query if len(sanitized_query) >= 2 else "")
+            if len(sanitized_query) >= 2 and self.should_rewrite(sanitized_query):
+                rewrite_tasks[position] = asyncio.create_task(self.improve_search_query(query))
+
+        if not rewrite_tasks:
+            timer.record("rewrite", 0.0, "skipped")
+            return search_texts
+
+        with timer.stage("rewrite"):
+            await asyncio.wait(rewrite_tasks.values(), timeout=self.rewrite_deadline)
+        for position, task in rewrite_tasks.items():
+            if not task.done():
+                task.cancel()
+                timer.describe("rewrite", "deadline")
+                continue
+            improved_query = task.result()
+            if improved_query and len(improved_query.strip()) >= 2:
+                search_texts[position] = improved_query
+        return search_texts
+
     @weave.op()
     def normalize_text_for_embedding(self, text: str) -> str:
         """
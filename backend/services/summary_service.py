@@ -1,37 +1,243 @@
 import os
 import re
-from typing import List, Optional, Union
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple
 import weave
-from openai import AsyncOpenAI
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text, func
+from sqlalchemy import text, func, update, delete, bindparam, cast, extract, Integer
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.sql.elements import TextClause
 from sqlmodel import select
 import numpy as np
 
-from models.models import WeeklySummary, WeeklySummaryPublic
+from config.embeddings import (
+    EMBEDDING_PROFILE, HNSW_CONFIG, get_embedding_column_type, get_hnsw_ef_search,
+    SET_EF_SEARCH, SET_ITERATIVE_SCAN,
+    get_vector_type_name, to_embedding_array
+)
+from models.models import (
+    Task, WeeklySummary, WeeklySummaryPublic, SummarySearchFilters,
+    WEEKLY_SUMMARY_AVG_FOCUS_EXPRESSION, WEEKLY_SUMMARY_TOTAL_HOURS_EXPRESSION
+)
+from services.database import release_connection
+from services.embedding_providers import get_embedding_provider
+from services.vector_index import get_vector_index
+from utils.cache import LRUCache
+from utils.prompt_utils import render_adjacent_week_context
+
+# Search modes supported by the summary search endpoint
+SEARCH_MODES = ("hybrid", "keyword", "vector")
+
+# Seconds a cached summary result is served for. Writes invalidate the caches of the worker
+# process that made them at once, other workers' entries expire after this long.
+SUMMARY_CACHE_TTL_SECONDS = float(os.getenv("SUMMARY_CACHE_TTL_SECONDS", "30"))
+# "Similar weeks" results keyed by (summary_id, limit). Shared by every SummaryService in the
+# process, so embedding changes made through any router invalidate it.
+similar_summaries_cache = LRUCache(
+    maxsize=int(os.getenv("SIMILAR_SUMMARIES_CACHE_SIZE", "512")), ttl=SUMMARY_CACHE_TTL_SECONDS
+)
+# Rendered adjacent week context blocks keyed by (week_start, weeks), shared the same way
+adjacent_context_cache = LRUCache(maxsize=256, ttl=SUMMARY_CACHE_TTL_SECONDS)
+
+# Hot queries, built once with bound parameters. Reusing the same statement objects saves
+# rebuilding them on every request and always produces the same SQL, so SQLAlchemy's compiled
+# cache and asyncpg's per-connection prepared statements are hit.
+# Read paths select only the public columns, never the embedding
+_summaries_table = WeeklySummary.__table__
+PUBLIC_SUMMARY_COLUMNS = tuple(_summaries_table.c[column] for column in WeeklySummaryPublic.model_fields)
+
+GET_SUMMARY_BY_ID = select(*PUBLIC_SUMMARY_COLUMNS).where(_summaries_table.c.id == bindparam("summary_id"))
+DELETE_SUMMARY = (
+    delete(_summaries_table)
+    .where(_summaries_table.c.id == bindparam("summary_id"))
+    .returning(_summaries_table.c.week_start)
+)
+
+# List and count filters, keyed by which of start_date and end_date are given: start_date alone
+# selects that week, end_date alone everything up to it. Both filter week_start, so the count
+# always matches the list and both use the week_start index.
+SUMMARY_DATE_FILTERS = {
+    (False, False): (),
+    (True, True): (
+        WeeklySummary.week_start >= bindparam("start_date"),
+        WeeklySummary.week_start <= bindparam("end_date")
+    ),
+    (True, False): (WeeklySummary.week_start == bindparam("start_date"),),
+    (False, True): (WeeklySummary.week_start <= bindparam("end_date"),),
+}
+
+_LIST_SUMMARIES = (
+    select(*PUBLIC_SUMMARY_COLUMNS)
+    .order_by(_summaries_table.c.week_start.desc())
+    .offset(bindparam("skip"))
+    .limit(bindparam("limit"))
+)
+LIST_SUMMARIES = {key: _LIST_SUMMARIES.where(*clauses) for key, clauses in SUMMARY_DATE_FILTERS.items()}
+
+COUNT_SUMMARIES = select(func.count(WeeklySummary.id))
+COUNT_SUMMARIES_FILTERED = {key: COUNT_SUMMARIES.where(*clauses) for key, clauses in SUMMARY_DATE_FILTERS.items()}
+
+ADJACENT_WEEKS = select(
+    WeeklySummary.week_start,
+    WeeklySummary.week_end,
+    WeeklySummary.summary,
+    WeeklySummary.recommendations
+).where(
+    WeeklySummary.week_start >= bindparam("range_start"),
+    WeeklySummary.week_start <= bindparam("range_end"),
+    WeeklySummary.week_start != bindparam("week_start")
+).order_by(WeeklySummary.week_start)
+
+# One summary per week: writing a week that already has a summary replaces it, so concurrent
+# regenerations or a regeneration racing POST /api/summaries cannot create duplicates
+_insert_summary = insert(_summaries_table)
+UPSERT_SUMMARY = _insert_summary.on_conflict_do_update(
+    index_elements=[_summaries_table.c.week_start],
+    set_={
+        column: _insert_summary.excluded[column]
+        for column in ("week_end", "summary", "stats", "recommendations", "embedding", "updated_at")
+    }
+).returning(*PUBLIC_SUMMARY_COLUMNS)
+
+# Tasks in weeks that have no summary yet. The week starts on Sunday, as in utils.date_utils.get_week_start
+_task_week_start = Task.date_worked - cast(extract("dow", Task.date_worked), Integer)
+TASKS_WITHOUT_SUMMARY = (
+    select(Task)
+    .where(~select(WeeklySummary.id).where(WeeklySummary.week_start == _task_week_start).exists())
+    .order_by(Task.date_worked)
+)
+
+PUBLIC_SUMMARIES_BY_IDS = text("""
+    SELECT id, week_start, week_end, summary, stats, recommendations, created_at, updated_at
+    FROM weekly_summaries
+    WHERE id = ANY(:ids)
+""")
+
+# LEFT JOIN so the target row comes back even without neighbours, telling
+# "not found" apart from "nothing similar" in the same round trip
+SIMILAR_SUMMARIES = text("""
+    SELECT s.id, s.week_start, s.week_end, s.summary, s.stats, s.recommendations,
+           s.created_at, s.updated_at
+    FROM weekly_summaries target
+    LEFT JOIN LATERAL (
+        SELECT ws.id, ws.week_start, ws.week_end, ws.summary, ws.stats, ws.recommendations,
+               ws.created_at, ws.updated_at, ws.embedding <=> target.embedding AS distance
+        FROM weekly_summaries ws
+        WHERE ws.embedding IS NOT NULL AND ws.id <> target.id
+        ORDER BY ws.embedding <=> target.embedding
+        LIMIT :limit
+    ) s ON target.embedding IS NOT NULL
+    WHERE target.id = :summary_id
+    ORDER BY s.distance
+""")
+
+def reciprocal_rank_fusion(result_lists: List[list], limit: int, k: int = 60) -> list:
+    """
+    Merge ranked result lists with reciprocal rank fusion.
+    
+    Each result scores 1 / (k + rank) in every list it appears in, so items ranked well
+    by several searches rise to the top without having to compare their raw scores.
+    
+    Args:
+        result_lists: Ranked lists of summaries (anything with an id)
+        limit: Maximum number of results to return
+        k: Damping constant, 60 is the value from the original RRF paper
+    
+    Returns:
+        Fused list of summaries, best first
+    """
+    scores: Dict[int, float] = {}
+    summaries_by_id = {}
+    for results in result_lists:
+        for rank, summary in enumerate(results, start=1):
+            scores[summary.id] = scores.get(summary.id, 0.0) + 1.0 / (k + rank)
+            summaries_by_id.setdefault(summary.id, summary)
+
+    ranked_ids = sorted(scores, key=lambda summary_id: scores[summary_id], reverse=True)
+    return [summaries_by_id[summary_id] for summary_id in ranked_ids[:limit]]
+
+def build_summary_filter_sql(filters: Optional[SummarySearchFilters]) -> Tuple[str, Dict[str, object]]:
+    """
+    Build the SQL predicates for summary search filters.
+    
+    The stats predicates use the same expressions as their indexes (models/models.py),
+    so Postgres can use them.
+    
+    Returns:
+        Tuple of (" AND ..." clause to append to a WHERE, or "" without filters, bind parameters)
+    """
+    if filters is None:
+        return "", {}
+
+    clauses, params = [], {}
+    if filters.start_date:
+        clauses.append("week_start >= :filter_start_date")
+        params["filter_start_date"] = filters.start_date
+    if filters.end_date:
+        clauses.append("week_start <= :filter_end_date")
+        params["filter_end_date"] = filters.end_date
+    if filters.avg_focus:
+        clauses.append(f"{WEEKLY_SUMMARY_AVG_FOCUS_EXPRESSION} = :filter_avg_focus")
+        params["filter_avg_focus"] = filters.avg_focus.value
+    if filters.min_hours is not None:
+        clauses.append(f"{WEEKLY_SUMMARY_TOTAL_HOURS_EXPRESSION} >= :filter_min_hours")
+        params["filter_min_hours"] = filters.min_hours
+    if filters.max_hours is not None:
+        clauses.append(f"{WEEKLY_SUMMARY_TOTAL_HOURS_EXPRESSION} <= :filter_max_hours")
+        params["filter_max_hours"] = filters.max_hours
+
+    return "".join(f" AND {clause}" for clause in clauses), params
 
 class SummaryService:
     """Service for managing weekly summaries with AI-powered search and embeddings."""
     
     def __init__(self):
-        self.client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+        # Embedding model, dimensions and storage precision, see config/embeddings.py
+        self.embedding_profile = EMBEDDING_PROFILE
+        self.embedding_column_type = get_embedding_column_type(self.embedding_profile)
+        self.embedding_type_name = get_vector_type_name(self.embedding_profile)
+        # OpenAI or local CPU embeddings, selected by EMBEDDING_PROVIDER and shared by the process
+        self.embedding_provider = get_embedding_provider()
+        # Optional in-process index searched instead of Postgres (VECTOR_INDEX_ENABLED)
+        self.vector_index = get_vector_index()
+        # Number of previous and next weeks loaded as context when generating a summary
+        self.context_weeks = int(os.getenv("SUMMARY_CONTEXT_WEEKS", "2"))
+        self.context_cache = adjacent_context_cache
+        self.similar_cache = similar_summaries_cache
+        # Keyword searches with at most this many words and a top rank (0-1) at least this high
+        # are answered from full-text search alone, without an embedding call
+        self.keyword_fast_path_max_words = int(os.getenv("KEYWORD_FAST_PATH_MAX_WORDS", "3"))
+        self.keyword_fast_path_min_rank = float(os.getenv("KEYWORD_FAST_PATH_MIN_RANK", "0.1"))
+        # Two-stage vector search: binary-quantized prefilter for this many candidates, then exact rerank
+        self.two_stage_search = os.getenv("VECTOR_SEARCH_TWO_STAGE", "false").lower() in ("1", "true", "yes")
+        self.binary_prefilter_candidates = int(os.getenv("BINARY_PREFILTER_CANDIDATES", "200"))
+        # Search statements built on first use, see get_search_statement
+        self.search_statements: Dict[tuple, TextClause] = {}
     
-    async def generate_embedding(self, text: str) -> List[float]:
-        """Generate embeddings for the given text using OpenAI's API."""
-        try:
-            # Normalize text for consistent embeddings
-            normalized_text = self.normalize_text_for_embedding(text)
-            
-            response = await self.client.embeddings.create(
-                input=normalized_text,
-                model="text-embedding-3-small"
-            )
-            embedding = response.data[0].embedding
-            return self.ensure_embedding_is_list(embedding)
-        except Exception as e:
-            raise
+    async def generate_embedding(self, text: str) -> np.ndarray:
+        """Generate embeddings for the given text using the configured embedding provider."""
+        embeddings = await self.generate_embeddings([text])
+        return embeddings[0]
+
+    async def generate_embeddings(self, texts: List[str]) -> List[np.ndarray]:
+        """Generate embeddings for several texts in batches, sized by the embedding profile."""
+        # Normalize text for consistent embeddings
+        normalized_texts = [self.normalize_text_for_embedding(text) for text in texts]
+
+        embeddings = await self.embedding_provider.embed(normalized_texts)
+        return [to_embedding_array(embedding) for embedding in embeddings]
+
+    @staticmethod
+    def get_text_to_embed(summary: WeeklySummary) -> str:
+        """Build the text that is embedded for a weekly summary."""
+        return f"""
+        Week {summary.week_start} to {summary.week_end}
+        Summary: {summary.summary}
+        Recommendations: {'; '.join(summary.recommendations or [])}
+        """.strip()
     
-    def normalize_text_for_embedding(self, text: str) -> str:
+    @staticmethod
+    def normalize_text_for_embedding(text: str) -> str:
         """
         Normalize text for consistent embedding generation.
         
@@ -53,33 +259,141 @@ class SummaryService:
         return text
     
     async def create_weekly_summary(self, session: AsyncSession, summary_data: WeeklySummary) -> WeeklySummaryPublic:
-        """Store weekly summary with vector embedding for RAG search."""
-        summary_text_to_embed = f"""
-        Week {summary_data.week_start} to {summary_data.week_end}
-        Summary: {summary_data.summary}
-        Recommendations: {'; '.join(summary_data.recommendations or [])}
-        """.strip()
+        """
+        Store weekly summary with vector embedding for RAG search, replacing any existing summary for the week.
+        
+        The embedding is generated before the session is used, so the write only checks out a
+        connection for the upsert, as long as the caller has released any earlier one.
+        """
+        summary_text_to_embed = self.get_text_to_embed(summary_data)
 
         # Create WeeklySummary, exclude fields that should not be set directly or are auto-generated
-        summary_dict = summary_data.model_dump(exclude={'id', 'created_at', 'updated_at', 'embedding'}, exclude_none=True)
+        # Callers may pass week dates as YYYY-MM-DD strings, converted below
+        summary_dict = summary_data.model_dump(exclude={'id', 'created_at', 'updated_at', 'embedding'}, exclude_none=True, warnings=False)
+        for key in ('week_start', 'week_end'):
+            if isinstance(summary_dict.get(key), str):
+                summary_dict[key] = date.fromisoformat(summary_dict[key])
         db_summary = WeeklySummary(**summary_dict)
         
         # Generate embedding and set it on the WeeklySummary
         embedding = await self.generate_embedding(summary_text_to_embed)
-        db_summary.embedding = self.ensure_embedding_is_list(embedding)
 
-        session.add(db_summary)
+        # Single INSERT ... ON CONFLICT (week_start) DO UPDATE, keeping the original created_at
+        result = await session.execute(UPSERT_SUMMARY, {
+            **db_summary.model_dump(exclude={'id', 'similarity'}),
+            "embedding": embedding
+        })
+        stored_summary = WeeklySummaryPublic(**result.mappings().one())
         await session.commit()
-        await session.refresh(db_summary)
+        self.invalidate_adjacent_week_context(stored_summary.week_start)
+        self.invalidate_similar_summaries()
+        if self.vector_index is not None:
+            await self.vector_index.upsert(session, [stored_summary.id], [embedding], stored_summary.updated_at)
+
+        return stored_summary
+
+    async def get_tasks_without_summary(self, session: AsyncSession) -> List[Task]:
+        """Get the tasks in weeks that have no summary yet, with a single anti-join query."""
+        result = await session.execute(TASKS_WITHOUT_SUMMARY)
+        return list(result.scalars().all())
 
-        return WeeklySummaryPublic.model_validate(db_summary.model_dump())
+    async def get_adjacent_week_context(self, session: AsyncSession, week_start: str, weeks: Optional[int] = None) -> str:
+        """
+        Get the rendered context block of the summaries surrounding a week, for the summary prompt.
+        
+        Loads the previous and next summaries with a single range query on week_start,
+        and caches the rendered block per week.
+        
+        Parameters:
+            session: AsyncSession - The database session
+            week_start: str - The start date (YYYY-MM-DD) of the week being summarized
+            weeks: Optional[int] - Number of weeks before and after to include (default: SUMMARY_CONTEXT_WEEKS)
+        """
+        weeks = self.context_weeks if weeks is None else weeks
+        if weeks <= 0:
+            return ""
+
+        try:
+            week_start_date = date.fromisoformat(week_start)
+        except ValueError:
+            return ""
+
+        cache_key = (week_start_date.isoformat(), weeks)
+        cached_context = self.context_cache.get(cache_key)
+        if cached_context is not None:
+            return cached_context
+
+        result = await session.execute(ADJACENT_WEEKS, {
+            "range_start": week_start_date - timedelta(weeks=weeks),
+            "range_end": week_start_date + timedelta(weeks=weeks),
+            "week_start": week_start_date
+        })
+
+        context_summaries = {"before": [], "after": []}
+        for row in result.all():
+            position = "before" if row.week_start < week_start_date else "after"
+            context_summaries[position].append({
+                "weekRange": f"{row.week_start} to {row.week_end}",
+                "summary": row.summary,
+                "recommendations": row.recommendations or []
+            })
+
+        adjacent_week_context = render_adjacent_week_context(context_summaries)
+        self.context_cache.set(cache_key, adjacent_week_context)
+        return adjacent_week_context
+
+    def invalidate_adjacent_week_context(self, week_start: Optional[str] = None) -> None:
+        """Drop cached context blocks that include the given week, or all of them."""
+        if week_start is None:
+            self.context_cache.clear()
+            return
+        try:
+            changed_week = date.fromisoformat(str(week_start))
+        except ValueError:
+            self.context_cache.clear()
+            return
+
+        self.context_cache.invalidate_where(
+            lambda key: abs((date.fromisoformat(key[0]) - changed_week).days) <= key[1] * 7
+        )
+
+    def invalidate_similar_summaries(self) -> None:
+        """Drop cached "similar weeks" results. Any embedding change can alter any week's neighbours."""
+        self.similar_cache.clear()
+
+    async def get_similar_summaries(
+        self, session: AsyncSession, summary_id: int, limit: int = 5
+    ) -> Optional[List[WeeklySummaryPublic]]:
+        """
+        Find the weeks most similar to a summary, using its stored embedding as the query vector.
+        
+        Makes no embedding call and a single database round trip (the server's default
+        hnsw.ef_search covers the endpoint's limit). Results are cached until embeddings change.
+        
+        Returns:
+            Similar summaries, most similar first, excluding the summary itself.
+            None if the summary does not exist.
+        """
+        cache_key = (summary_id, limit)
+        cached_summaries = self.similar_cache.get(cache_key)
+        if cached_summaries is not None:
+            return cached_summaries
+
+        result = await session.execute(SIMILAR_SUMMARIES, {"summary_id": summary_id, "limit": limit})
+        rows = result.mappings().all()
+        if not rows:
+            return None
+
+        similar_summaries = [WeeklySummaryPublic(**row) for row in rows if row['id'] is not None]
+        self.similar_cache.set(cache_key, similar_summaries)
+        return similar_summaries
 
     async def get_weekly_summaries(
         self, session: AsyncSession,
         skip: int = 0,
         limit: int = 10,
-        start_date: Optional[str] = None,
-        end_date: Optional[str] = None
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
     ) -> List[WeeklySummaryPublic]:
         """Get weekly summaries with optional filtering by date range or search query.
         
@@ -87,110 +401,288 @@ class SummaryService:
             session: AsyncSession - The database session
             skip: int - The number of summaries to skip (default: 0)
             limit: int - The number of summaries to return (default: 10)
-            start_date: Optional[str] - The start date of the summaries (default: None)
-            end_date: Optional[str] - The end date of the summaries (default: None)
+            start_date: Optional[date] - The start date of the summaries (default: None)
+            end_date: Optional[date] - The end date of the summaries (default: None)
         """
 
-        sql_query_stmt = select(WeeklySummary)
-
-        if start_date and end_date:
-            sql_query_stmt = sql_query_stmt.where(
-                WeeklySummary.week_start >= start_date,
-                WeeklySummary.week_start <= end_date
-            )
-        elif start_date:
-            sql_query_stmt = sql_query_stmt.where(WeeklySummary.week_start == start_date)
-        elif end_date: # Added this condition, was missing in original get_weekly_summaries
-            sql_query_stmt = sql_query_stmt.where(WeeklySummary.week_start <= end_date)
-
-        sql_query_stmt = sql_query_stmt.offset(skip).limit(limit).order_by(WeeklySummary.week_start.desc())
-        result = await session.execute(sql_query_stmt)
-        summaries = result.scalars().all()
-        return [WeeklySummaryPublic.model_validate(summary.model_dump()) for summary in summaries]
+        sql_query_stmt = LIST_SUMMARIES[(bool(start_date), bool(end_date))]
+        params = {"skip": skip, "limit": limit, **self.get_date_filter_params(start_date, end_date)}
+        result = await session.execute(sql_query_stmt, params)
+        return [WeeklySummaryPublic(**row) for row in result.mappings().all()]
 
     async def get_weekly_summary_by_id(self, session: AsyncSession, summary_id: int) -> Optional[WeeklySummaryPublic]:
         """Get a weekly summary by ID."""
-        query = select(WeeklySummary).where(WeeklySummary.id == summary_id)
-        result = await session.execute(query)
-        summary = result.scalars().first()
-        return WeeklySummaryPublic.model_validate(summary.model_dump()) if summary else None
+        result = await session.execute(GET_SUMMARY_BY_ID, {"summary_id": summary_id})
+        row = result.mappings().first()
+        return WeeklySummaryPublic(**row) if row else None
 
     # No need for a method to update weekly summaries. It's not done manually!
     # async def update_weekly_summary(self, session: AsyncSession, summary_id: int, summary_data: dict) -> Optional[WeeklySummary]:
 
     async def delete_weekly_summary(self, session: AsyncSession, summary_id: int) -> bool:
         """Delete a weekly summary."""
-        query = select(WeeklySummary).where(WeeklySummary.id == summary_id)
-        result = await session.execute(query)
-        summary = result.scalars().first()
+        result = await session.execute(DELETE_SUMMARY, {"summary_id": summary_id})
+        week_start = result.scalar()
 
-        if not summary:
+        if week_start is None:
             return False
 
-        await session.delete(summary)
         await session.commit()
+        self.invalidate_adjacent_week_context(week_start)
+        self.invalidate_similar_summaries()
+        if self.vector_index is not None:
+            await self.vector_index.remove(session, summary_id)
         return True
 
+    async def reembed_summaries(self, session: AsyncSession, only_missing: bool = True, batch_size: int = 100) -> int:
+        """
+        Regenerate summary embeddings in batches, e.g. after changing the embedding profile.
+        
+        Parameters:
+            session: AsyncSession - The database session
+            only_missing: bool - Only embed summaries without an embedding (default: True)
+            batch_size: int - Number of summaries embedded per OpenAI call and committed together (default: 100)
+        
+        Returns:
+            Number of summaries re-embedded
+        """
+        # Core (table-level) UPDATE so the list of parameters runs as a single executemany
+        summaries_table = WeeklySummary.__table__
+        update_stmt = (
+            update(summaries_table)
+            .where(summaries_table.c.id == bindparam("summary_id"))
+            # Bumping updated_at changes the vector index signature, so other processes rebuild
+            .values(embedding=bindparam("new_embedding"), updated_at=bindparam("new_updated_at"))
+        )
+
+        reembedded = 0
+        last_id = 0
+        while True:
+            # Keyset pagination on id, without loading the existing embeddings
+            query = select(
+                WeeklySummary.id,
+                WeeklySummary.week_start,
+                WeeklySummary.week_end,
+                WeeklySummary.summary,
+                WeeklySummary.recommendations
+            ).where(WeeklySummary.id > last_id)
+            if only_missing:
+                query = query.where(WeeklySummary.embedding.is_(None))
+            query = query.order_by(WeeklySummary.id).limit(batch_size)
+
+            rows = (await session.execute(query)).all()
+            if not rows:
+                break
+            await release_connection(session)
+
+            embeddings = await self.generate_embeddings([self.get_text_to_embed(row) for row in rows])
+            # One timestamp per batch, so the vector index knows the signature its own write produces
+            updated_at = datetime.utcnow()
+            await session.execute(update_stmt, [
+                {"summary_id": row.id, "new_embedding": embedding, "new_updated_at": updated_at}
+                for row, embedding in zip(rows, embeddings)
+            ])
+            await session.commit()
+            self.invalidate_similar_summaries()
+            if self.vector_index is not None:
+                await self.vector_index.upsert(session, [row.id for row in rows], embeddings, updated_at)
+
+            reembedded += len(rows)
+            last_id = rows[-1].id
+
+        return reembedded
+
     async def get_count_of_summaries(self, session: AsyncSession) -> int:
         """Get the count of summaries."""
-        query = select(func.count(WeeklySummary.id)) # Corrected to select(func.count(WeeklySummary.id))
-        result = await session.execute(query)
+        result = await session.execute(COUNT_SUMMARIES)
         count = result.scalar()
         return count if count is not None else 0
 
     async def get_summaries_count(
         self, 
         session: AsyncSession, 
-        start_date: Optional[str] = None, 
-        end_date: Optional[str] = None
+        start_date: Optional[date] = None, 
+        end_date: Optional[date] = None
     ) -> int:
-        """Get total count of summaries matching the filter criteria."""
-        query = select(func.count(WeeklySummary.id))
+        """Get total count of summaries matching the same filters as get_weekly_summaries."""
+        result = await session.execute(
+            COUNT_SUMMARIES_FILTERED[(bool(start_date), bool(end_date))],
+            self.get_date_filter_params(start_date, end_date)
+        )
+        return result.scalar() or 0
+
+    def get_date_filter_params(self, start_date: Optional[date], end_date: Optional[date]) -> Dict[str, date]:
+        """Bind parameters for SUMMARY_DATE_FILTERS."""
+        params = {}
+        if start_date:
+            params["start_date"] = start_date
+        if end_date:
+            params["end_date"] = end_date
+        return params
+
+    def get_search_statement(self, kind: str, filter_sql: str = "", query_count: int = 1) -> TextClause:
+        """
+        Get a search statement, built once per shape and reused.
         
-        if start_date and end_date:
-            query = query.where(
-                WeeklySummary.week_start >= start_date,
-                WeeklySummary.week_end <= end_date
-            )
-        elif start_date:
-            query = query.where(WeeklySummary.week_start == start_date)
+        Filters only add fixed fragments, so the number of shapes is bounded.
+        """
+        key = (kind, filter_sql, query_count)
+        statement = self.search_statements.get(key)
+        if statement is None:
+            statement = self.build_search_statement(kind, filter_sql, query_count)
+            self.search_statements[key] = statement
+        return statement
+
+    def build_search_statement(self, kind: str, filter_sql: str = "", query_count: int = 1) -> TextClause:
+        """
+        Build the SQL for a search.
         
-        result = await session.execute(query)
-        return result.scalar() or 0
+        Kinds:
+        - vector: top-k by cosine distance
+        - filtered: top-k by cosine distance with filters, re-sorted
+        - two_stage: Hamming distance prefilter on binary-quantized embeddings, cosine rerank
+        - batch: top-k per query vector, for query_count query vectors
+        - keyword: full-text search ranked by ts_rank_cd
+        """
+        if kind == "keyword":
+            # Normalization 32 scales rank into 0-1 as rank / (rank + 1)
+            return text(f"""
+                SELECT id, week_start, week_end, summary, stats, recommendations, created_at, updated_at,
+                       ts_rank_cd(search_tsv, query, 32) AS rank
+                FROM weekly_summaries, websearch_to_tsquery('english', :query_text) AS query
+                WHERE search_tsv @@ query{filter_sql}
+                ORDER BY rank DESC
+                LIMIT :limit
+            """)
+
+        if kind == "batch":
+            values_sql = ", ".join(
+                f"({position}, CAST(:embedding_{position} AS {self.embedding_type_name}))"
+                for position in range(query_count)
+            )
+            return text(f"""
+                SELECT q.query_index, s.id, s.week_start, s.week_end, s.summary, s.stats, s.recommendations,
+                       s.created_at, s.updated_at, s.similarity
+                FROM (VALUES {values_sql}) AS q(query_index, embedding)
+                CROSS JOIN LATERAL (
+                    SELECT id, week_start, week_end, summary, stats, recommendations, created_at, updated_at,
+                           1 - (weekly_summaries.embedding <=> q.embedding) AS similarity
+                    FROM weekly_summaries
+                    WHERE weekly_summaries.embedding IS NOT NULL{filter_sql}
+                    ORDER BY weekly_summaries.embedding <=> q.embedding
+                    LIMIT :limit
+                ) s
+                WHERE s.similarity >= :similarity_threshold
+                ORDER BY q.query_index, s.similarity DESC
+            """).bindparams(*[
+                bindparam(f"embedding_{position}", type_=self.embedding_column_type)
+                for position in range(query_count)
+            ])
 
-    def ensure_embedding_is_list(self, embedding: Union[List[float], np.ndarray]) -> List[float]:
-        """Ensure embedding is a list, not numpy array. Postgres can't store numpy arrays."""
-        return list(embedding) if hasattr(embedding, '__iter__') and not isinstance(embedding, str) else embedding
+        if kind == "two_stage":
+            # Stage 1 walks the small bit index, stage 2 reranks only those rows on the full vectors
+            sql_query = text(f"""
+                WITH candidates AS MATERIALIZED (
+                    SELECT id
+                    FROM weekly_summaries
+                    WHERE embedding_bit IS NOT NULL{filter_sql}
+                    ORDER BY embedding_bit <~> binary_quantize(CAST(:embedding AS {self.embedding_type_name}))::bit({self.embedding_profile['dimensions']})
+                    LIMIT :candidates
+                )
+                SELECT ws.id, ws.week_start, ws.week_end, ws.summary, ws.stats, ws.recommendations,
+                       ws.created_at, ws.updated_at, 1 - (ws.embedding <=> :embedding) AS similarity
+                FROM weekly_summaries ws
+                JOIN candidates ON candidates.id = ws.id
+                WHERE (1 - (ws.embedding <=> :embedding)) >= :similarity_threshold
+                ORDER BY ws.embedding <=> :embedding
+                LIMIT :limit
+            """)
+        elif kind == "filtered":
+            # relaxed_order may return candidates slightly out of order, so they are re-sorted
+            sql_query = text(f"""
+                WITH candidates AS MATERIALIZED (
+                    SELECT id, week_start, week_end, summary, stats, recommendations, created_at, updated_at,
+                           embedding <=> :embedding AS distance
+                    FROM weekly_summaries
+                    WHERE embedding IS NOT NULL{filter_sql}
+                    ORDER BY embedding <=> :embedding
+                    LIMIT :limit
+                )
+                SELECT id, week_start, week_end, summary, stats, recommendations, created_at, updated_at,
+                       1 - distance AS similarity
+                FROM candidates
+                WHERE 1 - distance >= :similarity_threshold
+                ORDER BY distance
+            """)
+        elif kind == "vector":
+            # Using pgvector's <=> operator for cosine distance. 1 - cosine_distance = cosine_similarity
+            # The embedding column type and size come from the embedding profile (config/embeddings.py).
+            # ORDER BY the raw distance so Postgres can walk the HNSW index instead of sorting every row.
+            sql_query = text("""
+                SELECT id, week_start, week_end, summary, stats, recommendations, created_at, updated_at,
+                       1 - (embedding <=> :embedding) as similarity
+                FROM weekly_summaries
+                WHERE embedding IS NOT NULL AND (1 - (embedding <=> :embedding)) >= :similarity_threshold
+                ORDER BY embedding <=> :embedding
+                LIMIT :limit
+            """)
+        else:
+            raise ValueError(f"Unknown search statement kind: {kind}")
+        return sql_query.bindparams(bindparam("embedding", type_=self.embedding_column_type))
 
     @weave.op()
     async def vector_search_week_summaries(
         self, session: AsyncSession,
         query_text: str,
         limit: int = 5,
-        similarity_threshold: float = 0
+        similarity_threshold: float = 0,
+        query_embedding: Optional[List[float]] = None,
+        filters: Optional[SummarySearchFilters] = None,
+        two_stage: Optional[bool] = None
     ) -> List[WeeklySummaryPublic]:
-        """Search for similar weeks using vector similarity (RAG requirement)."""
-        query_embedding = await self.generate_embedding(query_text)
-
-        # Using pgvector's <=> operator for cosine distance. 1 - cosine_distance = cosine_similarity
-        # Ensure the 'embedding' column in weekly_summaries is of type VECTOR(embedding_size)
-        # The size should match OpenAI's "text-embedding-3-small" model (1536 dimensions).
-        sql_query = text("""
-            SELECT id, week_start, week_end, summary, stats, recommendations, created_at, updated_at,
-                   1 - (embedding <=> :embedding) as similarity
-            FROM weekly_summaries
-            WHERE embedding IS NOT NULL AND (1 - (embedding <=> :embedding)) >= :similarity_threshold
-            ORDER BY similarity DESC
-            LIMIT :limit
-        """)
-
-        # Convert embedding to proper vector format for pgvector
-        embedding_vector = f"[{','.join(map(str, query_embedding))}]"
+        """
+        Search for similar weeks using vector similarity (RAG requirement).
         
+        Pass query_embedding if it is already known. Filters are applied in the same SQL
+        statement, with an iterative HNSW scan so filtered searches still return a full top-k.
+        With two_stage (default: VECTOR_SEARCH_TWO_STAGE), candidates are found by Hamming
+        distance on the binary-quantized embeddings, then reranked by exact cosine distance.
+        """
+        if query_embedding is None:
+            query_embedding = await self.generate_embedding(query_text)
+
+        filter_sql, filter_params = build_summary_filter_sql(filters)
+        two_stage = self.two_stage_search if two_stage is None else two_stage
+
+        # The in-process index has no stats or dates, filtered searches go to Postgres
+        if self.vector_index is not None and not filter_sql and not two_stage:
+            return await self.search_vector_index(session, query_embedding, limit, similarity_threshold)
+
+        # Size the HNSW candidate list to the number of results wanted, only for this transaction.
+        # The prefilter needs at least as many as it keeps (pgvector allows at most 1000).
+        ef_search = get_hnsw_ef_search(limit)
+        if two_stage:
+            ef_search = min(max(ef_search, self.binary_prefilter_candidates), 1000)
+        await session.execute(SET_EF_SEARCH, {"ef_search": str(ef_search)})
+
+        if filter_sql:
+            # Keep walking the index until enough rows pass the filters (pgvector >= 0.8)
+            await session.execute(SET_ITERATIVE_SCAN, {"iterative_scan": HNSW_CONFIG['iterative_scan']})
+
+        if two_stage:
+            sql_query = self.get_search_statement("two_stage", filter_sql)
+            filter_params["candidates"] = max(self.binary_prefilter_candidates, limit)
+        elif filter_sql:
+            sql_query = self.get_search_statement("filtered", filter_sql)
+        else:
+            sql_query = self.get_search_statement("vector")
+
+        # Sent as a float32 array, encoded in binary by the pgvector asyncpg codec
         result = await session.execute(sql_query, {
-            "embedding": embedding_vector,
+            "embedding": to_embedding_array(query_embedding),
             "similarity_threshold": similarity_threshold,
-            "limit": limit
+            "limit": limit,
+            **filter_params
         })
 
         rows = result.mappings().all() # Use mappings() to get dict-like rows
@@ -210,3 +702,144 @@ class SummaryService:
 
         return summaries
 
+    @weave.op()
+    async def batch_vector_search_week_summaries(
+        self, session: AsyncSession,
+        query_embeddings: List[np.ndarray],
+        limit: int = 5,
+        similarity_threshold: float = 0,
+        filters: Optional[SummarySearchFilters] = None
+    ) -> List[List[WeeklySummaryPublic]]:
+        """
+        Search for similar weeks for several query embeddings with a single SQL statement.
+        
+        Each query embedding is a row of a VALUES list, joined LATERAL to its own top-k
+        index scan, so N queries cost one round trip instead of N.
+        
+        Returns:
+            Summaries per query embedding, in order
+        """
+        if not query_embeddings:
+            return []
+
+        filter_sql, filter_params = build_summary_filter_sql(filters)
+
+        if self.vector_index is not None and not filter_sql:
+            await self.vector_index.ensure_current(session)
+            ranked_ids = [
+                [summary_id for summary_id, _ in self.vector_index.search(embedding, limit=limit, similarity_threshold=similarity_threshold)]
+                for embedding in query_embeddings
+            ]
+            summaries_by_id = await self.get_public_summaries_by_ids(session, {summary_id for ids in ranked_ids for summary_id in ids})
+            return [[summaries_by_id[summary_id] for summary_id in ids if summary_id in summaries_by_id] for ids in ranked_ids]
+
+        await session.execute(SET_EF_SEARCH, {"ef_search": str(get_hnsw_ef_search(limit))})
+        if filter_sql:
+            await session.execute(SET_ITERATIVE_SCAN, {"iterative_scan": HNSW_CONFIG['iterative_scan']})
+
+        sql_query = self.get_search_statement("batch", filter_sql, query_count=len(query_embeddings))
+
+        result = await session.execute(sql_query, {
+            **{f"embedding_{position}": to_embedding_array(embedding) for position, embedding in enumerate(query_embeddings)},
+            "similarity_threshold": similarity_threshold,
+            "limit": limit,
+            **filter_params
+        })
+
+        results: List[List[WeeklySummaryPublic]] = [[] for _ in query_embeddings]
+        for row_data in result.mappings().all():
+            summary_dict = dict(row_data)
+            query_index = summary_dict.pop('query_index')
+            summary_dict.pop('similarity', None)
+            results[query_index].append(WeeklySummaryPublic(**summary_dict))
+        return results
+
+    async def get_public_summaries_by_ids(self, session: AsyncSession, summary_ids) -> Dict[int, WeeklySummaryPublic]:
+        """Load summaries by id, without their embeddings."""
+        if not summary_ids:
+            return {}
+        result = await session.execute(PUBLIC_SUMMARIES_BY_IDS, {"ids": list(summary_ids)})
+        return {row['id']: WeeklySummaryPublic(**row) for row in result.mappings().all()}
+
+    async def search_vector_index(
+        self, session: AsyncSession,
+        query_embedding: List[float],
+        limit: int,
+        similarity_threshold: float
+    ) -> List[WeeklySummaryPublic]:
+        """Rank summaries with the in-process vector index, then load only the matching rows (without embeddings)."""
+        await self.vector_index.ensure_current(session)
+        matches = self.vector_index.search(query_embedding, limit=limit, similarity_threshold=similarity_threshold)
+        if not matches:
+            return []
+
+        ranked_ids = [summary_id for summary_id, _ in matches]
+        summaries_by_id = await self.get_public_summaries_by_ids(session, ranked_ids)
+        # Rows deleted by another process since the last index refresh are skipped
+        return [summaries_by_id[summary_id] for summary_id in ranked_ids if summary_id in summaries_by_id]
+
+    async def keyword_search_week_summaries(
+        self, session: AsyncSession,
+        query_text: str,
+        limit: int = 5,
+        filters: Optional[SummarySearchFilters] = None
+    ) -> Tuple[List[WeeklySummaryPublic], bool]:
+        """
+        Search summaries with Postgres full-text search over summary and recommendations.
+        
+        No embedding is needed, so this answers without any network call.
+        
+        Parameters:
+            session: AsyncSession - The database session
+            query_text: str - The (sanitized) search query
+            limit: int - The number of summaries to return (default: 5)
+            filters: Optional[SummarySearchFilters] - Date, focus and hours filters (default: None)
+        
+        Returns:
+            Tuple of (summaries ranked by full-text relevance, whether the match is confident
+            enough to skip vector search)
+        """
+        filter_sql, filter_params = build_summary_filter_sql(filters)
+
+        sql_query = self.get_search_statement("keyword", filter_sql)
+        result = await session.execute(sql_query, {"query_text": query_text, "limit": limit, **filter_params})
+        rows = result.mappings().all()
+
+        summaries = []
+        for row_data in rows:
+            summary_dict = dict(row_data)
+            summary_dict.pop('rank', None)
+            summaries.append(WeeklySummaryPublic(**summary_dict))
+
+        top_rank = rows[0]['rank'] if rows else 0.0
+        confident = (
+            bool(rows)
+            and len(query_text.split()) <= self.keyword_fast_path_max_words
+            and top_rank >= self.keyword_fast_path_min_rank
+        )
+        return summaries, confident
+
+    @weave.op()
+    async def hybrid_search_week_summaries(
+        self, session: AsyncSession,
+        query_text: str,
+        keyword_results: List[WeeklySummaryPublic],
+        limit: int = 5,
+        similarity_threshold: float = 0,
+        query_embedding: Optional[List[float]] = None,
+        filters: Optional[SummarySearchFilters] = None,
+        two_stage: Optional[bool] = None
+    ) -> List[WeeklySummaryPublic]:
+        """Fuse full-text results with vector search results using reciprocal rank fusion."""
+        vector_results = await self.vector_search_week_summaries(
+            session=session,
+            query_text=query_text,
+            limit=limit,
+            similarity_threshold=similarity_threshold,
+            query_embedding=query_embedding,
+            filters=filters,
+            two_stage=two_stage
+        )
+        if not keyword_results:
+            return vector_results
+        return reciprocal_rank_fusion([keyword_results, vector_results], limit=limit)
@@ -0,0 +1,200 @@
+import os
+import logging
+from datetime import date
+from typing import List, Optional
+import weave
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import text, bindparam, delete
+from sqlalchemy.sql.elements import TextClause
+from sqlalchemy.dialects.postgresql import insert
+
+from config.embeddings import (
+    EMBEDDING_PROFILE, HNSW_CONFIG, SET_EF_SEARCH, SET_ITERATIVE_SCAN,
+    get_embedding_column_type, get_hnsw_ef_search, to_embedding_array
+)
+from models.models import Task, TaskNameEmbedding, TASK_NAME_NORMALIZED_EXPRESSION
+from services.embedding_providers import get_embedding_provider
+from services.database import get_session, release_connection
+
+logger = logging.getLogger(__name__)
+
+
+class TaskSearchService:
+    """Semantic task search over embeddings of distinct task names."""
+
+    def __init__(self):
+        self.embedding_profile = EMBEDDING_PROFILE
+        self.embedding_column_type = get_embedding_column_type(self.embedding_profile)
+        self.embedding_provider = get_embedding_provider()
+        # Distinct names embedded per provider call and committed together
+        self.batch_size = int(os.getenv("TASK_NAME_EMBEDDING_BATCH_SIZE", "256"))
+        # Embed a new task's name in the background when it is created or renamed
+        self.embed_on_create = os.getenv("TASK_NAME_EMBED_ON_CREATE", "true").lower() in ("1", "true", "yes")
+        # Nearest distinct names considered per search, before joining back to tasks
+        self.name_candidates = int(os.getenv("TASK_SEARCH_NAME_CANDIDATES", "20"))
+        # Search statements without and with the date range, built once and reused
+        self.search_statements = {
+            with_dates: self.build_search_statement(with_dates) for with_dates in (False, True)
+        }
+
+    def build_search_statement(self, with_dates: bool) -> TextClause:
+        """
+        Build the task search SQL: nearest distinct names, joined back to their tasks.
+
+        With a date range, only names used by a task in the range are candidates, so names that
+        are nearer but outside the range can't take up the name_candidates slots.
+        """
+        date_filter = "AND tasks.date_worked BETWEEN :start_date AND :end_date" if with_dates else ""
+        name_filter = f"""
+                WHERE EXISTS (
+                    SELECT 1 FROM tasks
+                    WHERE {TASK_NAME_NORMALIZED_EXPRESSION} = task_name_embeddings.normalized_name
+                    {date_filter}
+                )""" if with_dates else ""
+        return text(f"""
+            WITH matched_names AS MATERIALIZED (
+                SELECT normalized_name, 1 - (embedding <=> :embedding) AS similarity
+                FROM task_name_embeddings{name_filter}
+                ORDER BY embedding <=> :embedding
+                LIMIT :name_candidates
+            )
+            SELECT tasks.id, tasks.name, tasks.time_spent, tasks.focus_level, tasks.date_worked,
+                   tasks.created_at, tasks.updated_at
+            FROM matched_names
+            JOIN tasks ON {TASK_NAME_NORMALIZED_EXPRESSION} = matched_names.normalized_name
+            WHERE matched_names.similarity >= :similarity_threshold {date_filter}
+            ORDER BY matched_names.similarity DESC, tasks.date_worked DESC
+            LIMIT :limit
+        """).bindparams(bindparam("embedding", type_=self.embedding_column_type))
+
+    async def embed_missing_task_names(self, session: AsyncSession, names: Optional[List[str]] = None) -> int:
+        """
+        Embed every distinct normalized task name that has no embedding yet, in batches.
+
+        Parameters:
+            session: AsyncSession - The database session
+            names: Optional[List[str]] - Only consider tasks with these raw names (default: all tasks)
+
+        Returns:
+            Number of names embedded
+        """
+        names_filter = "AND name = ANY(:names)" if names is not None else ""
+        # Anti-join, so names that are already embedded never reach the embedding provider
+        result = await session.execute(
+            text(f"""
+                SELECT DISTINCT {TASK_NAME_NORMALIZED_EXPRESSION} AS normalized_name
+                FROM tasks
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM task_name_embeddings
+                    WHERE task_name_embeddings.normalized_name = {TASK_NAME_NORMALIZED_EXPRESSION}
+                ) {names_filter}
+                ORDER BY normalized_name
+            """),
+            {"names": list(names)} if names is not None else {}
+        )
+        missing_names = [name for name in result.scalars().all() if name]
+        await release_connection(session)
+
+        insert_stmt = insert(TaskNameEmbedding.__table__).on_conflict_do_nothing(index_elements=["normalized_name"])
+        for start in range(0, len(missing_names), self.batch_size):
+            batch = missing_names[start:start + self.batch_size]
+            embeddings = await self.embedding_provider.embed(batch)
+            await session.execute(insert_stmt, [
+                {"normalized_name": name, "embedding": to_embedding_array(embedding)}
+                for name, embedding in zip(batch, embeddings)
+            ])
+            await session.commit()
+
+        return len(missing_names)
+
+    async def reembed_task_names(self, session: AsyncSession) -> int:
+        """
+        Embed all distinct task names again and replace every stored name embedding, e.g. after
+        changing EMBEDDING_PROVIDER or the embedding profile, so names are never compared across models.
+
+        All names are embedded before anything is deleted, then the old embeddings are replaced in
+        one transaction: searches keep using the old embeddings until it commits, and a provider
+        failure leaves them untouched.
+
+        Returns:
+            Number of names embedded
+        """
+        result = await session.execute(text(f"""
+            SELECT DISTINCT {TASK_NAME_NORMALIZED_EXPRESSION} AS normalized_name
+            FROM tasks
+            ORDER BY normalized_name
+        """))
+        all_names = [name for name in result.scalars().all() if name]
+        await release_connection(session)
+
+        rows = []
+        for start in range(0, len(all_names), self.batch_size):
+            batch = all_names[start:start + self.batch_size]
+            embeddings = await self.embedding_provider.embed(batch)
+            rows.extend(
+                {"normalized_name": name, "embedding": to_embedding_array(embedding)}
+                for name, embedding in zip(batch, embeddings)
+            )
+
+        insert_stmt = insert(TaskNameEmbedding.__table__)
+        # A name embedded in the background meanwhile gets the new embedding too
+        insert_stmt = insert_stmt.on_conflict_do_update(
+            index_elements=["normalized_name"], set_={"embedding": insert_stmt.excluded.embedding}
+        )
+        await session.execute(delete(TaskNameEmbedding.__table__))
+        for start in range(0, len(rows), self.batch_size):
+            await session.execute(insert_stmt, rows[start:start + self.batch_size])
+        await session.commit()
+
+        # Names of tasks created while re-embedding
+        return len(all_names) + await self.embed_missing_task_names(session=session)
+
+    async def embed_task_names_job(self, names: List[str]) -> None:
+        """Background job that embeds new task names using its own database session."""
+        try:
+            async for db in get_session():
+                await self.embed_missing_task_names(session=db, names=names)
+                break  # Only need first session from the generator
+        except Exception as e:
+            logger.warning("Failed to embed task names: %s", e)
+
+    @weave.op()
+    async def search_tasks(
+        self, session: AsyncSession,
+        query: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        limit: int = 20,
+        similarity_threshold: float = 0.3
+    ) -> List[Task]:
+        """
+        Find tasks whose names are semantically close to the query.
+
+        Vector search runs over distinct names only, then the nearest names are joined
+        back to their tasks, optionally within a date range. Costs one embedding call.
+
+        Returns:
+            Matching tasks, closest names first, most recent first within a name
+        """
+        params = {}
+        if start_date and end_date:
+            params = {"start_date": date.fromisoformat(start_date), "end_date": date.fromisoformat(end_date)}
+        elif start_date or end_date:
+            raise ValueError("Both start_date and end_date must be provided together")
+
+        query_embedding = (await self.embedding_provider.embed([" ".join(query.split()).lower()]))[0]
+
+        await session.execute(SET_EF_SEARCH, {"ef_search": str(get_hnsw_ef_search(self.name_candidates))})
+        if params:
+            # Keep walking the index until enough names have a task in the range (pgvector >= 0.8)
+            await session.execute(SET_ITERATIVE_SCAN, {"iterative_scan": HNSW_CONFIG['iterative_scan']})
+        sql_query = self.search_statements[bool(params)]
+
+        result = await session.execute(sql_query, {
+            "embedding": to_embedding_array(query_embedding),
+            "name_candidates": self.name_candidates,
+            "similarity_threshold": similarity_threshold,
+            "limit": limit,
+            **params
+        })
+        return [Task(**row) for row in result.mappings().all()]
@@ -1,11 +1,24 @@
 from typing import List, Optional
 from datetime import datetime, date, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import func
+from sqlalchemy import func, bindparam
 from sqlmodel import select
 
 from models.models import Task
 
+# Hot queries, built once with bound parameters. Reusing the same statement objects saves
+# rebuilding them on every request and always produces the same SQL, so SQLAlchemy's compiled
+# cache and asyncpg's per-connection prepared statements are hit.
+GET_TASK_BY_ID = select(Task).where(Task.id == bindparam("task_id"))
+
+_IN_DATE_RANGE = (Task.date_worked >= bindparam("start_date"), Task.date_worked <= bindparam("end_date"))
+
+LIST_TASKS = select(Task).order_by(Task.created_at.desc()).limit(bindparam("limit")).offset(bindparam("offset"))
+LIST_TASKS_IN_RANGE = LIST_TASKS.where(*_IN_DATE_RANGE)
+
+COUNT_TASKS = select(func.count(Task.id))
+COUNT_TASKS_IN_RANGE = COUNT_TASKS.where(*_IN_DATE_RANGE)
+
 
 def get_local_today() -> date:
     """Get today's date in local timezone (system timezone)."""
@@ -36,21 +49,18 @@ class TaskService:
         offset: int = 0
     ) -> List[Task]:
         """Get tasks with pagination, optionally filtered by date range."""
-        query = select(Task)
+        params = {"limit": limit, "offset": offset}
         
         if start_date and end_date:
-            start_date_obj = date.fromisoformat(start_date)
-            end_date_obj = date.fromisoformat(end_date)
-            query = query.where(
-                Task.date_worked >= start_date_obj, 
-                Task.date_worked <= end_date_obj
-            )
+            query = LIST_TASKS_IN_RANGE
+            params["start_date"] = date.fromisoformat(start_date)
+            params["end_date"] = date.fromisoformat(end_date)
         elif start_date or end_date:
             raise ValueError("Both start_date and end_date must be provided together")
+        else:
+            query = LIST_TASKS
         
-        query = query.order_by(Task.created_at.desc()).limit(limit).offset(offset)
-        
-        result = await session.execute(query)
+        result = await session.execute(query, params)
         return result.scalars().all()
 
     async def get_tasks_count(
@@ -60,31 +70,25 @@ class TaskService:
         end_date: Optional[str] = None
     ) -> int:
         """Get total count of tasks matching the filter criteria."""
-        query = select(func.count(Task.id))
-        
         if start_date and end_date:
-            start_date_obj = date.fromisoformat(start_date)
-            end_date_obj = date.fromisoformat(end_date)
-            query = query.where(
-                Task.date_worked >= start_date_obj, 
-                Task.date_worked <= end_date_obj
-            )
+            result = await session.execute(COUNT_TASKS_IN_RANGE, {
+                "start_date": date.fromisoformat(start_date),
+                "end_date": date.fromisoformat(end_date)
+            })
         elif start_date or end_date:
             raise ValueError("Both start_date and end_date must be provided together")
-        
-        result = await session.execute(query)
+        else:
+            result = await session.execute(COUNT_TASKS)
         return result.scalar() or 0
 
     async def get_task_by_id(self, session: AsyncSession, task_id: int) -> Optional[Task]:
         """Get a task by ID."""
-        query = select(Task).where(Task.id == task_id)
-        result = await session.execute(query)
+        result = await session.execute(GET_TASK_BY_ID, {"task_id": task_id})
         return result.scalars().first()
 
     async def update_task(self, session: AsyncSession, task_id: int, task_data: dict) -> Optional[Task]:
         """Update a task."""
-        query = select(Task).where(Task.id == task_id)
-        result = await session.execute(query)
+        result = await session.execute(GET_TASK_BY_ID, {"task_id": task_id})
         task = result.scalars().first()
 
         if not task:
@@ -101,8 +105,7 @@ class TaskService:
 
     async def delete_task(self, session: AsyncSession, task_id: int) -> bool:
         """Delete a task."""
-        query = select(Task).where(Task.id == task_id)
-        result = await session.execute(query)
+        result = await session.execute(GET_TASK_BY_ID, {"task_id": task_id})
         task = result.scalars().first()
 
         if not task:
@@ -114,8 +117,7 @@ class TaskService:
 
     async def get_count_of_tasks(self, session: AsyncSession) -> int:
         """Get the count of tasks."""
-        query = select(func.count(Task.id)) # Corrected to select(func.count(Task.id))
-        result = await session.execute(query)
+        result = await session.execute(COUNT_TASKS)
         count = result.scalar()
         return count if count is not None else 0
 
@@ -0,0 +1,291 @@
+import os
+import json
+import time
+import fcntl
+import asyncio
+import tempfile
+from contextlib import contextmanager, suppress
+from datetime import datetime
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlmodel import select
+
+from config.embeddings import EMBEDDING_DIMENSIONS, to_embedding_array
+from models.models import WeeklySummary
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalize each row, leaving zero rows at zero."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
+
+def _signature_to_json(signature: tuple) -> list:
+    """Database signature as a JSON-compatible list, timestamps as ISO strings."""
+    return [value.isoformat() if hasattr(value, "isoformat") else value for value in signature]
+
+def _latest(*values):
+    """Largest of the values that are not None, or None."""
+    return max((value for value in values if value is not None), default=None)
+
+def _not_after(value, limit) -> bool:
+    """Whether a signature value (max id or max updated_at) hasn't grown past the limit."""
+    return value is None or (limit is not None and value <= limit)
+
+def _write_atomically(target: str, write: Callable) -> None:
+    """Write to a temporary file unique to this process in the target's directory, then rename it over the target."""
+    descriptor, temporary = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(target)), prefix=f"{os.path.basename(target)}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(descriptor, "wb") as file:
+            write(file)
+        os.replace(temporary, target)
+    except BaseException:
+        with suppress(FileNotFoundError):
+            os.remove(temporary)
+        raise
+
+class InMemoryVectorIndex:
+    """
+    Exact cosine search over all summary embeddings, held in one contiguous float32 matrix.
+
+    Rows are L2-normalized, so a search is a single matrix-vector product plus an
+    argpartition for the top k. For a corpus of a few thousand summaries this is well
+    under a millisecond and needs no database round trip.
+
+    When a path is given, the matrix and ids are saved as .npy files, with the database
+    signature (embedding count, max id and max updated_at) they match, and memory-mapped on
+    the next start if the signature is unchanged. The index is checked against the database
+    signature at most every refresh_interval seconds and rebuilt if it differs, which also
+    picks up writes made by other processes. Worker processes may share the path: saving and
+    loading hold an exclusive lock on it, so one process's ids are never paired with another's vectors.
+    """
+
+    def __init__(self, dimensions: int, path: Optional[str] = None, refresh_interval: float = 30.0):
+        self.dimensions = dimensions
+        self.path = path
+        self.refresh_interval = refresh_interval
+        self.ids = np.empty(0, dtype=np.int64)
+        self.matrix = np.empty((0, dimensions), dtype=np.float32)
+        self._rows = {}
+        self._signature = None
+        self._checked_at = 0.0
+        self._loaded = False
+        self._lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def _ids_path(self) -> str:
+        return f"{self.path}.ids.npy"
+
+    @property
+    def _vectors_path(self) -> str:
+        return f"{self.path}.vectors.npy"
+
+    @property
+    def _signature_path(self) -> str:
+        return f"{self.path}.signature.json"
+
+    @contextmanager
+    def _file_lock(self):
+        """Hold an exclusive lock on the saved index, shared with every process using the same path."""
+        with open(f"{self.path}.lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _set_contents(self, ids: np.ndarray, matrix: np.ndarray) -> None:
+        self.ids = ids
+        self.matrix = matrix
+        self._rows = {int(summary_id): row for row, summary_id in enumerate(ids)}
+
+    def _load_file(self, signature: tuple) -> bool:
+        """Memory-map a previously saved index, if there is one of the right size saved at this database signature."""
+        paths = (self._ids_path, self._vectors_path, self._signature_path)
+        if not self.path or not all(os.path.exists(path) for path in paths):
+            return False
+        with self._file_lock():
+            if not os.path.exists(self._signature_path):
+                return False
+            with open(self._signature_path) as file:
+                if json.load(file) != _signature_to_json(signature):
+                    return False
+            ids = np.load(self._ids_path)
+            matrix = np.load(self._vectors_path, mmap_mode="r")
+        if matrix.ndim != 2 or matrix.shape[1] != self.dimensions or len(ids) != len(matrix):
+            return False
+        self._set_contents(ids, matrix)
+        return True
+
+    def _save_file(self, signature: tuple) -> None:
+        """Save the index and its database signature atomically, so a crash never leaves a half-written file behind."""
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with self._file_lock():
+            # The signature goes last and is removed first, so it only ever describes complete arrays
+            with suppress(FileNotFoundError):
+                os.remove(self._signature_path)
+            _write_atomically(self._ids_path, lambda file: np.save(file, np.ascontiguousarray(self.ids)))
+            _write_atomically(self._vectors_path, lambda file: np.save(file, np.ascontiguousarray(self.matrix)))
+            _write_atomically(self._signature_path, lambda file: file.write(json.dumps(_signature_to_json(signature)).encode()))
+
+    def _writable(self) -> None:
+        """Copy a memory-mapped matrix into memory before changing it."""
+        if isinstance(self.matrix, np.memmap) or not self.matrix.flags.writeable:
+            self.matrix = np.array(self.matrix, dtype=np.float32)
+
+    async def _get_signature(self, session: AsyncSession) -> tuple:
+        query = select(
+            func.count(WeeklySummary.embedding),
+            func.max(WeeklySummary.id),
+            func.max(WeeklySummary.updated_at)
+        )
+        return tuple((await session.execute(query)).one())
+
+    async def rebuild(self, session: AsyncSession, signature: Optional[tuple] = None) -> None:
+        """Load every stored embedding from the database, as of the given signature (default: the current one)."""
+        if signature is None:
+            signature = await self._get_signature(session)
+        rows = (await session.execute(
+            select(WeeklySummary.id, WeeklySummary.embedding)
+            .where(WeeklySummary.embedding.is_not(None))
+            .order_by(WeeklySummary.id)
+        )).all()
+
+        ids = np.fromiter((row.id for row in rows), dtype=np.int64, count=len(rows))
+        matrix = np.empty((len(rows), self.dimensions), dtype=np.float32)
+        for position, row in enumerate(rows):
+            matrix[position] = to_embedding_array(row.embedding)
+        self._set_contents(ids, _normalize_rows(matrix))
+        self._signature = signature
+        self._save_file(signature)
+
+    async def ensure_current(self, session: AsyncSession) -> None:
+        """Load the index on first use and rebuild it when the database has changed."""
+        if self._loaded and time.monotonic() - self._checked_at < self.refresh_interval:
+            return
+
+        async with self._lock:
+            if self._loaded and time.monotonic() - self._checked_at < self.refresh_interval:
+                return
+            signature = await self._get_signature(session)
+            if not self._loaded and self._load_file(signature):
+                self._signature = signature
+            if signature != self._signature:
+                await self.rebuild(session, signature)
+            self._loaded = True
+            self._checked_at = time.monotonic()
+
+    def mark_stale(self) -> None:
+        """Force a database check before the next search, e.g. after bulk changes."""
+        self._checked_at = 0.0
+        self._signature = None
+
+    async def upsert(self, session: AsyncSession, summary_ids: List[int], embeddings: List, updated_at: datetime) -> None:
+        """Add or replace the embeddings of summaries, after they have been committed with this updated_at."""
+        if not self._loaded:
+            # Loaded in full on first search
+            return
+        added = len(set(summary_ids) - self._rows.keys())
+
+        vectors = _normalize_rows(np.stack([to_embedding_array(embedding) for embedding in embeddings]))
+        self._writable()
+        new_ids, new_rows = [], []
+        for summary_id, vector in zip(summary_ids, vectors):
+            row = self._rows.get(summary_id)
+            if row is None:
+                new_ids.append(summary_id)
+                new_rows.append(vector)
+            else:
+                self.matrix[row] = vector
+
+        if new_ids:
+            self._set_contents(
+                np.concatenate([self.ids, np.asarray(new_ids, dtype=np.int64)]),
+                np.ascontiguousarray(np.vstack([self.matrix, np.stack(new_rows)]))
+            )
+
+        def written_alone(signature: tuple, before: tuple) -> bool:
+            count, max_id, max_updated_at = before
+            return signature == (count + added, _latest(max_id, *summary_ids), _latest(max_updated_at, updated_at))
+        await self._after_write(session, written_alone)
+
+    async def remove(self, session: AsyncSession, summary_id: int) -> None:
+        """Remove a summary's embedding, after the delete has been committed."""
+        row = self._rows.get(summary_id)
+        if row is None:
+            return
+
+        keep = np.ones(len(self.ids), dtype=bool)
+        keep[row] = False
+        self._set_contents(self.ids[keep], np.ascontiguousarray(self.matrix[keep]))
+
+        def removed_alone(signature: tuple, before: tuple) -> bool:
+            count, max_id, max_updated_at = before
+            # The deleted row may have held the max id or updated_at, so those may drop but not grow
+            return signature[0] == count - 1 and _not_after(signature[1], max_id) and _not_after(signature[2], max_updated_at)
+        await self._after_write(session, removed_alone)
+
+    async def _after_write(self, session: AsyncSession, explained_by_write: Callable[[tuple, tuple], bool]) -> None:
+        """
+        Record the new database signature and save the index, so our own write doesn't trigger a rebuild.
+
+        Only if this write alone explains the change from the previous signature: a write committed
+        by another process in between isn't in the index, so then the index is marked stale instead
+        and rebuilt on the next search.
+        """
+        if self._signature is not None:
+            signature = await self._get_signature(session)
+            if explained_by_write(signature, self._signature):
+                self._signature = signature
+                self._save_file(signature)
+                return
+        self.mark_stale()
+
+    def search(self, query_embedding, limit: int, similarity_threshold: float = 0) -> List[Tuple[int, float]]:
+        """
+        Find the most similar summaries.
+
+        Returns:
+            List of (summary id, cosine similarity), most similar first
+        """
+        if len(self) == 0 or limit <= 0:
+            return []
+
+        query = to_embedding_array(query_embedding)
+        query = query / max(float(np.linalg.norm(query)), 1e-12)
+        scores = self.matrix @ query
+
+        if limit < len(scores):
+            top = np.argpartition(-scores, limit - 1)[:limit]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top])]
+
+        return [
+            (int(self.ids[row]), float(scores[row]))
+            for row in top
+            if scores[row] >= similarity_threshold
+        ]
+
+_vector_index: Optional[InMemoryVectorIndex] = None
+
+def get_vector_index() -> Optional[InMemoryVectorIndex]:
+    """Get the process-wide in-memory vector index, or None if VECTOR_INDEX_ENABLED is off."""
+    global _vector_index
+    if os.getenv("VECTOR_INDEX_ENABLED", "false").lower() not in ("1", "true", "yes"):
+        return None
+    if _vector_index is None:
+        _vector_index = InMemoryVectorIndex(
+            dimensions=EMBEDDING_DIMENSIONS,
+            path=os.getenv("VECTOR_INDEX_PATH") or None,
+            refresh_interval=float(os.getenv("VECTOR_INDEX_REFRESH_SECONDS", "30"))
+        )
+    return _vector_index
@@ -14,6 +14,8 @@ from sqlalchemy.orm import sessionmaker
 
 # Set testing environment variable to disable Weave during testing
 os.environ["TESTING"] = "1"
+# Don't embed task names in the background after creating tasks
+os.environ["TASK_NAME_EMBED_ON_CREATE"] = "false"
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
@@ -28,12 +30,15 @@ def pytest_configure(config):
     warnings.filterwarnings("ignore", message=".*sentry_sdk.Hub.*")
     warnings.filterwarnings("ignore", message=".*warn.*method.*deprecated.*")
 
-from main import app
-from services.database import get_session
+from main import app, init_services
+from services.database import get_session, get_read_session, register_vector_codec
 from models.models import Task, FocusLevel, WeeklySummary, WeeklyStats, SummaryResponse
 from sqlmodel import SQLModel
 from config.database import get_database_config
 
+# ASGITransport does not run the app lifespan, so create the routers' services here
+init_services()
+
 def get_test_database_url():
     """Get test database URL by appending _test to the database name."""
     config = get_database_config()
@@ -51,6 +56,7 @@ test_engine = create_async_engine(
     },
     pool_pre_ping=True
 )
+register_vector_codec(test_engine)
 
 # Test session factory
 TestSessionLocal = sessionmaker(
@@ -88,6 +94,7 @@ async def test_db():
             yield session
         
         app.dependency_overrides[get_session] = override_get_session
+        app.dependency_overrides[get_read_session] = override_get_session
         
         try:
             # Yield session to the test
@@ -221,6 +228,7 @@ async def test_db_session():
     # Create async engine for test database
     test_url = f"postgresql+asyncpg://{config['user']}:{config['password']}@{config['host']}:{config['port']}/{test_db_name}"
     engine = create_async_engine(test_url, echo=False)
+    register_vector_codec(engine)
     
     try:
         # Create all tables
@@ -0,0 +1,105 @@
+import asyncio
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+from sqlalchemy.dialects import postgresql
+
+from models.models import AdminJob
+from services.admin_job_service import AdminJobService
+
+
+@pytest.fixture
+def admin_job_service():
+    return AdminJobService(heartbeat_seconds=0.01, stale_seconds=60)
+
+
+class TestAdminJobService:
+    """Test cases for admin background job state shared by worker processes."""
+
+    @pytest.mark.asyncio
+    async def test_claim_is_one_conditional_upsert(self, admin_job_service):
+        """Test a job is claimed with one upsert that skips a running job unless its heartbeat is stale."""
+        mock_session = AsyncMock()
+        mock_result = MagicMock()
+        started_at = datetime.utcnow()
+        mock_result.scalar.side_effect = [started_at, None]
+        mock_session.execute = AsyncMock(return_value=mock_result)
+
+        assert await admin_job_service.claim(mock_session, "generate-sample-data", {"scale": 1}) == started_at
+        assert await admin_job_service.claim(mock_session, "generate-sample-data", {"scale": 1}) is None
+
+        sql = str(mock_session.execute.call_args[0][0].compile(dialect=postgresql.dialect()))
+        assert "ON CONFLICT (name) DO UPDATE" in sql
+        assert "WHERE admin_jobs.status != %(status_1)s OR admin_jobs.updated_at < %(updated_at_1)s" in sql
+        assert "RETURNING admin_jobs.started_at" in sql
+        assert mock_session.commit.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_stale_run_cannot_overwrite_newer_run(self, admin_job_service):
+        """Test progress and the final status only update the row of the run that claimed it."""
+        started_at = datetime.utcnow()
+        mock_session = AsyncMock()
+        mock_session.execute = AsyncMock(return_value=MagicMock(rowcount=0))
+
+        assert not await admin_job_service.finish(mock_session, "generate-sample-data", started_at, "succeeded", {}, {})
+        assert not await admin_job_service.save_progress(mock_session, "generate-sample-data", started_at, {})
+
+        for call in mock_session.execute.call_args_list:
+            sql = str(call[0][0].compile(dialect=postgresql.dialect()))
+            assert "WHERE admin_jobs.name = %(name_1)s AND admin_jobs.started_at = %(started_at_1)s" in sql
+
+    @pytest.mark.asyncio
+    async def test_running_job_without_heartbeat_is_interrupted(self, admin_job_service):
+        """Test status reports a running job whose worker stopped saving progress as interrupted."""
+        now = datetime.utcnow()
+        job = AdminJob(
+            name="generate-sample-data", status="running", details={"scale": 1}, progress={"stage": "copying"},
+            started_at=now - timedelta(minutes=5), updated_at=now - timedelta(seconds=61)
+        )
+        mock_session = AsyncMock()
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.first.return_value = job
+        mock_session.execute = AsyncMock(return_value=mock_result)
+
+        status = await admin_job_service.get(mock_session, "generate-sample-data")
+        assert status["status"] == "interrupted"
+        assert status["scale"] == 1 and status["progress"] == {"stage": "copying"}
+
+        job.updated_at = now
+        assert (await admin_job_service.get(mock_session, "generate-sample-data"))["status"] == "running"
+
+        mock_result.scalars.return_value.first.return_value = None
+        assert await admin_job_service.get(mock_session, "generate-sample-data") is None
+
+    @pytest.mark.asyncio
+    async def test_keep_alive_saves_progress_until_stopped(self, admin_job_service):
+        """Test the heartbeat saves progress periodically and returns once the job stops it."""
+        stopped = asyncio.Event()
+        with patch.object(admin_job_service, 'save_progress', new_callable=AsyncMock) as save_progress, \
+             patch("services.admin_job_service.get_session") as get_session:
+            get_session.side_effect = lambda: _sessions()
+            heartbeat = asyncio.create_task(admin_job_service.keep_alive(
+                "generate-sample-data", datetime.utcnow(), lambda: {"stage": "embedding"}, stopped
+            ))
+            await asyncio.sleep(0.05)
+            stopped.set()
+            await asyncio.wait_for(heartbeat, timeout=1)
+
+        assert save_progress.await_count >= 2
+        assert save_progress.await_args.kwargs["progress"] == {"stage": "embedding"}
+
+    @pytest.mark.asyncio
+    async def test_keep_alive_stops_once_another_run_claimed_the_job(self, admin_job_service):
+        """Test the heartbeat of a run that was taken over returns without being stopped."""
+        with patch.object(admin_job_service, 'save_progress', new_callable=AsyncMock, return_value=False) as save_progress, \
+             patch("services.admin_job_service.get_session") as get_session:
+            get_session.side_effect = lambda: _sessions()
+            await asyncio.wait_for(
+                admin_job_service.keep_alive("generate-sample-data", datetime.utcnow(), dict, asyncio.Event()), timeout=1
+            )
+
+        save_progress.assert_awaited_once()
+
+
+async def _sessions():
+    yield AsyncMock()
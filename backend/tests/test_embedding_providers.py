@@ -0,0 +1,72 @@
+import pytest
+import numpy as np
+
+from services.embedding_providers import (
+    HASHING_MODEL, EmbeddingProvider, LocalEmbeddingProvider, close_embedding_provider, encode_batch, get_embedding_provider
+)
+from services.summary_service import SummaryService
+from services.task_search_service import TaskSearchService
+
+
+class TestLocalEmbeddingProvider:
+    """Test cases for the local CPU embedding provider."""
+
+    def test_hashing_embeddings_are_normalized_and_deterministic(self):
+        """Test hashing embeddings have the requested size, unit length and do not vary between calls."""
+        texts = ["deep work on the api refactoring", "planning meeting with the team"]
+
+        first = encode_batch(texts, HASHING_MODEL, 256)
+        second = encode_batch(texts, HASHING_MODEL, 256)
+
+        assert first.shape == (2, 256)
+        assert np.allclose(np.linalg.norm(first, axis=1), 1.0)
+        assert np.array_equal(first, second)
+
+    def test_hashing_embeddings_rank_overlapping_texts_closer(self):
+        """Test texts sharing words are more similar than unrelated texts."""
+        query, related, unrelated = encode_batch(
+            ["api refactoring", "refactoring the api layer", "team lunch and planning"], HASHING_MODEL, 256
+        )
+
+        assert query @ related > query @ unrelated
+
+    @pytest.mark.asyncio
+    async def test_embed_in_process_pool_keeps_order(self):
+        """Test batches embedded in worker processes come back in input order."""
+        texts = [f"task number {index}" for index in range(7)]
+        provider = LocalEmbeddingProvider(HASHING_MODEL, dimensions=64, batch_size=3, max_workers=2)
+        try:
+            embeddings = await provider.embed(texts)
+        finally:
+            provider.close()
+
+        assert len(embeddings) == 7
+        assert np.allclose(embeddings, encode_batch(texts, HASHING_MODEL, 64))
+
+
+def test_services_share_one_provider_per_process():
+    """Test every service uses the same provider, and closing it releases it for the next one."""
+    with pytest.raises(TypeError):
+        EmbeddingProvider(dimensions=64, batch_size=8)
+
+    provider = get_embedding_provider()
+    assert SummaryService().embedding_provider is provider
+    assert TaskSearchService().embedding_provider is provider
+
+    close_embedding_provider()
+    assert get_embedding_provider() is not provider
+
+
+def test_migrations_reject_profile_that_differs_from_stored_column():
+    """Test migrations size columns from the stored embedding column and fail when the profile disagrees with it."""
+    from unittest.mock import MagicMock
+    from config.embeddings import get_stored_embedding_profile
+
+    profile = {'dimensions': 512, 'precision': "float16"}
+    connection = MagicMock()
+    connection.execute.return_value.scalar.return_value = "halfvec(512)"
+    assert get_stored_embedding_profile(connection, profile) is profile
+
+    connection.execute.return_value.scalar.return_value = "vector(1536)"
+    with pytest.raises(ValueError, match="weekly_summaries.embedding is vector\\(1536\\)"):
+        get_stored_embedding_profile(connection, profile)
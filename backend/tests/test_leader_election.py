@@ -0,0 +1,70 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+
+from services.leader_election import LeaderElection
+from tests.conftest import get_test_database_url
+
+
+@pytest.mark.asyncio
+async def test_one_leader_and_takeover_when_it_stops():
+    """Test only one worker leads and runs the startup jobs, and a follower takes over when the leader stops."""
+    elected = []
+
+    def make_election(name: str) -> LeaderElection:
+        async def on_elected():
+            elected.append(name)
+        return LeaderElection(on_elected=on_elected, database_url=get_test_database_url(), retry_seconds=0.05)
+
+    first, second = make_election("first"), make_election("second")
+    try:
+        first.start()
+        await asyncio.sleep(0.3)
+        second.start()
+        await asyncio.sleep(0.3)
+
+        assert first.is_leader and not second.is_leader
+        assert elected == ["first"]
+
+        await first.stop()
+        await asyncio.sleep(0.3)
+
+        assert second.is_leader
+        assert elected == ["first", "second"]
+    finally:
+        await first.stop()
+        await second.stop()
+
+
+@pytest.mark.asyncio
+async def test_lost_leadership_cancels_jobs_before_releasing():
+    """Test a leader whose lock connection fails stops its jobs before giving up the lock."""
+    jobs_cancelled = asyncio.Event()
+
+    async def on_elected():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            jobs_cancelled.set()
+            raise
+
+    election = LeaderElection(on_elected=on_elected, database_url=get_test_database_url(), retry_seconds=10)
+    election.is_leader = True
+    election._connection = AsyncMock()
+    election._connection.execute.side_effect = ConnectionError("connection reset")
+    election._jobs_task = asyncio.get_running_loop().create_task(election._run_jobs())
+    await asyncio.sleep(0)
+
+    async def release():
+        assert jobs_cancelled.is_set()
+        election.is_leader = False
+    election.release = release
+
+    run = asyncio.get_running_loop().create_task(election._run())
+    try:
+        await asyncio.wait_for(jobs_cancelled.wait(), timeout=1)
+        await asyncio.sleep(0)
+        assert not election.is_leader and election._jobs_task is None
+    finally:
+        run.cancel()
+        await election.engine.dispose()
@@ -0,0 +1,56 @@
+import io
+import json
+import logging
+import pytest
+
+from utils.logging_utils import PayloadSampler, configure_logging, parse_log_levels, stop_logging
+
+
+@pytest.fixture
+def log_stream():
+    """Configure queued JSON logging into a buffer, then restore the root logger."""
+    root = logging.getLogger()
+    handlers, level = list(root.handlers), root.level
+    stream = io.StringIO()
+    configure_logging(level="INFO", levels="tests.noisy=WARNING", log_format="json", stream=stream)
+    try:
+        yield stream
+    finally:
+        stop_logging()
+        root.handlers[:] = handlers
+        root.setLevel(level)
+        logging.getLogger("tests.noisy").setLevel(logging.NOTSET)
+
+
+def test_records_written_as_json_by_listener(log_stream):
+    """Test records go through the queue as JSON lines, with extra fields, tracebacks and per-logger levels."""
+    logger = logging.getLogger("tests.app")
+    logger.info("Summary prompt for week %s", "2024-01-07", extra={"prompt": "x" * 5000})
+    try:
+        raise RuntimeError("boom")
+    except RuntimeError:
+        logger.exception("Summary generation failed")
+    logging.getLogger("tests.noisy").info("dropped below the logger's level")
+    stop_logging()
+
+    entries = [json.loads(line) for line in log_stream.getvalue().splitlines()]
+    assert [entry["message"] for entry in entries] == ["Summary prompt for week 2024-01-07", "Summary generation failed"]
+    assert entries[0]["logger"] == "tests.app" and entries[0]["level"] == "INFO"
+    assert len(entries[0]["prompt"]) == 5000
+    assert "RuntimeError: boom" in entries[1]["exception"]
+
+
+def test_payload_sampler_logs_one_in_n():
+    """Test the sampler picks the first call and then one in every N, and never when N is 0."""
+    sampler = PayloadSampler(every=3)
+    assert [sampler.should_log() for _ in range(7)] == [True, False, False, True, False, False, True]
+    assert not any(PayloadSampler(every=0).should_log() for _ in range(5))
+
+
+def test_parse_log_levels():
+    """Test per-logger levels are parsed and malformed entries rejected."""
+    assert parse_log_levels("services.ai_service=debug, sqlalchemy.engine=WARNING,") == {
+        "services.ai_service": "DEBUG", "sqlalchemy.engine": "WARNING"
+    }
+    with pytest.raises(ValueError):
+        parse_log_levels("services.ai_service")
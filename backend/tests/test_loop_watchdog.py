@@ -0,0 +1,42 @@
+import time
+import asyncio
+import pytest
+from datetime import date
+
+from scripts.seed_engine import SeedProgress, seed
+from utils.loop_watchdog import LoopWatchdog
+
+
+class TestLoopWatchdog:
+    """Test cases for the event loop lag watchdog."""
+
+    @pytest.mark.asyncio
+    async def test_blocking_callback_counted_with_location(self):
+        """Test a callback that blocks the event loop is counted, with where it was stuck."""
+        watchdog = LoopWatchdog(threshold_ms=40, interval_ms=10)
+        watchdog.start()
+        await asyncio.sleep(0.05)
+        time.sleep(0.2)  # blocks the event loop
+        await asyncio.sleep(0.05)
+        await watchdog.stop()
+
+        assert watchdog.stalls == 1
+        stall = watchdog.recent_stalls[0]
+        assert stall["lag_ms"] > 100
+        assert "test_loop_watchdog.py" in stall["location"]
+        assert watchdog.snapshot()["lag"]["count"] > 1
+        assert not watchdog.running
+
+    @pytest.mark.asyncio
+    async def test_offline_seed_does_not_block_event_loop(self):
+        """Test generating a large offline data set leaves the event loop responsive."""
+        watchdog = LoopWatchdog(threshold_ms=250, interval_ms=10)
+        progress = SeedProgress()
+        watchdog.start()
+        result = await seed(engine=None, scale=500, offline=True, reference_date=date(2024, 3, 13), progress=progress)
+        await watchdog.stop()
+
+        assert watchdog.stalls == 0
+        assert progress.stage == "done"
+        assert progress.tasks_total == result["tasks_created"]
+        assert progress.summaries_written == progress.summaries_total == result["summaries_created"]
@@ -0,0 +1,61 @@
+import pytest
+from datetime import date
+
+from models.models import Task, FocusLevel
+from utils.prompt_utils import compact_task_summary, estimate_tokens, group_tasks, render_task_lines
+
+
+def make_task(name: str, hours: float, focus: FocusLevel = FocusLevel.medium) -> Task:
+    return Task(name=name, time_spent=hours, focus_level=focus, date_worked=date(2024, 3, 5))
+
+
+class TestPromptCompaction:
+    """Test cases for summary prompt compaction."""
+
+    def test_estimate_tokens(self):
+        """Test token estimate is roughly 4 characters per token."""
+        assert estimate_tokens("") == 0
+        assert estimate_tokens("abcd") == 1
+        assert estimate_tokens("abcde") == 2
+
+    def test_group_tasks_by_name_and_focus(self):
+        """Test repeated tasks are grouped with counts and total hours."""
+        tasks = [
+            make_task("Team standup meeting", 0.25),
+            make_task("team  standup meeting", 0.5),
+            make_task("Team standup meeting", 0.5, FocusLevel.low),
+            make_task("Backend API implementation", 4, FocusLevel.high),
+        ]
+
+        groups = group_tasks(tasks)
+
+        assert len(groups) == 3
+        # Most hours first
+        assert groups[0]["name"] == "Backend API implementation"
+        standup = next(g for g in groups if g["focus"] == "medium")
+        assert standup["count"] == 2
+        assert standup["hours"] == 0.75
+
+    def test_compact_task_summary_without_budget_pressure(self):
+        """Test single tasks keep the original line format and repeats are grouped."""
+        tasks = [make_task("Team standup meeting", 0.5) for _ in range(5)] + [make_task("Code review", 2, FocusLevel.high)]
+
+        task_summary = compact_task_summary(tasks, token_budget=1000)
+
+        assert task_summary.splitlines() == [
+            "- Team standup meeting x5 (2.5h total, medium focus)",
+            "- Code review (2h, high focus)",
+        ]
+
+    def test_compact_task_summary_respects_budget(self):
+        """Test heavy weeks are folded into an 'other' line within the token budget."""
+        tasks = [make_task(f"Distinct task number {i}", 1 + i / 100) for i in range(300)]
+        budget = 200
+
+        task_summary = compact_task_summary(tasks, token_budget=budget)
+
+        assert estimate_tokens(task_summary) <= budget
+        assert estimate_tokens(task_summary) < estimate_tokens(render_task_lines(tasks))
+        # Most significant task is kept, the rest are merged into one line
+        assert "Distinct task number 299" in task_summary
+        assert "other smaller tasks" in task_summary.splitlines()[-1]
@@ -18,7 +18,9 @@ def test_rag_search_via_summaries_endpoint(client):
         WeeklySummary(id=2, week_start="2024-01-15", week_end="2024-01-21", summary="Relevant week 2", stats={}, recommendations=[])
     ]
 
-    with patch('services.summary_service.SummaryService.vector_search_week_summaries', new_callable=AsyncMock) as mock_search:
+    with patch('services.summary_service.SummaryService.generate_embedding', new_callable=AsyncMock, return_value=[0.1] * 1536), \
+         patch('services.summary_service.SummaryService.keyword_search_week_summaries', new_callable=AsyncMock, return_value=([], False)), \
+         patch('services.summary_service.SummaryService.vector_search_week_summaries', new_callable=AsyncMock) as mock_search:
         mock_search.return_value = mock_search_results
 
         search_query = "how to improve productivity"
@@ -38,7 +40,9 @@ def test_rag_search_no_results(client):
     """
     Test RAG search via GET /api/summaries/search when no results are found.
     """
-    with patch('services.summary_service.SummaryService.vector_search_week_summaries', new_callable=AsyncMock) as mock_search:
+    with patch('services.summary_service.SummaryService.generate_embedding', new_callable=AsyncMock, return_value=[0.1] * 1536), \
+         patch('services.summary_service.SummaryService.keyword_search_week_summaries', new_callable=AsyncMock, return_value=([], False)), \
+         patch('services.summary_service.SummaryService.vector_search_week_summaries', new_callable=AsyncMock) as mock_search:
         mock_search.return_value = [] # No results found
         
         search_query = "obscure query with no matches"
@@ -53,7 +57,9 @@ def test_rag_search_error_handling(client):
     """
     Test RAG search error handling when search service fails.
     """
-    with patch('services.summary_service.SummaryService.vector_search_week_summaries', new_callable=AsyncMock) as mock_search:
+    with patch('services.summary_service.SummaryService.generate_embedding', new_callable=AsyncMock, return_value=[0.1] * 1536), \
+         patch('services.summary_service.SummaryService.keyword_search_week_summaries', new_callable=AsyncMock, return_value=([], False)), \
+         patch('services.summary_service.SummaryService.vector_search_week_summaries', new_callable=AsyncMock) as mock_search:
         mock_search.side_effect = Exception("Database connection failed")
         
         search_query = "test query"
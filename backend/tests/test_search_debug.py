@@ -14,7 +14,9 @@ async def test_search_with_simple_queries(test_client):
         break
     
     # Mock the search service to return expected results
-    with patch('services.summary_service.SummaryService.vector_search_week_summaries', new_callable=AsyncMock) as mock_search:
+    with patch('services.summary_service.SummaryService.generate_embedding', new_callable=AsyncMock, return_value=[0.1] * 1536), \
+         patch('services.summary_service.SummaryService.keyword_search_week_summaries', new_callable=AsyncMock, return_value=([], False)), \
+         patch('services.summary_service.SummaryService.vector_search_week_summaries', new_callable=AsyncMock) as mock_search:
         # Mock search results
         mock_search.return_value = []
         
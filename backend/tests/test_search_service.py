@@ -0,0 +1,100 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, patch
+
+from services.search_service import SearchService
+from utils.timing import StageTimer
+
+
+class TestSearchService:
+    """Test cases for SearchService query rewriting."""
+
+    @pytest.fixture
+    def search_service(self):
+        """Create a SearchService instance for testing."""
+        return SearchService()
+
+    def test_should_rewrite_only_natural_language_queries(self, search_service):
+        """Test keyword-like queries skip the rewrite and natural-language queries don't."""
+        assert not search_service.should_rewrite("coding")
+        assert not search_service.should_rewrite("high focus testing")
+        assert search_service.should_rewrite("show me weeks when i was stressed")
+        assert search_service.should_rewrite("machine learning projects?")
+        assert search_service.should_rewrite("deep work on backend refactoring")
+
+    @pytest.mark.asyncio
+    async def test_keyword_query_is_embedded_without_rewrite(self, search_service):
+        """Test a keyword-like query makes no AI call."""
+        embed = AsyncMock(return_value=[0.1, 0.2])
+        timer = StageTimer()
+
+        with patch.object(search_service, 'improve_search_query', new_callable=AsyncMock) as mock_improve:
+            search_text, embedding = await search_service.prepare_search_query("Coding", embed, timer)
+
+        assert (search_text, embedding) == ("coding", [0.1, 0.2])
+        mock_improve.assert_not_called()
+        embed.assert_called_once_with("coding")
+        assert 'rewrite;desc="skipped"' in timer.server_timing_header()
+
+    @pytest.mark.asyncio
+    async def test_rewrite_embedding_used_when_rewrite_is_on_time(self, search_service):
+        """Test the rewritten query's embedding is used when the rewrite returns before the deadline."""
+        embed = AsyncMock(side_effect=lambda text: [len(text)])
+        timer = StageTimer()
+
+        with patch.object(search_service, 'improve_search_query', new_callable=AsyncMock, return_value="stressed"):
+            search_text, embedding = await search_service.prepare_search_query("show me weeks when I was stressed", embed, timer)
+
+        assert (search_text, embedding) == ("stressed", [8])
+        assert "embed_rewrite" in timer.stages
+
+    @pytest.mark.asyncio
+    async def test_failed_raw_embedding_ignored_when_rewrite_is_used(self, search_service):
+        """Test the discarded raw embedding task is awaited, so its failure neither surfaces nor goes unretrieved."""
+        async def embed(text):
+            if text != "stressed":
+                raise RuntimeError("embedding service unavailable")
+            return [1.0]
+
+        with patch.object(search_service, 'improve_search_query', new_callable=AsyncMock, return_value="stressed"):
+            search_text, embedding = await search_service.prepare_search_query("show me weeks when I was stressed", embed)
+
+        assert (search_text, embedding) == ("stressed", [1.0])
+
+    @pytest.mark.asyncio
+    async def test_raw_embedding_used_when_rewrite_misses_deadline(self, search_service):
+        """Test the speculative raw embedding is used when the rewrite is too slow."""
+        search_service.rewrite_deadline = 0.01
+        embed = AsyncMock(return_value=[0.5])
+        timer = StageTimer()
+
+        async def slow_rewrite(query):
+            await asyncio.sleep(1)
+            return "never used"
+
+        with patch.object(search_service, 'improve_search_query', side_effect=slow_rewrite):
+            search_text, embedding = await search_service.prepare_search_query("show me weeks when I was stressed", embed, timer)
+
+        assert (search_text, embedding) == ("show me weeks when i was stressed", [0.5])
+        embed.assert_called_once_with("show me weeks when i was stressed")
+        assert 'rewrite;desc="deadline"' in timer.server_timing_header()
+
+    @pytest.mark.asyncio
+    async def test_batch_queries_rewritten_concurrently(self, search_service):
+        """Test batch queries are rewritten together and slow rewrites fall back to the sanitized query."""
+        search_service.rewrite_deadline = 0.05
+        timer = StageTimer()
+
+        async def rewrite(query):
+            if "slow" in query:
+                await asyncio.sleep(1)
+            return "stressed"
+
+        with patch.object(search_service, 'improve_search_query', side_effect=rewrite) as mock_improve:
+            search_texts = await search_service.prepare_batch_search_queries(
+                ["Coding", "show me weeks when I was stressed", "a slow natural language query", "!"], timer
+            )
+
+        assert search_texts == ["coding", "stressed", "a slow natural language query", ""]
+        assert mock_improve.call_count == 2
+        assert 'rewrite;desc="deadline"' in timer.server_timing_header()
@@ -0,0 +1,52 @@
+import pytest
+import numpy as np
+from datetime import date
+
+from scripts.seed_engine import get_volume, generate_tasks, summarize_weeks, seed
+from utils.date_utils import get_week_start
+
+REFERENCE_DATE = date(2024, 3, 13)
+
+
+class TestSeedEngine:
+    """Test cases for the bulk seed data generator."""
+
+    def test_same_seed_generates_same_tasks(self):
+        """Test generation is deterministic for a seed and changes with it."""
+        first = generate_tasks(np.random.default_rng(7), REFERENCE_DATE, 60, 1)
+        second = generate_tasks(np.random.default_rng(7), REFERENCE_DATE, 60, 1)
+        other = generate_tasks(np.random.default_rng(8), REFERENCE_DATE, 60, 1)
+
+        assert all(np.array_equal(first[key], second[key]) for key in first)
+        assert not np.array_equal(first["templates"], other["templates"])
+        assert first["templates"][:3].tolist() == [0, 1, 2]
+        assert first["ordinals"].max() == REFERENCE_DATE.toordinal()
+
+    def test_scale_extends_range_then_density(self):
+        """Test scale grows the date range up to max_years before adding tasks per day."""
+        assert get_volume(1, 10) == (60, 1)
+        assert get_volume(10, 10) == (600, 1)
+        days, density = get_volume(10000, 10)
+        assert days == 3650 and density == 164
+
+    def test_week_stats_match_tasks_and_skip_current_week(self):
+        """Test weekly stats add up the week's tasks and the reference date's week is not summarized."""
+        tasks = generate_tasks(np.random.default_rng(1), REFERENCE_DATE, 60, 2)
+        weeks = summarize_weeks(tasks, REFERENCE_DATE)
+
+        assert get_week_start(REFERENCE_DATE) not in [week["week_start"] for week in weeks]
+        week = weeks[3]
+        in_week = (tasks["ordinals"] >= week["week_start"].toordinal()) & (tasks["ordinals"] <= week["week_end"].toordinal())
+        assert week["stats"]["total_tasks"] == int(in_week.sum())
+        assert week["stats"]["total_hours"] == str(round(float(tasks["hours"][in_week].sum()), 1))
+        assert week["week_start"].weekday() == 6  # Sunday
+
+    @pytest.mark.asyncio
+    async def test_offline_dry_run_needs_no_network(self):
+        """Test an offline run summarizes and embeds every past week locally, without writing."""
+        result = await seed(engine=None, seed=3, offline=True, reference_date=REFERENCE_DATE)
+
+        assert result["tasks_created"] > 0
+        assert result["summaries_created"] == 8
+        assert result["last_date"] == REFERENCE_DATE.isoformat()
+        assert "copy_s" not in result["timings"]
@@ -24,7 +24,7 @@ AI_GENERATED_SUMMARY = SummaryResponse(
 )
 
 # This is what the endpoint will store and return (database model)
-from datetime import datetime
+from datetime import date, datetime
 STORED_SUMMARY_DB_MODEL = WeeklySummary(
     id=1, # Example ID from DB
     week_start=SAMPLE_WEEK_START,
@@ -267,6 +267,25 @@ async def test_get_summaries_invalid_pagination_params(test_client):
     assert response.status_code == 400
     assert "Offset must be a positive integer" in response.json()["detail"]
 
+@pytest.mark.asyncio
+async def test_invalid_date_filters_are_rejected_with_422(test_client):
+    """Test malformed dates and reversed date ranges are request validation errors, not service errors."""
+    async for client in test_client:
+        break
+
+    with patch('routers.summaries.limiter.enabled', False), \
+         patch('routers.summaries.summary_service.keyword_search_week_summaries', new_callable=AsyncMock) as mock_search:
+        assert (await client.get("/api/summaries/?start_date=2024-13-01")).status_code == 422
+        assert (await client.get("/api/summaries/search?query=focus&start_date=2024-02-30")).status_code == 422
+        response = await client.get("/api/summaries/search?query=focus&start_date=2024-03-01&end_date=2024-02-01")
+        assert response.status_code == 422
+        assert "start_date must not be after end_date" in response.text
+        response = await client.post("/api/summaries/search/batch", json={
+            "queries": ["focus"], "filters": {"start_date": "2024-03-01", "end_date": "2024-02-01"}
+        })
+        assert response.status_code == 422
+        mock_search.assert_not_called()
+
 @pytest.mark.asyncio
 async def test_get_summaries_with_date_filter(test_client):
     """Test GET /api/summaries/ with date filtering."""
@@ -301,8 +320,8 @@ async def test_get_summaries_with_date_filter(test_client):
             session=mock_get_all_summaries.call_args[1]["session"],
             skip=0,
             limit=100,
-            start_date="2024-03-01",
-            end_date="2024-03-31"
+            start_date=date(2024, 3, 1),
+            end_date=date(2024, 3, 31)
         )
 
 @pytest.mark.asyncio
@@ -343,3 +362,116 @@ async def test_get_summary_count(test_client):
         assert response.status_code == 200
         assert response.json() == {"total_summaries": 5}
         mock_get_count.assert_called_once()
+
+@pytest.mark.asyncio
+async def test_list_and_detail_never_fetch_embedding(test_client, test_db):
+    """Test the list and detail routes never select the embedding column."""
+    from datetime import date
+    from sqlalchemy import event
+    async for client in test_client:
+        break
+
+    summary = WeeklySummary(
+        week_start=date(2024, 4, 7), week_end=date(2024, 4, 13), summary="Embedded week",
+        stats={"total_tasks": 1}, recommendations=[]
+    )
+    test_db.add(summary)
+    await test_db.flush()
+
+    statements = []
+    def capture_statement(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = test_db.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", capture_statement)
+    try:
+        list_response = await client.get("/api/summaries/?start_date=2024-04-07&end_date=2024-04-07")
+        detail_response = await client.get(f"/api/summaries/{summary.id}")
+    finally:
+        event.remove(engine, "before_cursor_execute", capture_statement)
+
+    assert list_response.status_code == 200
+    assert [item["week_start"] for item in list_response.json()["summaries"]] == ["2024-04-07"]
+    assert detail_response.status_code == 200
+    assert detail_response.json()["week_start"] == "2024-04-07"
+    assert statements
+    assert not any("embedding" in statement for statement in statements)
+
+@pytest.mark.asyncio
+async def test_task_reads_stay_fast_during_parallel_summary_generation():
+    """Test 20 concurrent summary generations don't hold pooled connections during AI calls."""
+    import asyncio
+    import time
+    import numpy as np
+    from datetime import date, timedelta
+    from httpx import AsyncClient, ASGITransport
+    from sqlalchemy import delete
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from sqlmodel import SQLModel
+    from config.database import POOL_CONFIG
+    from services.database import create_engine_from_pool_config, register_vector_codec, get_session, get_read_session
+    from routers.summaries import summary_service
+    from tests.conftest import get_test_database_url
+
+    ai_latency = 0.5
+    dimensions = summary_service.embedding_profile['dimensions']
+    # A pool of two connections: holding one during an AI call would starve every other request
+    pool_engine = create_engine_from_pool_config(
+        get_test_database_url(),
+        {**POOL_CONFIG, "pool_size": 2, "max_overflow": 0, "pool_timeout": 5, "statement_cache_size": 0}
+    )
+    register_vector_codec(pool_engine)
+    async with pool_engine.begin() as connection:
+        await connection.run_sync(SQLModel.metadata.create_all)
+
+    async def override_get_session():
+        async with AsyncSession(pool_engine, expire_on_commit=False) as session:
+            yield session
+            await session.commit()
+
+    async def slow_summary(**kwargs):
+        await asyncio.sleep(ai_latency)
+        return SummaryResponse(summary="Parallel week", recommendations=["Keep going"])
+
+    async def slow_embed(texts):
+        await asyncio.sleep(ai_latency / 2)
+        return [np.full(dimensions, 0.1, dtype=np.float32) for _ in texts]
+
+    week_starts = [date(2031, 1, 5) + timedelta(weeks=week) for week in range(20)]
+    app.dependency_overrides[get_session] = override_get_session
+    app.dependency_overrides[get_read_session] = override_get_session
+    try:
+        with patch('routers.summaries.ai_service.generate_weekly_summary', side_effect=slow_summary), \
+             patch.object(summary_service.embedding_provider, 'embed', side_effect=slow_embed), \
+             patch('routers.summaries.limiter.enabled', False):
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://testserver") as client:
+                async def generate(week_start):
+                    return await client.post("/api/summaries/", json={
+                        "tasks": [{"name": "Parallel task", "time_spent": 1.0, "focus_level": "high", "date_worked": week_start.isoformat()}],
+                        "week_start": week_start.isoformat(),
+                        "week_end": (week_start + timedelta(days=6)).isoformat(),
+                        "week_stats": {"total_tasks": 1, "total_hours": "1.0", "avg_focus": "high"}
+                    })
+
+                async def read_tasks():
+                    latencies = []
+                    for _ in range(5):
+                        await asyncio.sleep(ai_latency / 5)
+                        start = time.perf_counter()
+                        response = await client.get("/api/tasks/?limit=5")
+                        latencies.append(time.perf_counter() - start)
+                        assert response.status_code == 200
+                    return latencies
+
+                *summary_responses, read_latencies = await asyncio.gather(
+                    *(generate(week_start) for week_start in week_starts), read_tasks()
+                )
+
+        assert [response.status_code for response in summary_responses] == [200] * len(week_starts)
+        assert max(read_latencies) < ai_latency
+        assert pool_engine.pool.timeouts == 0
+    finally:
+        app.dependency_overrides.clear()
+        async with pool_engine.begin() as connection:
+            await connection.execute(delete(WeeklySummary).where(WeeklySummary.week_start.in_(week_starts)))
+        await pool_engine.dispose()
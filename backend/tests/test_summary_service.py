@@ -1,4 +1,5 @@
 import pytest
+from datetime import date, datetime
 from unittest.mock import AsyncMock, MagicMock, patch
 from typing import List
 import sys
@@ -222,9 +223,11 @@ class TestSummaryService:
             call_args = mock_execute.call_args
             sql_params = call_args[0][1]  # Second argument contains the parameters
             
-            # Check that embedding is formatted as pgvector array format
-            expected_embedding = f"[{','.join(map(str, mock_embedding))}]"
-            assert sql_params['embedding'] == expected_embedding
+            # Check that embedding is sent as a float32 array (binary transfer), not a text literal
+            import numpy as np
+            assert isinstance(sql_params['embedding'], np.ndarray)
+            assert sql_params['embedding'].dtype == np.float32
+            assert np.allclose(sql_params['embedding'], mock_embedding)
             assert sql_params['similarity_threshold'] == 0.8
             assert sql_params['limit'] == 3
 
@@ -257,8 +260,8 @@ class TestSummaryService:
         
         count = await summary_service.get_summaries_count(
             session=mock_session,
-            start_date="2024-01-01",
-            end_date="2024-01-31"
+            start_date=date(2024, 1, 1),
+            end_date=date(2024, 1, 31)
         )
         
         assert count == 3
@@ -277,4 +280,276 @@ class TestSummaryService:
         
         count = await summary_service.get_summaries_count(session=mock_session)
         
-        assert count == 0 
\ No newline at end of file
+        assert count == 0
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("start_date,end_date", [
+        (date(2024, 1, 1), date(2024, 1, 31)), (date(2024, 1, 8), None), (None, date(2024, 1, 31)), (None, None)
+    ])
+    async def test_summaries_count_uses_list_predicates(self, summary_service, start_date, end_date):
+        """Test the count filters week_start exactly like the list query, with date parameters."""
+        mock_session = AsyncMock()
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.return_value = []
+        mock_result.scalar.return_value = 0
+        mock_session.execute = AsyncMock(return_value=mock_result)
+
+        await summary_service.get_weekly_summaries(session=mock_session, start_date=start_date, end_date=end_date)
+        await summary_service.get_summaries_count(session=mock_session, start_date=start_date, end_date=end_date)
+
+        (list_stmt, list_params), (count_stmt, count_params) = [call[0] for call in mock_session.execute.call_args_list]
+        assert str(list_stmt.whereclause) == str(count_stmt.whereclause)
+        assert count_params == {key: value for key, value in list_params.items() if key not in ("skip", "limit")}
+        assert all(isinstance(value, date) for value in count_params.values())
+
+    @pytest.mark.asyncio
+    async def test_create_weekly_summary_upserts_on_week_start(self, summary_service):
+        """Test a summary is written with a single upsert on week_start and returned from RETURNING."""
+        from datetime import datetime
+        mock_session = AsyncMock()
+        mock_result = MagicMock()
+        mock_result.mappings.return_value.one.return_value = {
+            'id': 4, 'week_start': date(2024, 1, 7), 'week_end': date(2024, 1, 13), 'summary': "Focused week",
+            'stats': {}, 'recommendations': [], 'created_at': datetime(2024, 1, 14), 'updated_at': datetime(2024, 1, 20)
+        }
+        mock_session.execute = AsyncMock(return_value=mock_result)
+        summary_data = WeeklySummary(week_start="2024-01-07", week_end="2024-01-13", summary="Focused week", stats={}, recommendations=[])
+
+        with patch.object(summary_service, 'generate_embedding', return_value=[0.1] * 1536):
+            stored_summary = await summary_service.create_weekly_summary(session=mock_session, summary_data=summary_data)
+
+        assert stored_summary.id == 4 and stored_summary.week_start == "2024-01-07"
+        mock_session.add.assert_not_called()
+        mock_session.commit.assert_awaited_once()
+        statement, params = mock_session.execute.call_args[0]
+        assert statement.__class__.__name__ == "Insert" and statement._post_values_clause is not None
+        assert params['week_start'] == date(2024, 1, 7)
+        assert 'id' not in params
+
+    @pytest.mark.asyncio
+    async def test_reembed_summaries_bumps_updated_at(self, summary_service):
+        """Test re-embedding updates updated_at with the embedding, so other processes see the change."""
+        from types import SimpleNamespace
+        mock_session = AsyncMock()
+        mock_session.in_transaction = MagicMock(return_value=False)
+        rows_result, empty_result = MagicMock(), MagicMock()
+        rows_result.all.return_value = [SimpleNamespace(
+            id=1, week_start=date(2024, 1, 7), week_end=date(2024, 1, 13), summary="Focused week", recommendations=[]
+        )]
+        empty_result.all.return_value = []
+        mock_session.execute = AsyncMock(side_effect=[rows_result, None, empty_result])
+
+        with patch.object(summary_service, 'generate_embeddings', new_callable=AsyncMock, return_value=[[0.1] * 4]):
+            assert await summary_service.reembed_summaries(session=mock_session, only_missing=False) == 1
+
+        update_sql, update_params = mock_session.execute.call_args_list[1][0]
+        assert "embedding=" in str(update_sql) and "updated_at=:new_updated_at" in str(update_sql)
+        assert isinstance(update_params[0]["new_updated_at"], datetime)
+
+    @pytest.mark.asyncio
+    async def test_get_tasks_without_summary_uses_anti_join(self, summary_service):
+        """Test missing weeks are found with one NOT EXISTS query on the task's Sunday week start."""
+        mock_session = AsyncMock()
+        mock_result = MagicMock()
+        mock_result.scalars.return_value.all.return_value = []
+        mock_session.execute = AsyncMock(return_value=mock_result)
+
+        assert await summary_service.get_tasks_without_summary(session=mock_session) == []
+
+        sql = str(mock_session.execute.call_args[0][0])
+        assert "NOT (EXISTS" in sql
+        assert "weekly_summaries.week_start = tasks.date_worked - CAST(EXTRACT(dow FROM tasks.date_worked) AS INTEGER)" in sql
+
+    @pytest.mark.asyncio
+    async def test_get_adjacent_week_context_single_query_and_cache(self, summary_service):
+        """Test adjacent week context is loaded with one query, rendered, and cached per week."""
+        from types import SimpleNamespace
+        mock_session = AsyncMock()
+        summary_service.invalidate_adjacent_week_context()
+
+        mock_result = MagicMock()
+        mock_result.all.return_value = [
+            SimpleNamespace(week_start=date(2024, 1, 1), week_end=date(2024, 1, 7), summary="Earlier week", recommendations=["Old advice"]),
+            SimpleNamespace(week_start=date(2024, 1, 15), week_end=date(2024, 1, 21), summary="Later week", recommendations=[]),
+        ]
+        mock_session.execute = AsyncMock(return_value=mock_result)
+
+        context = await summary_service.get_adjacent_week_context(session=mock_session, week_start="2024-01-08", weeks=1)
+        cached_context = await summary_service.get_adjacent_week_context(session=mock_session, week_start="2024-01-08", weeks=1)
+
+        assert "PREVIOUS WEEKS:\n* 2024-01-01 to 2024-01-07: Earlier week" in context
+        assert "Recommendations: Old advice" in context
+        assert "WEEKS AFTER:\n* 2024-01-15 to 2024-01-21: Later week" in context
+        assert cached_context == context
+        mock_session.execute.assert_called_once()
+
+        # A change to a neighbouring week, made through any SummaryService, invalidates the cached block
+        SummaryService().invalidate_adjacent_week_context("2024-01-15")
+        await summary_service.get_adjacent_week_context(session=mock_session, week_start="2024-01-08", weeks=1)
+        assert mock_session.execute.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_hybrid_search_fuses_keyword_and_vector_results(self, summary_service, sample_weekly_summaries):
+        """Test hybrid search ranks summaries found by both keyword and vector search first."""
+        keyword_results = [sample_weekly_summaries[2], sample_weekly_summaries[0]]
+        vector_results = [sample_weekly_summaries[1], sample_weekly_summaries[0]]
+
+        with patch.object(summary_service, 'vector_search_week_summaries', new_callable=AsyncMock, return_value=vector_results):
+            results = await summary_service.hybrid_search_week_summaries(
+                session=AsyncMock(),
+                query_text="testing",
+                keyword_results=keyword_results,
+                limit=3
+            )
+
+        assert [summary.id for summary in results] == [1, 3, 2]
+
+    @pytest.mark.asyncio
+    async def test_vector_search_applies_filters_in_sql(self, summary_service):
+        """Test filters are pushed into the vector search SQL with an iterative index scan."""
+        from models.models import SummarySearchFilters, FocusLevel
+        mock_session = AsyncMock()
+        mock_result = MagicMock()
+        mock_result.mappings.return_value.all.return_value = []
+        filters = SummarySearchFilters(start_date="2024-01-01", end_date="2024-03-31", avg_focus=FocusLevel.high, min_hours=20)
+
+        with patch.object(summary_service, 'generate_embedding', return_value=[0.1] * 1536), \
+             patch.object(mock_session, 'execute', return_value=mock_result) as mock_execute:
+            await summary_service.vector_search_week_summaries(
+                session=mock_session,
+                query_text="testing",
+                limit=5,
+                filters=filters
+            )
+
+        settings = [str(call[0][0]) for call in mock_execute.call_args_list[:-1]]
+        assert any("hnsw.iterative_scan" in setting for setting in settings)
+
+        sql, sql_params = str(mock_execute.call_args[0][0]), mock_execute.call_args[0][1]
+        assert "week_start >= :filter_start_date" in sql
+        assert "lower(stats->>'avg_focus') = :filter_avg_focus" in sql
+        assert ":filter_max_hours" not in sql
+        assert sql_params['filter_start_date'] == date(2024, 1, 1)
+        assert sql_params['filter_end_date'] == date(2024, 3, 31)
+        assert sql_params['filter_avg_focus'] == "high"
+        assert sql_params['filter_min_hours'] == 20
+        assert sql_params['limit'] == 5
+
+    @pytest.mark.asyncio
+    async def test_vector_search_two_stage_prefilters_on_bit_vectors(self, summary_service):
+        """Test two-stage search prefilters by Hamming distance and reranks by cosine distance."""
+        mock_session = AsyncMock()
+        mock_result = MagicMock()
+        mock_result.mappings.return_value.all.return_value = []
+        summary_service.binary_prefilter_candidates = 300
+
+        with patch.object(summary_service, 'generate_embedding', return_value=[0.1] * 1536), \
+             patch.object(mock_session, 'execute', return_value=mock_result) as mock_execute:
+            await summary_service.vector_search_week_summaries(
+                session=mock_session,
+                query_text="testing",
+                limit=5,
+                two_stage=True
+            )
+
+        # ef_search is raised to cover every prefilter candidate
+        assert mock_execute.call_args_list[0][0][1] == {"ef_search": "300"}
+
+        sql, sql_params = str(mock_execute.call_args[0][0]), mock_execute.call_args[0][1]
+        assert "embedding_bit <~> binary_quantize(" in sql
+        assert "ORDER BY ws.embedding <=> :embedding" in sql
+        assert sql_params['candidates'] == 300
+        assert sql_params['limit'] == 5
+
+    @pytest.mark.asyncio
+    async def test_batch_vector_search_uses_one_lateral_query(self, summary_service):
+        """Test several query embeddings are searched with one LATERAL top-k statement."""
+        import numpy as np
+        mock_session = AsyncMock()
+        mock_result = MagicMock()
+        row = {
+            'id': 2, 'week_start': "2024-01-15", 'week_end': "2024-01-21", 'summary': "Meetings",
+            'stats': {}, 'recommendations': [], 'created_at': None, 'updated_at': None
+        }
+        mock_result.mappings.return_value.all.return_value = [
+            {'query_index': 1, **row, 'similarity': 0.8}
+        ]
+        summary_service.vector_index = None
+
+        with patch.object(mock_session, 'execute', return_value=mock_result) as mock_execute:
+            results = await summary_service.batch_vector_search_week_summaries(
+                session=mock_session,
+                query_embeddings=[np.full(1536, 0.1), np.full(1536, 0.2)],
+                limit=3
+            )
+
+        assert mock_execute.call_count == 2  # ef_search setting, then the search
+        sql, sql_params = str(mock_execute.call_args[0][0]), mock_execute.call_args[0][1]
+        assert "CROSS JOIN LATERAL" in sql
+        assert ":embedding_0" in sql and ":embedding_1" in sql
+        assert sql_params['embedding_1'].dtype == np.float32
+        assert sql_params['limit'] == 3
+        assert [[summary.id for summary in query_results] for query_results in results] == [[], [2]]
+
+    @pytest.mark.asyncio
+    async def test_get_similar_summaries_single_query_and_cache(self, summary_service):
+        """Test similar weeks use the stored embedding in one query and are cached until embeddings change."""
+        mock_session = AsyncMock()
+        mock_result = MagicMock()
+        mock_result.mappings.return_value.all.return_value = [{
+            'id': 3, 'week_start': "2024-01-22", 'week_end': "2024-01-28", 'summary': "Testing",
+            'stats': {}, 'recommendations': [], 'created_at': None, 'updated_at': None
+        }]
+        summary_service.invalidate_similar_summaries()
+
+        with patch.object(summary_service, 'generate_embedding') as mock_generate, \
+             patch.object(mock_session, 'execute', return_value=mock_result) as mock_execute:
+            first = await summary_service.get_similar_summaries(session=mock_session, summary_id=1, limit=3)
+            second = await summary_service.get_similar_summaries(session=mock_session, summary_id=1, limit=3)
+            summary_service.invalidate_similar_summaries()
+            await summary_service.get_similar_summaries(session=mock_session, summary_id=1, limit=3)
+
+        mock_generate.assert_not_called()
+        assert [summary.id for summary in first] == [3]
+        assert second is first
+        assert mock_execute.call_count == 2
+        sql, sql_params = str(mock_execute.call_args[0][0]), mock_execute.call_args[0][1]
+        assert "LEFT JOIN LATERAL" in sql
+        assert "ws.id <> target.id" in sql
+        assert sql_params == {"summary_id": 1, "limit": 3}
+
+    def test_cached_entries_expire_after_ttl(self):
+        """Test cache entries expire after the ttl, so other workers' caches catch up with writes they never saw."""
+        from utils.cache import LRUCache
+
+        cache = LRUCache(maxsize=4, ttl=30)
+        with patch("utils.cache.time.monotonic", return_value=100.0):
+            cache.set((1, 3), ["week"])
+        with patch("utils.cache.time.monotonic", return_value=129.0):
+            assert cache.get((1, 3)) == ["week"]
+        with patch("utils.cache.time.monotonic", return_value=130.0):
+            assert cache.get((1, 3)) is None
+        assert len(cache) == 0
+        assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_get_similar_summaries_not_found_and_no_neighbours(self, summary_service):
+        """Test a missing summary returns None and a summary without neighbours returns an empty list."""
+        mock_session = AsyncMock()
+        missing_result, lonely_result = MagicMock(), MagicMock()
+        missing_result.mappings.return_value.all.return_value = []
+        lonely_result.mappings.return_value.all.return_value = [{'id': None}]
+        summary_service.invalidate_similar_summaries()
+
+        with patch.object(mock_session, 'execute', side_effect=[missing_result, lonely_result]):
+            assert await summary_service.get_similar_summaries(session=mock_session, summary_id=99) is None
+            assert await summary_service.get_similar_summaries(session=mock_session, summary_id=1) == []
+
+    def test_search_statements_are_built_once_and_cacheable(self, summary_service):
+        """Test search statements are reused per shape and can be stored in SQLAlchemy's compiled cache."""
+        statement = summary_service.get_search_statement("vector")
+
+        assert summary_service.get_search_statement("vector") is statement
+        assert summary_service.get_search_statement("batch", query_count=2) is not summary_service.get_search_statement("batch", query_count=3)
+        # None means the embedding column type disables caching for every statement binding it
+        assert statement._generate_cache_key() is not None
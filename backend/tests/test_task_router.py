@@ -23,6 +23,8 @@ async def test_create_task_success(test_client):
         assert response.status_code == 200
         assert response.json()["name"] == SAMPLE_TASK_PAYLOAD["name"]
         assert response.json()["id"] == 1
+        # Writes tell the client to read from the primary for a while
+        assert "X-Read-Primary-Until" in response.headers
         mock_create.assert_called_once()
 
 @pytest.mark.asyncio
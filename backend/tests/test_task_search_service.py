@@ -0,0 +1,138 @@
+import pytest
+import numpy as np
+from datetime import date
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from config.embeddings import EMBEDDING_DIMENSIONS
+from models.models import FocusLevel, Task, TaskNameEmbedding
+from services.task_search_service import TaskSearchService
+
+
+class TestTaskSearchService:
+    """Test cases for task name embeddings and semantic task search."""
+
+    @pytest.fixture
+    def task_search_service(self):
+        """Create a TaskSearchService instance for testing."""
+        return TaskSearchService()
+
+    @pytest.mark.asyncio
+    async def test_missing_names_embedded_once_in_batches(self, task_search_service):
+        """Test only distinct names without an embedding are embedded, one provider call per batch."""
+        task_search_service.batch_size = 2
+        mock_session = AsyncMock()
+        mock_session.in_transaction = MagicMock(return_value=True)
+        missing_result = MagicMock()
+        missing_result.scalars.return_value.all.return_value = ["code review", "standup", "write tests"]
+        mock_session.execute.side_effect = [missing_result, None, None]
+        embed = AsyncMock(side_effect=lambda names: [np.ones(4, dtype=np.float32) for _ in names])
+
+        with patch.object(task_search_service.embedding_provider, 'embed', embed):
+            embedded = await task_search_service.embed_missing_task_names(session=mock_session)
+
+        assert embedded == 3
+        assert [call[0][0] for call in embed.call_args_list] == [["code review", "standup"], ["write tests"]]
+        select_sql = str(mock_session.execute.call_args_list[0][0][0])
+        assert "SELECT DISTINCT" in select_sql and "NOT EXISTS" in select_sql
+        inserted_rows = mock_session.execute.call_args_list[1][0][1]
+        assert [row["normalized_name"] for row in inserted_rows] == ["code review", "standup"]
+        # The connection is released after the lookup, before any embedding call, then one commit per batch
+        assert mock_session.commit.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_reembed_replaces_names_in_one_transaction(self, task_search_service):
+        """Test re-embedding embeds all distinct names first, then deletes and inserts with a single commit."""
+        task_search_service.batch_size = 2
+        mock_session = AsyncMock()
+        mock_session.in_transaction = MagicMock(return_value=True)
+        names_result = MagicMock()
+        names_result.scalars.return_value.all.return_value = ["code review", "standup", "write tests"]
+        mock_session.execute.side_effect = [names_result, None, None, None]
+        embed = AsyncMock(side_effect=lambda names: [np.ones(4, dtype=np.float32) for _ in names])
+
+        with patch.object(task_search_service.embedding_provider, 'embed', embed), \
+             patch.object(task_search_service, 'embed_missing_task_names', new_callable=AsyncMock, return_value=0):
+            assert await task_search_service.reembed_task_names(session=mock_session) == 3
+
+        statements = [str(call[0][0]) for call in mock_session.execute.call_args_list]
+        assert "NOT EXISTS" not in statements[0]
+        assert statements[1].startswith("DELETE FROM task_name_embeddings")
+        assert [len(call[0][1]) for call in mock_session.execute.call_args_list[2:]] == [2, 1]
+        # Only the release after the lookup and the swap itself commit
+        assert mock_session.commit.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_reembed_keeps_old_names_when_provider_fails(self, task_search_service):
+        """Test a provider failure while re-embedding leaves the stored name embeddings untouched."""
+        mock_session = AsyncMock()
+        mock_session.in_transaction = MagicMock(return_value=False)
+        names_result = MagicMock()
+        names_result.scalars.return_value.all.return_value = ["standup"]
+        mock_session.execute.return_value = names_result
+
+        with patch.object(task_search_service.embedding_provider, 'embed', AsyncMock(side_effect=RuntimeError("down"))):
+            with pytest.raises(RuntimeError):
+                await task_search_service.reembed_task_names(session=mock_session)
+
+        mock_session.execute.assert_awaited_once()
+        mock_session.commit.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_search_joins_nearest_names_back_to_tasks(self, task_search_service):
+        """Test search embeds the query once and joins the nearest names to tasks in the date range."""
+        mock_session = AsyncMock()
+        mock_result = MagicMock()
+        mock_result.mappings.return_value.all.return_value = [{
+            'id': 7, 'name': "Daily Standup", 'time_spent': 0.5, 'focus_level': "low",
+            'date_worked': "2024-01-09", 'created_at': None, 'updated_at': None
+        }]
+        embed = AsyncMock(return_value=[np.ones(4, dtype=np.float32)])
+
+        with patch.object(task_search_service.embedding_provider, 'embed', embed), \
+             patch.object(mock_session, 'execute', return_value=mock_result) as mock_execute:
+            tasks = await task_search_service.search_tasks(
+                session=mock_session, query="  Team   Sync ", start_date="2024-01-08", end_date="2024-01-14"
+            )
+
+        embed.assert_called_once_with(["team sync"])
+        assert [task.id for task in tasks] == [7]
+        sql, sql_params = str(mock_execute.call_args[0][0]), mock_execute.call_args[0][1]
+        assert "FROM task_name_embeddings" in sql
+        assert "= matched_names.normalized_name" in sql
+        assert "tasks.date_worked BETWEEN :start_date AND :end_date" in sql
+        assert sql_params['name_candidates'] == task_search_service.name_candidates
+
+    @pytest.mark.asyncio
+    async def test_search_finds_names_in_range_behind_nearer_names_outside_it(self, task_search_service, test_db_session):
+        """Test names used only outside the date range don't take the candidate slots of names inside it."""
+        def vector(*values):
+            embedding = np.zeros(EMBEDDING_DIMENSIONS, dtype=np.float32)
+            embedding[:len(values)] = values
+            return embedding
+
+        async for session in test_db_session:
+            break
+        session.add_all([
+            Task(name="Standup", time_spent=0.5, focus_level=FocusLevel.low, date_worked=date(2024, 1, 9)),
+            Task(name="Team sync", time_spent=1.0, focus_level=FocusLevel.medium, date_worked=date(2024, 2, 6)),
+            TaskNameEmbedding(normalized_name="standup", embedding=vector(1.0)),
+            TaskNameEmbedding(normalized_name="team sync", embedding=vector(1.0, 0.2)),
+        ])
+        await session.commit()
+        # "standup" is the single nearest name, but it is only used in January
+        task_search_service.name_candidates = 1
+
+        with patch.object(task_search_service.embedding_provider, 'embed', AsyncMock(return_value=[vector(1.0)])):
+            tasks = await task_search_service.search_tasks(
+                session=session, query="standup", start_date="2024-02-01", end_date="2024-02-29"
+            )
+
+        assert [task.name for task in tasks] == ["Team sync"]
+
+    @pytest.mark.asyncio
+    async def test_search_requires_both_dates(self, task_search_service):
+        """Test a half-open date range is rejected before any embedding call."""
+        with patch.object(task_search_service.embedding_provider, 'embed', new_callable=AsyncMock) as embed:
+            with pytest.raises(ValueError):
+                await task_search_service.search_tasks(session=AsyncMock(), query="standup", start_date="2024-01-08")
+        embed.assert_not_called()
@@ -0,0 +1,118 @@
+import os
+import pytest
+import numpy as np
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from services.vector_index import InMemoryVectorIndex
+
+
+WRITTEN_AT = datetime(2024, 3, 1, 12, 0)
+
+
+def make_session(embeddings: dict, updated_at: datetime = None) -> AsyncMock:
+    """Mock session returning the given {id: embedding} rows and a matching signature."""
+    result = MagicMock()
+    result.all.return_value = [SimpleNamespace(id=summary_id, embedding=embedding) for summary_id, embedding in embeddings.items()]
+    result.one.return_value = (len(embeddings), max(embeddings, default=None), updated_at)
+    session = AsyncMock()
+    session.execute = AsyncMock(return_value=result)
+    return session
+
+
+class TestInMemoryVectorIndex:
+    """Test cases for the in-process vector index."""
+
+    @pytest.mark.asyncio
+    async def test_search_returns_top_k_by_cosine_similarity(self):
+        """Test search ranks by cosine similarity, applies the threshold and ignores vector length."""
+        index = InMemoryVectorIndex(dimensions=3)
+        await index.ensure_current(make_session({
+            1: [1.0, 0.0, 0.0],
+            2: [0.0, 5.0, 0.0],
+            3: [3.0, 3.0, 0.0],
+            4: [0.0, 0.0, 1.0],
+        }))
+
+        matches = index.search([1.0, 0.2, 0.0], limit=2)
+        assert [summary_id for summary_id, _ in matches] == [1, 3]
+        assert matches[0][1] == pytest.approx(1 / np.sqrt(1.04), rel=1e-5)
+
+        assert [summary_id for summary_id, _ in index.search([0.0, 0.0, 1.0], limit=4, similarity_threshold=0.5)] == [4]
+
+    @pytest.mark.asyncio
+    async def test_upsert_and_remove_keep_index_in_sync(self):
+        """Test new, replaced and deleted summaries are reflected in search results."""
+        index = InMemoryVectorIndex(dimensions=2)
+        await index.ensure_current(make_session({1: [1.0, 0.0], 2: [0.0, 1.0]}))
+
+        await index.upsert(make_session({1: None, 2: None, 3: None}, WRITTEN_AT), [3, 1], [[1.0, 1.0], [0.0, 1.0]], WRITTEN_AT)
+        assert len(index) == 3
+        assert [summary_id for summary_id, _ in index.search([1.0, 0.0], limit=1)] == [3]
+
+        await index.remove(make_session({1: None, 2: None}, WRITTEN_AT), 3)
+        assert len(index) == 2
+        assert [summary_id for summary_id, _ in index.search([1.0, 0.0], limit=1)] in ([1], [2])
+        # Both writes explain the new signatures, so no rebuild is due
+        assert index._signature == (2, 2, WRITTEN_AT)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_write_by_another_process_marks_index_stale(self):
+        """Test a write committed elsewhere between our write and the signature check is picked up by a rebuild."""
+        index = InMemoryVectorIndex(dimensions=2)
+        await index.ensure_current(make_session({1: [1.0, 0.0], 2: [0.0, 1.0]}))
+
+        # Summary 4 was written by another worker right after our summary 3
+        everything = {1: [1.0, 0.0], 2: [0.0, 1.0], 3: [1.0, 1.0], 4: [-1.0, 0.0]}
+        await index.upsert(make_session(everything, WRITTEN_AT), [3], [[1.0, 1.0]], WRITTEN_AT)
+        assert index._signature is None
+
+        await index.ensure_current(make_session(everything, WRITTEN_AT))
+        assert [summary_id for summary_id, _ in index.search([-1.0, 0.0], limit=1)] == [4]
+
+    @pytest.mark.asyncio
+    async def test_processes_sharing_a_path_save_through_unique_temporary_files(self, tmp_path):
+        """Test saving leaves no shared temporary files behind and a second process loads a consistent index."""
+        path = str(tmp_path / "summaries")
+        embeddings = {1: [1.0, 0.0], 2: [0.0, 1.0]}
+        await InMemoryVectorIndex(dimensions=2, path=path).ensure_current(make_session(embeddings))
+        await InMemoryVectorIndex(dimensions=2, path=path).rebuild(make_session(embeddings))
+
+        assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+        other = InMemoryVectorIndex(dimensions=2, path=path)
+        session = make_session(embeddings)
+        await other.ensure_current(session)
+        session.execute.assert_called_once()
+        assert other.ids.tolist() == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_saved_index_is_memory_mapped_on_restart(self, tmp_path):
+        """Test a saved index is loaded from disk instead of rebuilt when the database hasn't changed."""
+        embeddings = {1: [1.0, 0.0], 2: [0.0, 1.0]}
+        path = str(tmp_path / "summaries")
+        await InMemoryVectorIndex(dimensions=2, path=path).ensure_current(make_session(embeddings))
+
+        restarted = InMemoryVectorIndex(dimensions=2, path=path)
+        session = make_session(embeddings)
+        await restarted.ensure_current(session)
+
+        assert isinstance(restarted.matrix, np.memmap)
+        # Only the signature query ran, no rebuild
+        session.execute.assert_called_once()
+        assert [summary_id for summary_id, _ in restarted.search([0.0, 1.0], limit=1)] == [2]
+
+    @pytest.mark.asyncio
+    async def test_saved_index_rebuilt_when_signature_changed(self, tmp_path):
+        """Test a saved index with the right size is still rebuilt if the database changed while stopped."""
+        path = str(tmp_path / "summaries")
+        await InMemoryVectorIndex(dimensions=2, path=path).ensure_current(make_session({1: [1.0, 0.0], 2: [0.0, 1.0]}))
+
+        # Same count and max id, but re-embedded since: only updated_at differs
+        session = make_session({1: [0.0, 1.0], 2: [1.0, 0.0]})
+        session.execute.return_value.one.return_value = (2, 2, datetime(2024, 3, 1))
+        restarted = InMemoryVectorIndex(dimensions=2, path=path)
+        await restarted.ensure_current(session)
+
+        assert not isinstance(restarted.matrix, np.memmap)
+        assert [summary_id for summary_id, _ in restarted.search([1.0, 0.0], limit=1)] == [2]
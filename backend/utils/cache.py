@@ -0,0 +1,61 @@
+"""
+In-process caching utilities for the productivity tracker.
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class LRUCache:
+    """
+    Small least-recently-used cache with hit/miss counters.
+
+    With a ttl, entries expire that many seconds after they are set. Invalidation only reaches
+    the process that made the change, so a ttl bounds how long other worker processes serve
+    stale entries.
+    """
+
+    def __init__(self, maxsize: int = 128, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        # Values with the monotonic time they expire at (None: never)
+        self._data: "OrderedDict[Hashable, Tuple[Any, Optional[float]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """Get a cached value, marking it as most recently used."""
+        if key in self._data:
+            value, expires_at = self._data[key]
+            if expires_at is None or time.monotonic() < expires_at:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._data[key]
+        self.misses += 1
+        return default
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Cache a value, evicting the least recently used entry if full."""
+        self._data[key] = (value, None if self.ttl is None else time.monotonic() + self.ttl)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Remove every entry whose key matches the predicate. Returns the number removed."""
+        stale_keys = [key for key in self._data if predicate(key)]
+        for key in stale_keys:
+            del self._data[key]
+        return len(stale_keys)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, int]:
+        """Get cache size and hit/miss counters."""
+        return {"size": len(self._data), "maxsize": self.maxsize, "ttl": self.ttl, "hits": self.hits, "misses": self.misses}
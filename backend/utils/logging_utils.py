@@ -0,0 +1,154 @@
+"""
+Structured logging through a queue, so formatting and stdout writes happen off the event loop.
+
+configure_logging() routes every logger, including uvicorn's, to a QueueHandler. Callers only
+resolve the message and enqueue the record; a QueueListener thread formats it (JSON by default)
+and writes it out. Levels are set with LOG_LEVEL and per logger with LOG_LEVELS.
+"""
+import atexit
+import copy
+import itertools
+import json
+import logging
+import os
+import queue
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+from dotenv import load_dotenv
+
+# Load environment variables, this module may be imported before main.py loads them
+load_dotenv()
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").strip().upper()
+# Per-logger levels, e.g. "services.ai_service=DEBUG,sqlalchemy.engine=WARNING"
+LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+# "json" for one JSON object per line, "text" for plain lines
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").strip().lower()
+# Full AI prompts and responses are logged for one in this many calls, and always on error (0: only on error)
+LOG_PROMPT_SAMPLE_EVERY = int(os.getenv("LOG_PROMPT_SAMPLE_EVERY", "100"))
+
+# Loggers that uvicorn configures with its own synchronous stream handlers
+UVICORN_LOGGERS = ("uvicorn", "uvicorn.error", "uvicorn.access")
+
+# Attributes every LogRecord has; anything else on a record came from `extra=` and is logged as a field
+RESERVED_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+
+def parse_log_levels(levels: str) -> Dict[str, str]:
+    """Parse "logger=LEVEL,logger=LEVEL" into a dictionary of logger names to levels."""
+    parsed = {}
+    for entry in levels.split(","):
+        if not entry.strip():
+            continue
+        name, separator, level = entry.partition("=")
+        if not separator or not name.strip() or not level.strip():
+            raise ValueError(f"Invalid LOG_LEVELS entry {entry!r}, expected logger=LEVEL")
+        parsed[name.strip()] = level.strip().upper()
+    return parsed
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats a record as one JSON object, with `extra=` fields as top-level keys."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "pid": record.process,
+        }
+        entry.update({key: value for key, value in vars(record).items() if key not in RESERVED_ATTRS})
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class LogQueueHandler(QueueHandler):
+    """
+    Enqueues records for the listener thread without formatting them.
+
+    Unlike QueueHandler.prepare, the message is only resolved (its arguments may change
+    later) and the traceback kept, so the listener's formatter still sees the record's fields.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg, record.args = record.getMessage(), None
+        if record.exc_info:
+            # Tracebacks hold frames that may not outlive the caller, so render them now (errors only)
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class PayloadSampler:
+    """Decides which calls log their large payloads: the first and then one in every `every`."""
+
+    def __init__(self, every: int = LOG_PROMPT_SAMPLE_EVERY):
+        self.every = every
+        self._calls = itertools.count()
+
+    def should_log(self) -> bool:
+        """Whether this call should log its payload."""
+        return self.every > 0 and next(self._calls) % self.every == 0
+
+
+_listener: Optional[QueueListener] = None
+
+
+def configure_logging(
+    level: str = LOG_LEVEL,
+    levels: str = LOG_LEVELS,
+    log_format: str = LOG_FORMAT,
+    stream=None
+) -> QueueListener:
+    """
+    Send all logging through a queue to a listener thread that formats and writes records.
+
+    Replaces the root logger's handlers and uvicorn's, so those loggers propagate to the root.
+    Calling it again restarts the listener with the new settings. Queued records are written
+    out at interpreter exit.
+
+    Returns:
+        The running listener
+    """
+    global _listener
+    stop_logging()
+
+    output = logging.StreamHandler(stream or sys.stdout)
+    output.setFormatter(
+        JsonFormatter() if log_format == "json" else logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+    )
+    log_queue = queue.SimpleQueue()
+    _listener = QueueListener(log_queue, output)
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(LogQueueHandler(log_queue))
+    root.setLevel(level)
+
+    for name in UVICORN_LOGGERS:
+        uvicorn_logger = logging.getLogger(name)
+        uvicorn_logger.handlers.clear()
+        uvicorn_logger.propagate = True
+    for name, logger_level in parse_log_levels(levels).items():
+        logging.getLogger(name).setLevel(logger_level)
+
+    _listener.start()
+    atexit.unregister(stop_logging)
+    atexit.register(stop_logging)
+    return _listener
+
+
+def stop_logging() -> None:
+    """Write out the queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
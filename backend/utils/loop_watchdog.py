@@ -0,0 +1,136 @@
+"""
+Event loop lag watchdog: measures how late the event loop runs a periodic timer and reports stalls.
+
+A heartbeat task sleeps for a short interval and records how late it wakes up. Any lag above
+the threshold means a callback held the event loop thread for that long; it is counted and logged.
+A watcher thread notices the stall while it is happening and records where the event loop
+thread is stuck, so the log names the blocking code. Works with any event loop, including uvloop.
+"""
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from contextlib import suppress
+from datetime import datetime
+from typing import Optional
+
+from utils.timing import LatencyHistogram
+
+LOOP_WATCHDOG_ENABLED = os.getenv("LOOP_WATCHDOG_ENABLED", "true").lower() in ("1", "true", "yes")
+# Lag, in milliseconds, above which the event loop counts as blocked
+LOOP_LAG_THRESHOLD_MS = float(os.getenv("LOOP_LAG_THRESHOLD_MS", "100"))
+# How often the heartbeat task wakes up, in milliseconds
+LOOP_WATCHDOG_INTERVAL_MS = float(os.getenv("LOOP_WATCHDOG_INTERVAL_MS", "50"))
+
+# Upper bounds, in milliseconds, of the lag histogram buckets
+LOOP_LAG_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+logger = logging.getLogger(__name__)
+
+
+def format_location(frame, depth: int = 3) -> str:
+    """Format the innermost frames of a stack as 'file:line function', innermost first."""
+    frames = traceback.extract_stack(frame)[-depth:]
+    return " <- ".join(f"{os.path.basename(entry.filename)}:{entry.lineno} {entry.name}" for entry in reversed(frames))
+
+
+class LoopWatchdog:
+    """Measures event loop lag and counts the stalls longer than a threshold."""
+
+    def __init__(
+        self,
+        threshold_ms: float = LOOP_LAG_THRESHOLD_MS,
+        interval_ms: float = LOOP_WATCHDOG_INTERVAL_MS,
+        recent_size: int = 20
+    ):
+        self.threshold_ms = threshold_ms
+        self.interval_ms = interval_ms
+        self.lag_histogram = LatencyHistogram(LOOP_LAG_BUCKETS_MS)
+        self.stalls = 0
+        self.recent_stalls = deque(maxlen=recent_size)
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._loop_thread_id: Optional[int] = None
+        self._last_beat = 0.0
+        # Where the event loop thread was stuck during the current stall, set by the watcher thread
+        self._stall_location: Optional[str] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def start(self) -> None:
+        """Start watching the running event loop."""
+        if self._task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.perf_counter()
+        self._stopped.clear()
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+
+    async def stop(self) -> None:
+        """Stop the heartbeat task and the watcher thread."""
+        if self._task is None:
+            return
+        self._stopped.set()
+        self._task.cancel()
+        with suppress(asyncio.CancelledError):
+            await self._task
+        self._thread.join()
+        self._task = self._thread = None
+
+    async def _heartbeat(self) -> None:
+        interval = self.interval_ms / 1000
+        while True:
+            expected = time.perf_counter() + interval
+            await asyncio.sleep(interval)
+            now = time.perf_counter()
+            self._last_beat = now
+            lag_ms = max(0.0, (now - expected) * 1000)
+            self.lag_histogram.observe(lag_ms)
+            if lag_ms > self.threshold_ms:
+                self.record_stall(lag_ms)
+
+    def _watch(self) -> None:
+        while not self._stopped.wait(self.threshold_ms / 2000):
+            overdue_ms = (time.perf_counter() - self._last_beat) * 1000 - self.interval_ms
+            if overdue_ms > self.threshold_ms and self._stall_location is None:
+                frame = sys._current_frames().get(self._loop_thread_id)
+                if frame is not None:
+                    self._stall_location = format_location(frame)
+
+    def record_stall(self, lag_ms: float) -> None:
+        """Count and log a stall of the event loop."""
+        location, self._stall_location = self._stall_location, None
+        self.stalls += 1
+        self.recent_stalls.append({
+            "at": datetime.utcnow().isoformat(),
+            "lag_ms": round(lag_ms, 1),
+            "location": location
+        })
+        logger.warning(
+            "Event loop blocked for %.0f ms%s", lag_ms, f" at {location}" if location else "",
+            extra={"lag_ms": round(lag_ms, 1), "location": location}
+        )
+
+    def snapshot(self) -> dict:
+        """Get the stall count, the most recent stalls and the lag histogram."""
+        return {
+            "running": self.running,
+            "threshold_ms": self.threshold_ms,
+            "interval_ms": self.interval_ms,
+            "stalls": self.stalls,
+            "recent_stalls": list(self.recent_stalls),
+            "lag": self.lag_histogram.snapshot(),
+        }
+
+
+# Watchdog of this worker process's event loop, started on application startup
+loop_watchdog = LoopWatchdog()
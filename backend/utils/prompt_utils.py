@@ -0,0 +1,169 @@
+"""
+Prompt building utilities for the productivity tracker.
+"""
+import math
+import re
+from typing import Any, Dict, List, Optional
+
+from models.models import Task
+
+# Rough average for English text with OpenAI tokenizers
+CHARS_PER_TOKEN = 4
+
+# Tokens held back so the "other tasks" line always fits inside the budget
+OTHER_TASKS_RESERVE_TOKENS = 30
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens in a piece of text.
+
+    Args:
+        text: The text to measure
+
+    Returns:
+        Approximate token count (about 4 characters per token)
+    """
+    if not text:
+        return 0
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def get_focus_value(task: Task) -> str:
+    """Get the focus level of a task as a plain string."""
+    return task.focus_level.value if hasattr(task.focus_level, 'value') else task.focus_level
+
+
+def format_hours(hours: float) -> str:
+    """Format hours without trailing zeros, e.g. 2.0 -> '2', 1.25 -> '1.25'."""
+    return f"{round(hours, 2):g}"
+
+
+def render_task_lines(tasks: List[Task]) -> str:
+    """Render one prompt line per task (the uncompacted format)."""
+    return "\n".join([
+        f"- {task.name} ({task.time_spent}h, {get_focus_value(task)} focus)"
+        for task in tasks
+    ])
+
+
+def group_tasks(tasks: List[Task]) -> List[Dict[str, Any]]:
+    """
+    Group tasks by name and focus level.
+
+    Args:
+        tasks: List of Task objects to group
+
+    Returns:
+        List of groups with name, focus, count and total hours, most significant
+        (most hours, then most occurrences) first
+    """
+    groups: Dict[tuple, Dict[str, Any]] = {}
+
+    for task in tasks:
+        focus = get_focus_value(task)
+        key = (re.sub(r'\s+', ' ', task.name).strip().lower(), focus)
+
+        if key not in groups:
+            groups[key] = {"name": task.name.strip(), "focus": focus, "count": 0, "hours": 0.0}
+        groups[key]["count"] += 1
+        groups[key]["hours"] += task.time_spent or 0
+
+    return sorted(groups.values(), key=lambda g: (-g["hours"], -g["count"], g["name"]))
+
+
+def render_task_group(group: Dict[str, Any]) -> str:
+    """Render a single task group as a prompt line."""
+    if group["count"] == 1:
+        return f"- {group['name']} ({format_hours(group['hours'])}h, {group['focus']} focus)"
+    return f"- {group['name']} x{group['count']} ({format_hours(group['hours'])}h total, {group['focus']} focus)"
+
+
+def render_other_groups(groups: List[Dict[str, Any]]) -> str:
+    """Merge the given groups into one line with counts and hours per focus level."""
+    total_tasks = sum(group["count"] for group in groups)
+    total_hours = sum(group["hours"] for group in groups)
+
+    focus_counts: Dict[str, int] = {}
+    for group in groups:
+        focus_counts[group["focus"]] = focus_counts.get(group["focus"], 0) + group["count"]
+    focus_breakdown = ", ".join(f"{count} {focus}" for focus, count in sorted(focus_counts.items()))
+
+    return f"- {total_tasks} other smaller tasks ({format_hours(total_hours)}h total; focus: {focus_breakdown})"
+
+
+def compact_task_summary(tasks: List[Task], token_budget: Optional[int] = None) -> str:
+    """
+    Build the task section of the summary prompt, compacted to fit a token budget.
+
+    Repeated tasks are grouped by name and focus level. If the grouped lines still
+    exceed the budget, the least significant groups are merged into a single
+    "other smaller tasks" line.
+
+    Args:
+        tasks: List of Task objects for the week
+        token_budget: Maximum estimated tokens for the section, or None for no limit
+
+    Returns:
+        The task section text
+    """
+    groups = group_tasks(tasks)
+    lines = [render_task_group(group) for group in groups]
+    task_summary = "\n".join(lines)
+
+    if token_budget is None or estimate_tokens(task_summary) <= token_budget:
+        return task_summary
+
+    kept_lines = []
+    used_tokens = 0
+    for line in lines:
+        line_tokens = estimate_tokens(line + "\n")
+        if used_tokens + line_tokens + OTHER_TASKS_RESERVE_TOKENS > token_budget:
+            break
+        kept_lines.append(line)
+        used_tokens += line_tokens
+
+    remaining_groups = groups[len(kept_lines):]
+    if remaining_groups:
+        kept_lines.append(render_other_groups(remaining_groups))
+
+    return "\n".join(kept_lines)
+
+
+ADJACENT_WEEKS_INSTRUCTIONS = "IMPORTANT: Use this context from previous and future weeks to provide DIFFERENT advice than what was already given. Avoid repeating recommendations and focus on new insights or next steps in the user's productivity journey. Praise them for ways they have implemented past recommendations or improved their productivity."
+
+
+def render_adjacent_week_context(context_summaries: Optional[Dict[str, Any]]) -> str:
+    """
+    Render surrounding weeks' summaries into the context block of the summary prompt.
+
+    Args:
+        context_summaries: Dict with optional "before" and "after" lists of summaries,
+            each with "weekRange", "summary" and "recommendations"
+
+    Returns:
+        The context block, or an empty string if there is no context
+    """
+    if not context_summaries:
+        return ""
+
+    context_parts = []
+
+    if context_summaries.get("before"):
+        context_parts.append("PREVIOUS WEEKS:")
+        for summary in context_summaries["before"]:
+            context_parts.append(f"* {summary.get('weekRange', 'Unknown week')}: {summary.get('summary', '')}")
+            if summary.get('recommendations'):
+                context_parts.append(f"  Recommendations: {', '.join(summary['recommendations'])}")
+
+    if context_summaries.get("after"):
+        context_parts.append("\nWEEKS AFTER:")
+        for summary in context_summaries["after"]:
+            context_parts.append(f"* {summary.get('weekRange', 'Unknown week')}: {summary.get('summary', '')}")
+            if summary.get('recommendations'):
+                context_parts.append(f"  Recommendations: {', '.join(summary['recommendations'])}")
+
+    if not context_parts:
+        return ""
+
+    return ADJACENT_WEEKS_INSTRUCTIONS + "\n\n" + "\n".join(context_parts)
@@ -0,0 +1,85 @@
+"""
+Per-request stage timing, reported with the Server-Timing response header, and latency histograms.
+"""
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Sequence, Tuple
+
+
+class StageTimer:
+    """Collects the duration of each stage of a request, in milliseconds."""
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.stages: Dict[str, Tuple[float, Optional[str]]] = {}
+
+    @contextmanager
+    def stage(self, name: str, description: Optional[str] = None) -> Iterator[None]:
+        """Time the enclosed block as a stage."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000, description)
+
+    def record(self, name: str, duration_ms: float, description: Optional[str] = None) -> None:
+        """Record a stage measured elsewhere, replacing an earlier one of the same name."""
+        self.stages[name] = (duration_ms, description)
+
+    def describe(self, name: str, description: str) -> None:
+        """Attach a description to an already recorded stage."""
+        if name in self.stages:
+            self.stages[name] = (self.stages[name][0], description)
+
+    def server_timing_header(self) -> str:
+        """Format the stages, plus the total so far, as a Server-Timing header value."""
+        entries = []
+        for name, (duration_ms, description) in self.stages.items():
+            description_part = f';desc="{description}"' if description else ""
+            entries.append(f"{name}{description_part};dur={duration_ms:.1f}")
+        entries.append(f"total;dur={(time.perf_counter() - self.started_at) * 1000:.1f}")
+        return ", ".join(entries)
+
+
+# Upper bounds, in milliseconds, of the default latency histogram buckets
+DEFAULT_LATENCY_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+
+class LatencyHistogram:
+    """Thread-safe histogram of durations with fixed millisecond buckets."""
+
+    def __init__(self, buckets_ms: Sequence[float] = DEFAULT_LATENCY_BUCKETS_MS):
+        self.buckets_ms = tuple(buckets_ms)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear all observations."""
+        with self._lock:
+            # One count per bucket, plus one for durations above the last bound
+            self.counts = [0] * (len(self.buckets_ms) + 1)
+            self.count = 0
+            self.total_ms = 0.0
+            self.max_ms = 0.0
+
+    def observe(self, duration_ms: float) -> None:
+        """Record one duration."""
+        with self._lock:
+            self.counts[bisect.bisect_left(self.buckets_ms, duration_ms)] += 1
+            self.count += 1
+            self.total_ms += duration_ms
+            self.max_ms = max(self.max_ms, duration_ms)
+
+    def snapshot(self) -> Dict[str, object]:
+        """Get the observation count, mean, max and per-bucket counts (keyed by upper bound)."""
+        with self._lock:
+            buckets = {f"le_{bound}ms": count for bound, count in zip(self.buckets_ms, self.counts)}
+            buckets["gt_{0}ms".format(self.buckets_ms[-1])] = self.counts[-1]
+            return {
+                "count": self.count,
+                "mean_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+                "max_ms": round(self.max_ms, 3),
+                "buckets": buckets,
+            }
@@ -0,0 +1,10 @@
+#!/bin/bash
+# Runs once when the primary's data directory is created: adds a replication role for
+# the local read replica in docker-compose.replica.yml.
+set -e
+
+psql -v ON_ERROR_STOP=1 --username "$POSTGRES_USER" --dbname "$POSTGRES_DB" <<-EOSQL
+    CREATE ROLE replicator WITH REPLICATION LOGIN PASSWORD 'replicator';
+EOSQL
+
+echo "host replication replicator all scram-sha-256" >> "$PGDATA/pg_hba.conf"
@@ -3,6 +3,7 @@ import { createGlobalStyle, ThemeProvider } from 'styled-components';
 import { BrowserRouter as Router } from 'react-router-dom';
 import ProductivityTracker from './pages/ProductivityTracker';
 import { themes } from './themes/themes';
+import { apiFetch } from './utils/api';
 
 
 /**
@@ -129,7 +130,7 @@ function App() {
           ? 'http://localhost:8000/api' 
           : '/api';
         
-        const response = await fetch(`${apiUrl}/tasks/stats/count/`);
+        const response = await apiFetch(`${apiUrl}/tasks/stats/count/`);
         if (response.ok) {
           const data = await response.json();
           setTasksCount(data.total_tasks || 0);
@@ -155,7 +156,7 @@ function App() {
             ? 'http://localhost:8000/api' 
             : '/api';
           
-          const response = await fetch(`${apiUrl}/tasks/stats/count/`);
+          const response = await apiFetch(`${apiUrl}/tasks/stats/count/`);
           if (response.ok) {
             const data = await response.json();
             setTasksCount(data.total_tasks || 0);
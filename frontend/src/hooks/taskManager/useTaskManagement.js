@@ -1,5 +1,5 @@
 import { useState, useEffect, useCallback } from 'react';
-import { getApiUrl } from '../../utils/api';
+import { apiFetch, getApiUrl } from '../../utils/api';
 import { getLocalToday, addDaysToDateString } from '../../utils/dateUtils';
 
 /**
@@ -31,7 +31,7 @@ export const useTaskManagement = (selectedDate) => {
       const targetDate = dateFilter || getLocalToday();
       url += `?start_date=${targetDate}&end_date=${targetDate}&limit=${pageSize}&offset=${pageOffset}`;
       
-      const response = await fetch(url);
+      const response = await apiFetch(url);
       if (!response.ok) {
         throw new Error(`Failed to load tasks: ${response.status} ${response.statusText}`);
       }
@@ -98,7 +98,7 @@ export const useTaskManagement = (selectedDate) => {
 
     try {
       const apiUrl = getApiUrl();
-      const response = await fetch(`${apiUrl}/tasks/`, {
+      const response = await apiFetch(`${apiUrl}/tasks/`, {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
@@ -130,7 +130,7 @@ export const useTaskManagement = (selectedDate) => {
   const updateTask = async (taskId, updatedTask) => {
     try {
       const apiUrl = getApiUrl();
-      const response = await fetch(`${apiUrl}/tasks/${taskId}/`, {
+      const response = await apiFetch(`${apiUrl}/tasks/${taskId}/`, {
         method: 'PUT',
         headers: {
           'Content-Type': 'application/json',
@@ -160,7 +160,7 @@ export const useTaskManagement = (selectedDate) => {
   const deleteTask = async (taskId) => {
     try {
       const apiUrl = getApiUrl();
-      const response = await fetch(`${apiUrl}/tasks/${taskId}/`, {
+      const response = await apiFetch(`${apiUrl}/tasks/${taskId}/`, {
         method: 'DELETE',
       });
 
@@ -8,7 +8,7 @@ import EmptyState from '../components/EmptyState';
 import SearchResultCard from '../components/SearchResultCard';
 import ResultsCount from '../components/ResultsCount';
 import SortSelect from '../components/SortSelect';
-import { getApiUrl } from '../utils/api';
+import { apiFetch, getApiUrl } from '../utils/api';
 import { SearchProgressBar } from '../components/loading';
 
 /**
@@ -97,7 +97,7 @@ function SearchAgent({ summaries = [] }) {
       try {
         const apiUrl = getApiUrl();
         const encodedQuery = encodeURIComponent(query);
-        const response = await fetch(`${apiUrl}/summaries/search?query=${encodedQuery}`);
+        const response = await apiFetch(`${apiUrl}/summaries/search?query=${encodedQuery}`);
         
         clearTimeout(timeoutId);
         
@@ -10,6 +10,34 @@ export const getApiUrl = () => {
   return process.env.REACT_APP_API_URL || 'http://localhost:8000/api';
 };
 
+/**
+ * Header the backend sets on successful writes: a Unix time until which reads should go to the primary
+ * database. Sending it back lets this client see its own writes even while a read replica lags behind.
+ */
+const READ_PRIMARY_UNTIL_HEADER = 'X-Read-Primary-Until';
+let readPrimaryUntil = 0;
+
+/**
+ * fetch() for backend requests: echoes the read-from-primary header after a write until it expires
+ * @param {string} url - The full request URL
+ * @param {object} options - Fetch options
+ * @returns {Promise<Response>} The fetch response
+ */
+export const apiFetch = async (url, options = {}) => {
+  const headers = { ...options.headers };
+  if (readPrimaryUntil > Date.now() / 1000) {
+    headers[READ_PRIMARY_UNTIL_HEADER] = readPrimaryUntil.toFixed(3);
+  }
+
+  const response = await fetch(url, { ...options, headers });
+
+  const until = parseFloat(response.headers.get(READ_PRIMARY_UNTIL_HEADER));
+  if (until > readPrimaryUntil) {
+    readPrimaryUntil = until;
+  }
+  return response;
+};
+
 /**
  * Make a fetch request with error handling
  * @param {string} endpoint - The API endpoint (relative to base URL)
@@ -35,7 +63,7 @@ export const apiRequest = async (endpoint, options = {}) => {
   };
   
   try {
-    const response = await fetch(url, mergedOptions);
+    const response = await apiFetch(url, mergedOptions);
     
     if (!response.ok) {
       throw new Error(`API request failed: ${response.status} ${response.statusText}`);